@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Texture atlas packer for the Ramayana game sprites
+Packs sprites into power-of-two sheets with MaxRects and writes SpriteKit .atlasc output
+"""
+
+from PIL import Image
+import glob
+import io
+import os
+import plistlib
+
+from encoding import save_asset
+from targets import scale_suffix
+from writer import atomic_write
+
+DEFAULT_PADDING = 2
+MAX_SHEET_SIZE = 4096
+
+class MaxRectsPacker:
+    """MaxRects bin packer using the best-short-side-fit heuristic"""
+
+    def __init__(self, width, height, allow_rotation=False):
+        self.width = width
+        self.height = height
+        self.allow_rotation = allow_rotation
+        self.free_rects = [(0, 0, width, height)]
+
+    def _best_position(self, w, h):
+        best = None
+        for fx, fy, fw, fh in self.free_rects:
+            candidates = [(w, h, False)]
+            if self.allow_rotation and w != h:
+                candidates.append((h, w, True))
+            for cw, ch, rotated in candidates:
+                if cw <= fw and ch <= fh:
+                    short_side = min(fw - cw, fh - ch)
+                    long_side = max(fw - cw, fh - ch)
+                    score = (short_side, long_side)
+                    if best is None or score < best[0]:
+                        best = (score, (fx, fy, cw, ch, rotated))
+        return best[1] if best else None
+
+    def _split(self, free, used):
+        """Split a free rectangle around a newly used one, returning the leftover pieces"""
+        fx, fy, fw, fh = free
+        ux, uy, uw, uh = used
+        if ux >= fx + fw or ux + uw <= fx or uy >= fy + fh or uy + uh <= fy:
+            return [free]
+        pieces = []
+        if ux > fx:
+            pieces.append((fx, fy, ux - fx, fh))
+        if ux + uw < fx + fw:
+            pieces.append((ux + uw, fy, fx + fw - ux - uw, fh))
+        if uy > fy:
+            pieces.append((fx, fy, fw, uy - fy))
+        if uy + uh < fy + fh:
+            pieces.append((fx, uy + uh, fw, fy + fh - uy - uh))
+        return pieces
+
+    def _prune(self):
+        """Drop free rectangles fully contained in another one"""
+        def contains(a, b):
+            return a[0] <= b[0] and a[1] <= b[1] and a[0] + a[2] >= b[0] + b[2] and a[1] + a[3] >= b[1] + b[3]
+        rects = list(dict.fromkeys(self.free_rects))
+        self.free_rects = [r for i, r in enumerate(rects)
+                           if not any(i != j and contains(other, r) for j, other in enumerate(rects))]
+
+    def insert(self, w, h):
+        """Place a w x h rectangle; returns (x, y, placed_w, placed_h, rotated) or None if it does not fit"""
+        placement = self._best_position(w, h)
+        if placement is None:
+            return None
+        used = placement[:4]
+        self.free_rects = [piece for free in self.free_rects for piece in self._split(free, used)]
+        self._prune()
+        return placement
+
+def _next_power_of_two(value):
+    power = 1
+    while power < value:
+        power *= 2
+    return power
+
+def _try_pack(items, width, height, padding, allow_rotation):
+    """Pack as many items as fit into one sheet; returns (placements, leftovers)"""
+    packer = MaxRectsPacker(width, height, allow_rotation)
+    placements = {}
+    leftovers = []
+    for name, w, h in items:
+        placement = packer.insert(w + padding, h + padding)
+        if placement is None:
+            leftovers.append((name, w, h))
+            continue
+        x, y, _, _, rotated = placement
+        placements[name] = (x, y, w, h, rotated)
+    return placements, leftovers
+
+def pack_sheets(items, padding=DEFAULT_PADDING, allow_rotation=False, max_size=MAX_SHEET_SIZE):
+    """Pack (name, width, height) items into as few power-of-two sheets as possible
+
+    Returns a list of (sheet_width, sheet_height, {name: (x, y, w, h, rotated)}).
+    """
+    # Largest first packs tighter
+    pending = sorted(items, key=lambda item: (max(item[1], item[2]), item[1] * item[2]), reverse=True)
+    sheets = []
+    while pending:
+        area = sum((w + padding) * (h + padding) for _, w, h in pending)
+        width = _next_power_of_two(max(max(w, h) if allow_rotation else w for _, w, h in pending) + padding)
+        height = _next_power_of_two(max(min(w, h) if allow_rotation else h for _, w, h in pending) + padding)
+        while width * height < area and (width < max_size or height < max_size):
+            # Grow the shorter side so sheets stay close to square
+            if width <= height and width < max_size:
+                width *= 2
+            else:
+                height *= 2
+        width, height = min(width, max_size), min(height, max_size)
+
+        while True:
+            placements, leftovers = _try_pack(pending, width, height, padding, allow_rotation)
+            if not leftovers or (width >= max_size and height >= max_size):
+                break
+            if width <= height and width < max_size:
+                width *= 2
+            else:
+                height *= 2
+
+        if not placements:
+            name, w, h = pending[0]
+            raise ValueError(f"{name} ({w}x{h}) does not fit in a {max_size}x{max_size} atlas sheet")
+        sheets.append((width, height, placements))
+        pending = leftovers
+    return sheets
+
+def _rect_string(x, y, w, h):
+    return f"{{{{{x},{y}}},{{{w},{h}}}}}"
+
+def write_atlasc(atlas_name, images_by_scale, out_dir, padding=DEFAULT_PADDING, allow_rotation=False,
+                 max_size=MAX_SHEET_SIZE, encode=None):
+    """Pack {scale: [(name, img, trim_info), ...]} into <atlas_name>.atlasc sheets plus the SpriteKit plist
+
+    images_by_scale may also be an iterable of (scale, images) pairs in scale
+    order, so callers can load one scale's sprites at a time.
+    trim_info is the dict from trim.trim_sprite for trimmed sprites, or None.
+    encode is the settings dict from encoding.encode_settings (None keeps Pillow defaults).
+    Each scale is packed separately so every sheet stays a power of two.
+    Returns a list of log lines.
+    """
+    atlas_dir = os.path.join(out_dir, f"{atlas_name}.atlasc")
+    os.makedirs(atlas_dir, exist_ok=True)
+    plist_images = []
+    messages = []
+
+    if isinstance(images_by_scale, dict):
+        images_by_scale = sorted(images_by_scale.items())
+    for scale, images in images_by_scale:
+        by_name = {name: (img, trim_info) for name, img, trim_info in images}
+        items = [(name, img.width, img.height) for name, img, _ in images]
+        sheets = pack_sheets(items, padding * scale, allow_rotation, max_size)
+
+        for index, (sheet_w, sheet_h, placements) in enumerate(sheets, start=1):
+            sheet = Image.new('RGBA', (sheet_w, sheet_h), (0, 0, 0, 0))
+            subimages = []
+            for name, (x, y, w, h, rotated) in placements.items():
+                img, trim_info = by_name[name]
+                if trim_info:
+                    source_w, source_h = trim_info["sourceSize"]
+                    offset_x, offset_y = trim_info["spriteOffset"]
+                else:
+                    source_w, source_h, offset_x, offset_y = w, h, 0, 0
+                if rotated:
+                    # Stored rotated 90° clockwise; SpriteKit rotates it back when sampling
+                    img = img.transpose(Image.Transpose.ROTATE_270)
+                sheet.paste(img, (x, y))
+                subimages.append({
+                    "name": f"{name}{scale_suffix(scale)}.png",
+                    "spriteOffset": f"{{{offset_x:g},{offset_y:g}}}",
+                    "spriteSourceSize": f"{{{source_w},{source_h}}}",
+                    "textureRect": _rect_string(x, y, w, h),
+                    "textureRotated": rotated,
+                    "isFullyOpaque": img.mode != 'RGBA' or img.getextrema()[3][0] == 255,
+                })
+
+            sheet_file = f"{atlas_name}.{index}{scale_suffix(scale)}.png"
+            sheet_path = os.path.join(atlas_dir, sheet_file)
+            if encode:
+                save_asset(sheet, sheet_path, encode, atlas_name)
+            else:
+                buffer = io.BytesIO()
+                sheet.save(buffer, "PNG")
+                atomic_write(sheet_path, buffer.getvalue())
+            plist_images.append({"path": sheet_file, "size": f"{{{sheet_w},{sheet_h}}}", "subimages": subimages})
+            messages.append(f"🧩 Packed {len(placements)} sprites into {sheet_file} ({sheet_w}x{sheet_h})")
+
+    atomic_write(os.path.join(atlas_dir, f"{atlas_name}.plist"),
+                 plistlib.dumps({"format": "APPL", "images": plist_images, "version": 1}))
+    messages += prune_sheets(atlas_dir, atlas_name, {image["path"] for image in plist_images})
+    return messages
+
+def prune_sheets(atlas_dir, atlas_name, keep):
+    """Delete sheets of an atlas not named in keep; returns log lines
+
+    A smaller pack than last time leaves sheets the plist no longer names; they must not ship.
+    """
+    messages = []
+    for stale in sorted(glob.glob(os.path.join(glob.escape(atlas_dir), f"{glob.escape(atlas_name)}.*.png"))):
+        if os.path.basename(stale) not in keep:
+            os.remove(stale)
+            messages.append(f"🧹 Removed stale sheet {os.path.basename(stale)}")
+    return messages
+
+def atlas_files(atlas_dir, atlas_name):
+    """The plist and every sheet it names, as written by write_atlasc"""
+    plist_path = os.path.join(atlas_dir, f"{atlas_name}.plist")
+    with open(plist_path, "rb") as f:
+        images = plistlib.load(f)["images"]
+    return [plist_path] + [os.path.join(atlas_dir, image["path"]) for image in images]
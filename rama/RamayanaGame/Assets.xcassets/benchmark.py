@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Benchmark the Ramayana asset generators
+Compares native @2x rendering against render+LANCZOS and PNG encoder profiles,
+and runs the per-generator suite checked against a committed baseline
+"""
+
+from PIL import Image
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import io
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import time
+
+import PIL
+
+import create_game_sprites
+import create_icon
+import create_intro_art
+from particles import add_particles
+from drawing import QUALITY_LEVELS, supersample
+from encoding import DEFAULT_PROFILE, PROFILES, encode_png, encoded_size
+
+# (name, generator, point-size params) for everything the pipeline renders
+GENERATORS = [
+    ("rama", create_game_sprites.create_rama_sprite, (200, 300)),
+    ("sita", create_game_sprites.create_sita_sprite, (200, 300)),
+    ("hanuman", create_game_sprites.create_hanuman_sprite, (200, 300)),
+    ("demon", create_game_sprites.create_demon_sprite, (200, 300)),
+    ("lakshmana", create_game_sprites.create_lakshmana_sprite, (200, 300)),
+    ("ravana", create_game_sprites.create_ravana_sprite, (200, 300)),
+    ("background", create_game_sprites.create_background_sprite, (400, 300)),
+    ("title_screen", create_intro_art.create_title_screen, ()),
+    ("character_select", create_intro_art.create_character_select, ()),
+    ("intro_scene", create_intro_art.create_intro_scene, ()),
+]
+
+# Scale factors the suite renders every generator at
+SUITE_SCALES = (1, 2, 4)
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+DEFAULT_THRESHOLD = 25.0
+# Sub-millisecond generators jitter by more than the threshold; ignore slowdowns smaller than this
+MIN_REGRESSION_MS = 1.0
+
+def render_app_icon(size, scale=1):
+    """The app icon at size * scale pixels"""
+    return create_icon.render_icon(size * scale)
+
+def render_starfield(width, height, count, scale=1):
+    """A dense seeded glow field over the title gradient; 960x540 points is 4K at 4x"""
+    bg = create_intro_art.create_gradient_background(width, height, [(25, 25, 50), (75, 25, 100)], scale=scale)
+    return add_particles(bg, count, seed=1, scale=scale)
+
+# Everything in GENERATORS plus the icon, the bare gradient background and a dense particle field
+SUITE = GENERATORS + [
+    ("icon", render_app_icon, (create_icon.MASTER_SIZE,)),
+    ("gradient_background", create_intro_art.create_gradient_background, (1024, 768, [(25, 25, 50), (75, 25, 100)])),
+    ("starfield", render_starfield, (960, 540, 20000)),
+]
+
+def best_of(repeat, func):
+    """Best wall time of several runs, in milliseconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+def upscaled(factory, params, scale):
+    """The old pipeline: render at 1x and LANCZOS-resize to the target scale"""
+    img = factory(*params)
+    return img.resize((img.width * scale, img.height * scale), Image.Resampling.LANCZOS)
+
+def compare_scaling(scale, repeat):
+    """Time native rendering at scale against render+LANCZOS for every generator"""
+    rows = []
+    for name, factory, params in GENERATORS:
+        resampled = best_of(repeat, lambda: upscaled(factory, params, scale))
+        native = best_of(repeat, lambda: factory(*params, scale=scale))
+        rows.append((name, resampled, native))
+    return rows
+
+def compare_encoders(scale, repeat):
+    """Encode time and bytes per asset under every encoder profile"""
+    rows = []
+    for name, factory, params in GENERATORS:
+        img = factory(*params, scale=scale)
+        for profile in sorted(PROFILES):
+            buffer = io.BytesIO()
+            used = []
+
+            def encode():
+                buffer.seek(0)
+                buffer.truncate()
+                used.append(encode_png(img, buffer, profile))
+
+            elapsed = best_of(repeat, encode)
+            rows.append((name, profile, used[-1], elapsed, buffer.tell()))
+    return rows
+
+def print_encoders(scale, repeat):
+    """Print the encoder size-vs-time table"""
+    rows = compare_encoders(scale, repeat)
+    print(f"{'asset':<18} {'profile':<8} {'used':<8} {'encode ms':>10} {'bytes':>10}")
+    for name, profile, used, elapsed, size in rows:
+        print(f"{name:<18} {profile:<8} {used:<8} {elapsed:>10.2f} {size:>10}")
+
+    totals = {}
+    for _, profile, _, elapsed, size in rows:
+        total_ms, total_bytes = totals.get(profile, (0, 0))
+        totals[profile] = (total_ms + elapsed, total_bytes + size)
+    for profile, (total_ms, total_bytes) in sorted(totals.items()):
+        print(f"{'total':<18} {profile:<8} {'':<8} {total_ms:>10.2f} {total_bytes:>10}")
+
+def print_scaling(scale, repeat):
+    """Print the native vs resampled timing table"""
+    rows = compare_scaling(scale, repeat)
+    print(f"{'asset':<18} {'1x+LANCZOS ms':>14} {f'native {scale}x ms':>14} {'ratio':>7}")
+    for name, resampled, native in rows:
+        print(f"{name:<18} {resampled:>14.2f} {native:>14.2f} {native / resampled:>7.2f}")
+
+    slower = [name for name, resampled, native in rows if native > resampled]
+    if slower:
+        print(f"⚠️  Native rendering slower than render+LANCZOS for: {', '.join(slower)}")
+
+def peak_rss_kb():
+    """Peak resident set size of this process in KB (ru_maxrss is bytes on macOS, KB on Linux)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+def measure(name, scale, repeat):
+    """Time one generator at one scale; runs in a fresh process so peak RSS belongs to it alone"""
+    factory, params = next((factory, params) for entry, factory, params in SUITE if entry == name)
+    img = factory(*params, scale=scale)
+    wall_ms = best_of(repeat, lambda: factory(*params, scale=scale))
+    return {
+        "name": name,
+        "scale": scale,
+        "size": list(img.size),
+        "wall_ms": round(wall_ms, 3),
+        "peak_rss_kb": peak_rss_kb(),
+        "bytes": encoded_size(img, DEFAULT_PROFILE),
+    }
+
+def run_suite(names, scales, repeat):
+    """Measure every generator at every scale, each in its own spawned process"""
+    context = multiprocessing.get_context("spawn")
+    results = []
+    for name in names:
+        for scale in scales:
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                results.append(pool.submit(measure, name, scale, repeat).result())
+    return {
+        "python": platform.python_version(),
+        "pillow": PIL.__version__,
+        "machine": platform.machine(),
+        "repeat": repeat,
+        "results": results,
+    }
+
+def measure_quality(name, scale, quality, repeat):
+    """Time one generator supersampled at one quality; runs in a fresh process like measure()"""
+    factory, params = next((factory, params) for entry, factory, params in SUITE if entry == name)
+    render = lambda s: factory(*params, scale=s)
+    supersample(render, scale, quality)
+    wall_ms = best_of(repeat, lambda: supersample(render, scale, quality))
+    return {"name": name, "scale": scale, "quality": quality,
+            "wall_ms": round(wall_ms, 3), "peak_rss_kb": peak_rss_kb()}
+
+def compare_quality(names, scale, repeat):
+    """Measure every generator at every supersampling factor, each in its own spawned process"""
+    context = multiprocessing.get_context("spawn")
+    results = []
+    for name in names:
+        for quality in QUALITY_LEVELS:
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                results.append(pool.submit(measure_quality, name, scale, quality, repeat).result())
+    return results
+
+def quality(args):
+    """Print what each --quality setting costs in time and memory per generator"""
+    names = args.only or [name for name, _, _ in GENERATORS]
+    rows = compare_quality(names, args.scale, args.repeat)
+    print(f"{'generator':<20} {'quality':>7} {'wall ms':>10} {'vs 1x':>7} {'peak RSS KB':>12}")
+    base = {}
+    for row in rows:
+        base.setdefault(row["name"], row)
+        ratio = row["wall_ms"] / base[row["name"]]["wall_ms"] if base[row["name"]]["wall_ms"] else 0.0
+        print(f"{row['name']:<20} {row['quality']:>6}x {row['wall_ms']:>10.2f} {ratio:>6.1f}x {row['peak_rss_kb']:>12}")
+    totals = {q: sum(row["wall_ms"] for row in rows if row["quality"] == q) for q in QUALITY_LEVELS}
+    print("total: " + ", ".join(f"{q}x {ms:.0f} ms" for q, ms in totals.items()))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"scale": args.scale, "repeat": args.repeat, "results": rows}, f, indent=2)
+        print(f"📝 Wrote {args.output}")
+
+def find_regressions(report, baseline, threshold):
+    """(name, scale, baseline ms, current ms, percent slower) for every result over the threshold"""
+    previous = {(row["name"], row["scale"]): row for row in baseline["results"]}
+    regressions = []
+    for row in report["results"]:
+        before = previous.get((row["name"], row["scale"]))
+        if before is None or before["wall_ms"] <= 0:
+            continue
+        slower = 100 * (row["wall_ms"] - before["wall_ms"]) / before["wall_ms"]
+        if slower > threshold and row["wall_ms"] - before["wall_ms"] >= MIN_REGRESSION_MS:
+            regressions.append((row["name"], row["scale"], before["wall_ms"], row["wall_ms"], slower))
+    return regressions
+
+def print_suite(report):
+    """Print the suite results table"""
+    print(f"{'generator':<20} {'scale':>5} {'size':>11} {'wall ms':>10} {'peak RSS KB':>12} {'bytes':>10}")
+    for row in report["results"]:
+        size = "x".join(str(v) for v in row["size"])
+        print(f"{row['name']:<20} {row['scale']:>4}x {size:>11} {row['wall_ms']:>10.2f} "
+              f"{row['peak_rss_kb']:>12} {row['bytes']:>10}")
+
+def suite(args):
+    """Run the suite, write the JSON report and check it against the baseline; returns the exit status"""
+    names = args.only or [name for name, _, _ in SUITE]
+    unknown = sorted(set(names) - {name for name, _, _ in SUITE})
+    if unknown:
+        raise SystemExit(f"unknown generator(s): {', '.join(unknown)}")
+
+    report = run_suite(names, args.scales, args.repeat)
+    print_suite(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"📝 Wrote {args.output}")
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        print(f"📌 Updated baseline {os.path.basename(args.baseline)}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"⚠️  No baseline at {args.baseline}; run with --update-baseline to record one")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = find_regressions(report, baseline, args.threshold)
+    for name, scale, before, after, slower in regressions:
+        print(f"❌ {name}@{scale}x: {before:.2f} ms → {after:.2f} ms ({slower:+.0f}%)")
+    if regressions:
+        print(f"❌ {len(regressions)} generator(s) slowed down by more than {args.threshold:g}%")
+        return 1
+    print(f"✅ No generator slowed down by more than {args.threshold:g}%")
+    return 0
+
+def main():
+    """Run the selected benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark the Ramayana asset generators")
+    parser.add_argument("mode", nargs="?", choices=["scaling", "encode", "suite", "quality"], default="scaling",
+                        help="scaling: native vs render+LANCZOS; encode: PNG profiles; "
+                             "suite: every generator against the baseline; "
+                             "quality: time and memory of each --quality setting (default: scaling)")
+    parser.add_argument("--scale", type=int, default=2, help="scale factor to render at (default: 2)")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per measurement, best is kept (default: 5)")
+    suite_group = parser.add_argument_group("suite options")
+    suite_group.add_argument("--scales", type=int, nargs="+", default=list(SUITE_SCALES),
+                             help=f"scale factors to run the suite at (default: {' '.join(map(str, SUITE_SCALES))})")
+    suite_group.add_argument("--only", action="append", metavar="NAME",
+                             help="run only this generator (repeatable; suite and quality)")
+    suite_group.add_argument("--output", metavar="PATH", help="write the suite or quality results as JSON")
+    suite_group.add_argument("--baseline", default=BASELINE_PATH,
+                             help="baseline JSON to compare against (default: benchmark_baseline.json)")
+    suite_group.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                             help=f"fail when a generator is this many percent slower (default: {DEFAULT_THRESHOLD:g})")
+    suite_group.add_argument("--update-baseline", action="store_true",
+                             help="record this run as the new baseline instead of comparing")
+    args = parser.parse_args()
+
+    if args.mode == "suite":
+        sys.exit(suite(args))
+    elif args.mode == "quality":
+        quality(args)
+    elif args.mode == "encode":
+        print_encoders(args.scale, args.repeat)
+    else:
+        print_scaling(args.scale, args.repeat)
+
+if __name__ == "__main__":
+    main()
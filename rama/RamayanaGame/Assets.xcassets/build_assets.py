@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Build the Ramayana game assets
+Single entry point for the icon, sprite and artwork generators: python -m build_assets [TARGET ...]
+"""
+
+import argparse
+import importlib
+import os
+import sys
+import time
+
+from parallel import add_jobs_argument
+from targets import TARGETS, add_output_arguments, only_names, select, unknown_names
+
+def add_common_arguments(parser):
+    """Options that need no generator imports, enough for --list and --dry-run"""
+    parser.add_argument("targets", nargs="*", default=["all"], metavar="TARGET",
+                        help=f"what to build: {', '.join(TARGETS)} or all (default: all)")
+    add_output_arguments(parser)
+    add_jobs_argument(parser)
+    parser.add_argument("--dry-run", action="store_true",
+                        help="show which files would be written without rendering anything")
+    parser.add_argument("--list", action="store_true",
+                        help="list every target and asset and exit")
+    parser.add_argument("--watch", action="store_true",
+                        help="build, then keep rebuilding the assets whose generator scripts change "
+                             "(pair with --encode fast for quicker previews)")
+    # Set by --watch on each rebuild: only assets depending on these scripts are built
+    parser.add_argument("--changed", action="append", default=[], metavar="PATH", help=argparse.SUPPRESS)
+
+def selected_targets(names, parser):
+    """Targets in pipeline order for the positional names"""
+    unknown = sorted(set(names) - set(TARGETS) - {"all"})
+    if unknown:
+        parser.error(f"unknown target: {', '.join(unknown)} (choose from {', '.join(TARGETS)}, all)")
+    if "all" in names:
+        return list(TARGETS.values())
+    return [target for name, target in TARGETS.items() if name in names]
+
+def list_targets(targets):
+    """Print every asset with its generator and arguments"""
+    for target in targets:
+        print(f"{target.name}: {target.description} → {target.output_dir}")
+        for asset in target.assets:
+            params = ", ".join(map(repr, asset.params))
+            print(f"  {asset.name:<24} {target.module}.{asset.factory}({params})")
+
+def dry_run(targets, root, only):
+    """Print the files a build would write, marking the ones that do not exist yet"""
+    for target in targets:
+        for asset in select(target, only):
+            for path in target.outputs(root, asset):
+                state = "exists" if os.path.exists(path) else "new"
+                print(f"{target.name:<8} {asset.name:<24} {state:<7} {os.path.relpath(path, root)}")
+
+def dependency_map(modules, targets, only):
+    """{(target name, asset name): (definitions, data names)} its output depends on, as build_cache.source_definitions"""
+    from build_cache import source_definitions
+
+    dependencies = {}
+    for target in targets:
+        module = modules[target.name]
+        # The build code (encoding, writing, atlases) feeds every asset of the target
+        shared_definitions, shared_data = source_definitions(module.build)
+        for asset in select(target, only):
+            definitions, data = source_definitions(getattr(module, asset.factory))
+            dependencies[(target.name, asset.name)] = (shared_definitions | definitions, shared_data | data)
+    return dependencies
+
+def affected(modules, targets, only, changed):
+    """Targets and asset names to rebuild after an edit
+
+    changed holds PATH for a script edited outside its definitions (imports, new or deleted
+    files), which affects everything using it, or PATH::NAME for one edited top-level function,
+    class or constant.
+    """
+    files, definitions = set(), set()
+    for item in changed:
+        path, _, name = item.partition("::")
+        if name:
+            definitions.add((os.path.abspath(path), name))
+        else:
+            files.add(os.path.abspath(path))
+    # Constants are matched by name alone, since a script may read one imported from another
+    changed_names = {name for _, name in definitions}
+    names = {}
+    for (target_name, asset_name), (uses, data) in dependency_map(modules, targets, only).items():
+        if any(path in files for path, _ in uses) or uses & definitions or data & changed_names:
+            names.setdefault(target_name, []).append(asset_name)
+    return [target for target in targets if target.name in names], names
+
+def full_parser(modules):
+    """Parser with every option the target scripts understand (imports Pillow)"""
+    from build_cache import add_cache_arguments
+    from drawing import add_quality_argument
+    from encoding import add_encode_arguments
+    from instrument import add_instrument_arguments
+    from texture_memory import add_budget_arguments
+    from writer import add_writer_arguments
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_common_arguments(parser)
+    add_cache_arguments(parser)
+    add_encode_arguments(parser)
+    add_quality_argument(parser)
+    add_writer_arguments(parser)
+    add_instrument_arguments(parser)
+    parser.add_argument("--texture-report", action="store_true",
+                        help="after building, report decoded texture memory per asset and scene against the budget")
+    add_budget_arguments(parser)
+    for module in modules:
+        module.add_arguments(parser)
+    return parser
+
+def main(argv=None):
+    """Parse the command line and build the selected targets"""
+    argv = sys.argv[1:] if argv is None else argv
+
+    # First pass: only the cheap options, so --list and --dry-run never import the generators.
+    # Anything it does not recognise (--trim, --encode ...) needs the full parser to read correctly.
+    quick = argparse.ArgumentParser(add_help=False)
+    add_common_arguments(quick)
+    args, extra = quick.parse_known_args(argv)
+    lightweight = (args.list or args.dry_run) and not extra and not {"-h", "--help"} & set(argv)
+    if args.watch and not (args.list or args.dry_run or {"-h", "--help"} & set(argv)):
+        # The watcher itself never imports the generators; every build runs in a fresh interpreter
+        from watch import watch
+        command = [sys.executable, "-m", "build_assets"] + [arg for arg in argv if arg != "--watch"]
+        sys.exit(watch(command))
+
+    modules = {}
+    parser = quick
+    if not lightweight:
+        modules = {name: importlib.import_module(target.module) for name, target in TARGETS.items()}
+        parser = full_parser(modules.values())
+        args = parser.parse_args(argv)
+
+    targets = selected_targets(args.targets, parser)
+    only = only_names(args)
+    unknown = unknown_names(targets, only)
+    if unknown:
+        parser.error(f"no such asset in {', '.join(t.name for t in targets)}: {', '.join(unknown)}")
+
+    if args.list:
+        list_targets(targets)
+        return
+    if args.dry_run:
+        dry_run(targets, os.path.abspath(args.out), only)
+        return
+    if args.changed:
+        targets, names = affected(modules, targets, only, args.changed)
+        if not targets:
+            print("⏭️  No selected asset depends on the change")
+            return
+        for target in targets:
+            print(f"🎯 {target.name}: {', '.join(names[target.name])}")
+        # The target scripts read --only themselves
+        args.only = [",".join(name for target_names in names.values() for name in target_names)]
+
+    from instrument import configure, track, write_report
+    import writer
+    args.out = os.path.abspath(args.out)
+    started = time.perf_counter()
+    configure(args)
+    writer.configure(args)
+    for target in targets:
+        if select(target, only):
+            modules[target.name].build(args)
+    # Catalog metadata last, in one pass over everything on disk, so filtered builds keep the other entries
+    from catalog import write_catalog
+    with track("catalog") as record, record.stage("write"):
+        catalog_messages = write_catalog(targets, args.out)
+    for message in catalog_messages:
+        print(message)
+    from outlines import write_outlines
+    with track("outlines") as record, record.stage("write"):
+        outline_messages = write_outlines(args.out)
+    for message in outline_messages:
+        print(message)
+    status = 0
+    if args.texture_report:
+        from texture_memory import check_budget
+        status = check_budget(args.out, args)
+    if args.report:
+        print(write_report(args.report, "build_assets", started))
+    sys.exit(status)
+
+if __name__ == "__main__":
+    main()
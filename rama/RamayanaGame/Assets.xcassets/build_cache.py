@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Content-addressed build cache for the Ramayana asset generators
+Skips or restores unchanged assets instead of re-rendering and re-encoding them
+"""
+
+from functools import lru_cache
+import dataclasses
+import filecmp
+import hashlib
+import inspect
+import os
+import shutil
+import sys
+import types
+
+import PIL
+
+from parallel import run_jobs
+from writer import atomic_copy
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CACHE_DIR = os.path.join(SCRIPT_DIR, ".asset_cache")
+DEFAULT_CACHE_MB = 256
+
+# Immutable module-level values that count as data (sizes, colours, names) rather than code
+_CONSTANT_TYPES = (int, float, str, bytes, bool, type(None))
+
+def _source_file(obj):
+    """File a function or class was defined in ("" for builtins and generated code such as dataclass methods)"""
+    if isinstance(obj, type):
+        return getattr(sys.modules.get(obj.__module__), "__file__", None) or ""
+    return getattr(getattr(obj, "__code__", None), "co_filename", "")
+
+def _is_local(obj):
+    """True for functions and classes defined in the generator scripts next to this file"""
+    filename = _source_file(obj)
+    return os.path.isfile(filename) and os.path.dirname(os.path.abspath(filename)) == SCRIPT_DIR
+
+def _qualified(obj):
+    """Stable name for a function or class whether its script runs as __main__ or is imported"""
+    module = os.path.splitext(os.path.basename(_source_file(obj)))[0]
+    return f"{module}.{obj.__qualname__}"
+
+def _referenced_names(code):
+    """Global names used by a code object, including nested comprehensions and lambdas"""
+    names = list(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names.extend(_referenced_names(const))
+    return names
+
+def _is_constant(name, value):
+    """True for module constants a generator reads: UPPER_CASE names holding immutable values
+
+    Colour and size tables written as dicts and lists count when everything inside them is
+    constant; lower-case globals are runtime state (shared writers, pending records) and never do.
+    """
+    if not name.lstrip("_")[:1].isupper() or name != name.upper():
+        return False
+    return _constant_value(value)
+
+def _constant_value(value):
+    if isinstance(value, _CONSTANT_TYPES):
+        return True
+    if isinstance(value, (tuple, frozenset, list)):
+        return all(_constant_value(item) for item in value)
+    if isinstance(value, dict):
+        return all(_constant_value(key) and _constant_value(item) for key, item in value.items())
+    # Spec dataclasses are frozen descriptions of a character or prop
+    return dataclasses.is_dataclass(value) and not isinstance(value, type) and \
+        getattr(type(value), "__dataclass_params__").frozen
+
+def _spec_classes(value):
+    """Dataclass types of the specs nested inside a data value (character specs, props)"""
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        yield type(value)
+        for field in dataclasses.fields(value):
+            yield from _spec_classes(getattr(value, field.name))
+    elif isinstance(value, (tuple, list, frozenset)):
+        for item in value:
+            yield from _spec_classes(item)
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _spec_classes(item)
+
+def source_dependencies(*roots):
+    """Walk the local functions, classes and module-level data reachable from the roots
+
+    Returns (functions, data) where functions is an ordered list of local
+    function and class objects and data maps qualified global names to their
+    values. Memoized functions are followed through to the function they wrap,
+    and data holding spec dataclasses pulls in the source of those classes.
+    """
+    functions = []
+    data = {}
+    pending = list(roots)
+    while pending:
+        func = inspect.unwrap(pending.pop(0))
+        if func in functions or not _is_local(func):
+            continue
+        functions.append(func)
+        if isinstance(func, type):
+            # A class depends on its own source plus whatever its methods use
+            pending.extend(value for value in vars(func).values() if isinstance(value, types.FunctionType))
+            continue
+        for name in _referenced_names(func.__code__):
+            # co_names also holds attribute and builtin names; only real globals of the script count
+            if name not in func.__globals__:
+                continue
+            value = func.__globals__[name]
+            if isinstance(value, type) or callable(value) and isinstance(inspect.unwrap(value), types.FunctionType):
+                pending.append(value)
+            elif _is_constant(name, value):
+                data[f"{_qualified(func)}:{name}"] = value
+                pending.extend(_spec_classes(value))
+    return functions, data
+
+def source_definitions(*roots):
+    """What the roots depend on, by top-level name: ({(script path, name)}, {global data names})
+
+    Methods and nested functions count as their enclosing top-level definition, the unit an
+    edit to a script is reported in.
+    """
+    functions, data = source_dependencies(*roots)
+    definitions = {(os.path.abspath(_source_file(func)), func.__qualname__.split(".")[0]) for func in functions}
+    return definitions, {name.rsplit(":", 1)[1] for name in data}
+
+@lru_cache(maxsize=None)
+def _source(func):
+    """Source of a local function or class, read once per process however many keys include it"""
+    return inspect.getsource(func)
+
+def cache_key(roots, params):
+    """Hash the source of every local function the roots depend on, the params and the Pillow version"""
+    functions, data = source_dependencies(*roots)
+    digest = hashlib.sha256()
+    digest.update(f"Pillow {PIL.__version__}\n".encode())
+    for func in functions:
+        digest.update(f"{_qualified(func)}\n".encode())
+        digest.update(_source(func).encode())
+    for name in sorted(data):
+        digest.update(f"{name}={data[name]!r}\n".encode())
+    digest.update(repr(params).encode())
+    return digest.hexdigest()
+
+def add_cache_arguments(parser):
+    """Add the shared --force / --cache-dir / --cache-size options to an argparse parser"""
+    parser.add_argument("--force", action="store_true",
+                        help="ignore the build cache and rebuild every asset")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR,
+                        help="where cached PNGs are kept (default: .asset_cache next to the scripts)")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_MB,
+                        help=f"evict least recently used entries above this many MB (default: {DEFAULT_CACHE_MB})")
+
+class BuildCache:
+    """Directory of cache entries, one sub-directory of output files per key"""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_CACHE_MB * 1024 * 1024, force=False):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.force = force
+
+    @classmethod
+    def from_args(cls, args):
+        """Build a cache from the options added by add_cache_arguments"""
+        return cls(args.cache_dir, args.cache_size * 1024 * 1024, args.force)
+
+    def _entry(self, key):
+        return os.path.join(self.cache_dir, key)
+
+    def restore(self, key, outputs):
+        """Bring outputs up to date from the cache
+
+        Returns a "skipped" or "restored" status per output, or None on a miss.
+        """
+        entry = self._entry(key)
+        if self.force or not os.path.isdir(entry):
+            return None
+        cached = [os.path.join(entry, os.path.basename(path)) for path in outputs]
+        if not all(os.path.exists(path) for path in cached):
+            return None
+
+        statuses = []
+        for source, path in zip(cached, outputs):
+            if os.path.exists(path) and filecmp.cmp(source, path, shallow=False):
+                statuses.append("skipped")
+            else:
+                atomic_copy(source, path)
+                statuses.append("restored")
+
+        # Mark the entry as recently used for eviction
+        os.utime(entry)
+        return statuses
+
+    def restore_entry(self, key, directory):
+        """Like restore, for outputs only known once built (an atlas's sheets): every file of the entry
+
+        Returns {path: status} with the files placed in directory, or None on a miss.
+        """
+        entry = self._entry(key)
+        if self.force or not os.path.isdir(entry):
+            return None
+        paths = [os.path.join(directory, name) for name in sorted(os.listdir(entry))]
+        os.makedirs(directory, exist_ok=True)
+        statuses = self.restore(key, paths) if paths else None
+        return dict(zip(paths, statuses)) if statuses else None
+
+    def store(self, key, outputs):
+        """Copy freshly built outputs into the cache"""
+        entry = self._entry(key)
+        staging = f"{entry}.tmp{os.getpid()}"
+        os.makedirs(staging, exist_ok=True)
+        for path in outputs:
+            shutil.copyfile(path, os.path.join(staging, os.path.basename(path)))
+        if os.path.isdir(entry):
+            shutil.rmtree(entry)
+        os.replace(staging, entry)
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits in max_bytes"""
+        if not os.path.isdir(self.cache_dir):
+            return []
+        entries = []
+        total = 0
+        for name in os.listdir(self.cache_dir):
+            entry = self._entry(name)
+            if not os.path.isdir(entry):
+                continue
+            size = sum(os.path.getsize(os.path.join(entry, f)) for f in os.listdir(entry))
+            entries.append((os.path.getmtime(entry), size, entry))
+            total += size
+
+        evicted = []
+        for _, size, entry in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry)
+            total -= size
+            evicted.append(os.path.basename(entry))
+        return evicted
+
+def run_cached_jobs(worker, entries, cache, max_workers, max_in_flight=None, prepare=None):
+    """Run the (key, outputs, job) entries that miss the cache and yield log lines
+
+    Cache hits are reported first in list order, followed by the rebuilt jobs in
+    list order, so the log stays deterministic however the pool schedules them.
+    prepare, if given, maps the jobs that missed to the jobs actually run, in the
+    same order, for work shared between them (the icon pyramid's master).
+    """
+    to_build = []
+    for key, outputs, job in entries:
+        statuses = cache.restore(key, outputs)
+        if statuses:
+            for path, status in zip(outputs, statuses):
+                yield f"♻️  {status.capitalize()} {os.path.basename(path)} (cached)"
+        else:
+            to_build.append((key, outputs, job))
+
+    jobs = (job for _, _, job in to_build)
+    if prepare:
+        jobs = prepare([job for _, _, job in to_build])
+    results = run_jobs(worker, jobs, max_workers, max_in_flight)
+    for (key, outputs, _), messages in zip(to_build, results):
+        yield from messages
+        cache.store(key, outputs)
+
+    for key in cache.evict():
+        yield f"🧹 Evicted cache entry {key[:12]}"
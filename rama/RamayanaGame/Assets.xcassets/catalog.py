@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Asset catalog metadata for the Ramayana asset pipeline
+Builds every imageset/appiconset Contents.json from the files the targets actually produced
+"""
+
+import json
+import os
+
+from targets import SCALES, scale_suffix
+from writer import atomic_write
+
+CATALOG_INFO = {"author": "xcode", "version": 1}
+
+# Every slot of the iOS app icon set as (idiom, size in points, scale); slots without a
+# generated file stay in the manifest unassigned, the way Xcode lists them
+APP_ICON_SLOTS = [
+    ("iphone", "20x20", "2x"),
+    ("iphone", "20x20", "3x"),
+    ("iphone", "29x29", "2x"),
+    ("iphone", "29x29", "3x"),
+    ("iphone", "40x40", "2x"),
+    ("iphone", "40x40", "3x"),
+    ("iphone", "60x60", "2x"),
+    ("iphone", "60x60", "3x"),
+    ("ipad", "20x20", "1x"),
+    ("ipad", "20x20", "2x"),
+    ("ipad", "29x29", "1x"),
+    ("ipad", "29x29", "2x"),
+    ("ipad", "40x40", "1x"),
+    ("ipad", "40x40", "2x"),
+    ("ipad", "76x76", "2x"),
+    ("ipad", "83.5x83.5", "2x"),
+    ("ios-marketing", "1024x1024", "1x"),
+]
+
+def contents_json(manifest):
+    """Serialize a manifest the way Xcode writes Contents.json"""
+    return json.dumps(manifest, indent=2, sort_keys=True, separators=(",", " : ")) + "\n"
+
+def catalog_root(directory):
+    """The enclosing .xcassets directory of an imageset or appiconset"""
+    while not directory.endswith(".xcassets"):
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            raise ValueError(f"{directory} is not inside an .xcassets catalog")
+        directory = parent
+    return directory
+
+def appiconset_images(target, root):
+    """Icon slots, each pointing at its PNG when the build produced one"""
+    directory = os.path.join(root, target.output_dir)
+    produced = {asset.name for asset in target.assets
+                if os.path.exists(os.path.join(directory, f"{asset.name}.png"))}
+    images = []
+    for idiom, size, scale in APP_ICON_SLOTS:
+        image = {"idiom": idiom, "scale": scale, "size": size}
+        if f"{size}@{scale}" in produced:
+            image["filename"] = f"{size}@{scale}.png"
+        images.append(image)
+    return images
+
+def imageset_images(target, root, assets):
+    """Image entries for the assets sharing one imageset, in target order
+
+    An imageset holding a single asset keeps empty slots for the scales it does not ship;
+    a shared one lists only the files that exist.
+    """
+    images = []
+    for asset in assets:
+        paths = dict(zip(target.scales, target.outputs(root, asset)))
+        for scale in SCALES:
+            image = {"idiom": "universal", "scale": f"{scale}x"}
+            if scale in paths and os.path.exists(paths[scale]):
+                image["filename"] = f"{asset.name}{scale_suffix(scale)}.png"
+            elif len(assets) > 1:
+                continue
+            images.append(image)
+    return images
+
+def target_manifests(target, root):
+    """{Contents.json path: manifest} for every imageset/appiconset of a target that has files on disk"""
+    if target.output_dir.endswith(".appiconset"):
+        images = appiconset_images(target, root)
+        groups = {os.path.join(root, target.output_dir): images} if any("filename" in i for i in images) else {}
+    else:
+        by_directory = {}
+        for asset in target.assets:
+            by_directory.setdefault(target.directory(root, asset), []).append(asset)
+        groups = {}
+        for directory, assets in by_directory.items():
+            images = imageset_images(target, root, assets)
+            if any("filename" in image for image in images):
+                groups[directory] = images
+    return {os.path.join(directory, "Contents.json"): {"images": images, "info": CATALOG_INFO}
+            for directory, images in groups.items()}
+
+def catalog_manifests(targets, root):
+    """Every Contents.json the targets need, including each catalog's own root manifest"""
+    manifests = {}
+    for target in targets:
+        for path, manifest in target_manifests(target, root).items():
+            catalog = os.path.join(catalog_root(os.path.dirname(path)), "Contents.json")
+            manifests.setdefault(catalog, {"info": CATALOG_INFO})
+            manifests[path] = manifest
+    return manifests
+
+def write_catalog(targets, root):
+    """Regenerate the catalog metadata for the targets in one pass at the end of a build
+
+    Every manifest is rendered from what is on disk before any file is touched, so a
+    filtered or incremental build still lists the assets it did not rebuild. Files whose
+    content is unchanged are left alone; the rest are replaced atomically.
+    """
+    rendered = {path: contents_json(manifest) for path, manifest in catalog_manifests(targets, root).items()}
+    messages = []
+    for path, text in rendered.items():
+        if os.path.exists(path):
+            with open(path) as f:
+                if f.read() == text:
+                    continue
+        atomic_write(path, text)
+        messages.append(f"📝 Wrote {os.path.relpath(path, root)}")
+    return messages
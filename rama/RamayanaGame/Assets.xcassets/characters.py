@@ -0,0 +1,480 @@
+#!/usr/bin/env python3
+"""
+Declarative character specs for the Ramayana sprites and portraits
+Each spec compiles once per (spec, size, scale) into a flat list of draw ops that is replayed at render time
+"""
+
+from PIL import Image, ImageDraw
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import NamedTuple
+import math
+
+from drawing import scale_xy
+
+BLACK = (0, 0, 0)
+WHITE = (255, 255, 255)
+
+# Methods that take an outline width (line takes its stroke width, which defaults to 0)
+_OUTLINED = ("ellipse", "rectangle", "polygon", "arc")
+
+def op(method, xy, **kwargs):
+    """One primitive draw op in points: (ImageDraw method, coordinates, keyword arguments)"""
+    kwargs.setdefault("width", 1 if method in _OUTLINED else 0)
+    return (method, xy, kwargs)
+
+def _scale_ops(ops, scale):
+    """Map point-space ops to pixel-space ops at one scale factor"""
+    return tuple((method, scale_xy(xy, scale), {**kwargs, "width": kwargs["width"] * scale})
+                 for method, xy, kwargs in ops)
+
+def replay(img, ops):
+    """Draw a compiled op list onto an image"""
+    draw = ImageDraw.Draw(img)
+    for method, xy, kwargs in ops:
+        getattr(draw, method)(xy, **kwargs)
+    return img
+
+# ---------------------------------------------------------------------------
+# Full-body sprites
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class Build:
+    """Body proportions; every size is canvas width/height (or a parent part) floor-divided by a divisor"""
+    head_divisor: float = 6          # head radius = width // head_divisor
+    head_y_divisor: float = 4        # head centre y = height // head_y_divisor
+    body_width_divisor: float = 3
+    body_height_divisor: float = 2
+    arm_width_divisor: float = 4     # of the body width
+    arm_height_divisor: float = 2    # of the body height
+    leg_width_divisor: float = 3     # of the body width
+    leg_height_divisor: float = 2    # of the body height
+    leg_spread_divisor: float = 1    # legs sit leg_width // divisor either side of centre
+    right_arm_raised: bool = False   # lift the right arm by a quarter of its height
+    head_outline: int = 2
+    body_outline: int = 2
+    limb_outline: int = 1
+
+@dataclass(frozen=True)
+class Eyes:
+    """Eye whites and pupils"""
+    color: tuple = WHITE
+    pupil: tuple = BLACK
+    divisor: float = 4               # eye radius = head radius // divisor
+    outline: int = 1
+
+class Layout(NamedTuple):
+    """Resolved anchor points handed to props, all in points"""
+    width: int
+    height: int
+    head_x: float
+    head_y: float
+    head_radius: float
+    body_x: float
+    body_y: float
+    body_width: float
+    body_height: float
+    arm_width: float
+    arm_height: float
+    left_arm_x: float
+    left_arm_y: float
+    right_arm_x: float
+    right_arm_y: float
+    skin: tuple
+
+# Props declare the slot they are drawn in:
+#   head - after the head, before the eyes (hair, horns, ears)
+#   face - after the pupils (fangs)
+#   body - after the torso, before the arms (sashes, saris, jewellery)
+#   hand - after the arms, before the legs (weapons, flowers, fists)
+
+@dataclass(frozen=True)
+class Hair:
+    """Flowing hair polygon; sweep is four (dx, dy) offsets out from the top corners of the head"""
+    color: tuple
+    sweep: tuple = ((10, 15), (5, 25), (5, 20), (10, 10))
+    slot = "head"
+
+    def ops(self, lay):
+        x0, x1, top = lay.head_x - lay.head_radius, lay.head_x + lay.head_radius, lay.head_y - lay.head_radius
+        (a, b), (c, d), (e, f), (g, h) = self.sweep
+        return [op("polygon", [(x0, top), (x0 - a, top - b), (x0 - c, top - d),
+                               (x1 + e, top - f), (x1 + g, top - h), (x1, top)], fill=self.color)]
+
+@dataclass(frozen=True)
+class Horns:
+    """A pair of curved horns above the head"""
+    color: tuple
+    slot = "head"
+
+    def ops(self, lay):
+        top = lay.head_y - lay.head_radius
+        left = lay.head_x - lay.head_radius // 2
+        right = lay.head_x + lay.head_radius // 2
+        return [op("polygon", [(left, top), (left - 10, top - 20), (left - 5, top - 30)], fill=self.color),
+                op("polygon", [(right, top), (right + 10, top - 20), (right + 5, top - 30)], fill=self.color)]
+
+@dataclass(frozen=True)
+class Spikes:
+    """Row of spiky hair tufts above the head"""
+    color: tuple
+    count: int = 5
+    slot = "head"
+
+    def ops(self, lay):
+        ops = []
+        for i in range(self.count):
+            x = lay.head_x - lay.head_radius + i * lay.head_radius // 2
+            y = lay.head_y - lay.head_radius - 10
+            ops.append(op("polygon", [(x, y), (x - 5, y - 15), (x + 5, y - 15)], fill=self.color))
+        return ops
+
+@dataclass(frozen=True)
+class Ears:
+    """Round monkey ears either side of the head, in the skin colour"""
+    slot = "head"
+
+    def ops(self, lay):
+        r = lay.head_radius // 2
+        return [op("ellipse", [x - r, lay.head_y - r, x + r, lay.head_y + r], fill=lay.skin, outline=BLACK, width=1)
+                for x in (lay.head_x - lay.head_radius, lay.head_x + lay.head_radius)]
+
+@dataclass(frozen=True)
+class Crown:
+    """Pointed golden crown sitting on the head"""
+    color: tuple = (255, 215, 0)
+    points: int = 3
+    slot = "head"
+
+    def ops(self, lay):
+        r = lay.head_radius
+        base = lay.head_y - r * 3 // 4
+        step = 2 * r / (2 * self.points)
+        outline = [(lay.head_x - r, base)]
+        for i in range(self.points):
+            outline.append((lay.head_x - r + step * (2 * i + 1), base - r // 2))
+            outline.append((lay.head_x - r + step * (2 * i + 2), base))
+        return [op("polygon", outline, fill=self.color, outline=BLACK, width=1)]
+
+@dataclass(frozen=True)
+class Fangs:
+    """Two white fangs below the eyes"""
+    color: tuple = WHITE
+    slot = "face"
+
+    def ops(self, lay):
+        y = lay.head_y + lay.head_radius // 2
+        return [op("polygon", [(x, y), (x - 4, y + 15), (x + 4, y + 15)], fill=self.color)
+                for x in (lay.head_x - 10, lay.head_x + 10)]
+
+@dataclass(frozen=True)
+class Band:
+    """Cloth band across the torso: a sash, sari or loincloth
+
+    extra widens the band past the torso; height_divisor divides the torso height;
+    anchor is "center" (on the chest) or "bottom" (at the waist).
+    """
+    color: tuple
+    extra: int = 10
+    height_divisor: float = 3
+    anchor: str = "center"
+    outline: int = 1
+    slot = "body"
+
+    def ops(self, lay):
+        w = lay.body_width + self.extra
+        h = lay.body_height // self.height_divisor
+        if self.anchor == "bottom":
+            bottom = lay.body_y + lay.body_height // 2
+            box = [lay.body_x - w // 2, bottom - h, lay.body_x + w // 2, bottom]
+        else:
+            box = [lay.body_x - w // 2, lay.body_y - h // 2, lay.body_x + w // 2, lay.body_y + h // 2]
+        return [op("rectangle", box, fill=self.color, outline=BLACK, width=self.outline)]
+
+@dataclass(frozen=True)
+class Jewel:
+    """Round jewel on the forehead"""
+    color: tuple = (255, 215, 0)
+    slot = "body"
+
+    def ops(self, lay):
+        r = lay.head_radius // 3
+        return [op("ellipse", [lay.head_x - r, lay.head_y - r, lay.head_x + r, lay.head_y + r],
+                   fill=self.color, outline=BLACK, width=1)]
+
+@dataclass(frozen=True)
+class Bow:
+    """Recurve bow with string and nocked arrow, held in the left hand"""
+    color: tuple = (139, 69, 19)
+    arrow: tuple = (139, 69, 19)
+    slot = "hand"
+
+    def ops(self, lay):
+        x, y = lay.left_arm_x, lay.left_arm_y + lay.arm_height // 2
+        w, h = lay.width // 2, lay.height // 3
+        arrow = w // 2
+        return [op("line", [(x - w // 2, y), (x - w // 3, y - h // 2), (x, y - h // 3),
+                            (x + w // 3, y - h // 2), (x + w // 2, y)], fill=self.color, width=8),
+                op("line", [(x - w // 2, y), (x + w // 2, y)], fill=WHITE, width=2),
+                op("line", [(x - arrow // 2, y), (x + arrow // 2, y)], fill=self.arrow, width=3)]
+
+@dataclass(frozen=True)
+class Lotus:
+    """Lotus flower held in the right hand"""
+    color: tuple = (255, 182, 193)
+    petals: int = 8
+    slot = "hand"
+
+    def ops(self, lay):
+        x, y = lay.right_arm_x, lay.right_arm_y + lay.arm_height // 2
+        ops = []
+        for i in range(self.petals):
+            angle = math.radians(i * 360 / self.petals)
+            px = x + int(15 * math.cos(angle))
+            py = y + int(15 * math.sin(angle))
+            ops.append(op("ellipse", [px - 8, py - 8, px + 8, py + 8], fill=self.color))
+        return ops
+
+@dataclass(frozen=True)
+class Mace:
+    """Mace hanging from the right hand"""
+    handle: tuple = (139, 69, 19)
+    head: tuple = (255, 215, 0)
+    slot = "hand"
+
+    def ops(self, lay):
+        x, y = lay.right_arm_x, lay.right_arm_y + lay.arm_height // 2
+        w, h = 20, lay.height // 3
+        r = w * 2
+        return [op("rectangle", [x - w // 2, y, x + w // 2, y + h], fill=self.handle, outline=BLACK, width=2),
+                op("ellipse", [x - r, y - r, x + r, y + r], fill=self.head, outline=BLACK, width=2)]
+
+@dataclass(frozen=True)
+class Fist:
+    """Clenched fist at the end of the right arm"""
+    outline: int = 2
+    slot = "hand"
+
+    def ops(self, lay):
+        r = lay.arm_width // 2
+        y = lay.right_arm_y + lay.arm_height // 2
+        return [op("ellipse", [lay.right_arm_x - r, y - r, lay.right_arm_x + r, y + r],
+                   fill=lay.skin, outline=BLACK, width=self.outline)]
+
+@dataclass(frozen=True)
+class CharacterSpec:
+    """A full-body sprite: skin colour, proportions, eyes and an ordered tuple of props"""
+    name: str
+    skin: tuple
+    build: Build = Build()
+    eyes: Eyes = Eyes()
+    props: tuple = ()
+
+def _character_ops(spec, width, height):
+    """Lay out head, eyes, torso, arms and legs in points, with props in their slots"""
+    b = spec.build
+    head_radius = width // b.head_divisor
+    body_width = width // b.body_width_divisor
+    body_height = height // b.body_height_divisor
+    head_x, head_y = width // 2, height // b.head_y_divisor
+    body_x = width // 2
+    body_y = head_y + head_radius + body_height // 2
+    arm_width = body_width // b.arm_width_divisor
+    arm_height = body_height // b.arm_height_divisor
+    left_arm_x = body_x - body_width // 2 - arm_width // 2
+    right_arm_x = body_x + body_width // 2 + arm_width // 2
+    right_arm_y = body_y - arm_height // 4 if b.right_arm_raised else body_y
+    lay = Layout(width, height, head_x, head_y, head_radius, body_x, body_y, body_width, body_height,
+                 arm_width, arm_height, left_arm_x, body_y, right_arm_x, right_arm_y, spec.skin)
+
+    def slot(name):
+        return [o for prop in spec.props if prop.slot == name for o in prop.ops(lay)]
+
+    ops = [op("ellipse", [head_x - head_radius, head_y - head_radius, head_x + head_radius, head_y + head_radius],
+              fill=spec.skin, outline=BLACK, width=b.head_outline)]
+    ops += slot("head")
+
+    # Eyes, then pupils
+    eye_r = head_radius // spec.eyes.divisor
+    pupil_r = eye_r // 2
+    eye_xs = (head_x - head_radius // 2, head_x + head_radius // 2)
+    ops += [op("ellipse", [x - eye_r, head_y - eye_r // 2, x + eye_r, head_y + eye_r // 2],
+               fill=spec.eyes.color, outline=BLACK, width=spec.eyes.outline) for x in eye_xs]
+    ops += [op("ellipse", [x - pupil_r, head_y - pupil_r // 2, x + pupil_r, head_y + pupil_r // 2],
+               fill=spec.eyes.pupil) for x in eye_xs]
+    ops += slot("face")
+
+    ops.append(op("rectangle", [body_x - body_width // 2, body_y - body_height // 2,
+                                body_x + body_width // 2, body_y + body_height // 2],
+                  fill=spec.skin, outline=BLACK, width=b.body_outline))
+    ops += slot("body")
+
+    for x, y in ((left_arm_x, body_y), (right_arm_x, right_arm_y)):
+        ops.append(op("rectangle", [x - arm_width // 2, y - arm_height // 2, x + arm_width // 2, y + arm_height // 2],
+                      fill=spec.skin, outline=BLACK, width=b.limb_outline))
+    ops += slot("hand")
+
+    leg_width = body_width // b.leg_width_divisor
+    leg_height = body_height // b.leg_height_divisor
+    leg_y = body_y + body_height // 2 + leg_height // 2
+    spread = leg_width // b.leg_spread_divisor
+    for x in (body_x - spread, body_x + spread):
+        ops.append(op("rectangle", [x - leg_width // 2, leg_y - leg_height // 2, x + leg_width // 2, leg_y + leg_height // 2],
+                      fill=spec.skin, outline=BLACK, width=b.limb_outline))
+    return ops
+
+@lru_cache(maxsize=None)
+def compile_character(spec, width, height, scale=1):
+    """Compile a character spec into pixel-space draw ops, memoized per (spec, size, scale)"""
+    return _scale_ops(_character_ops(spec, width, height), scale)
+
+def render_character(spec, width, height, scale=1):
+    """Render a full-body character sprite onto a transparent canvas"""
+    img = Image.new('RGBA', (width * scale, height * scale), (0, 0, 0, 0))
+    return replay(img, compile_character(spec, width, height, scale))
+
+RAMA = CharacterSpec(
+    name="rama",
+    skin=(135, 206, 235),                                  # Light blue
+    build=Build(right_arm_raised=True),
+    props=(Hair((25, 25, 112)),                            # Dark blue
+           Band((255, 165, 0)),                            # Orange sash
+           Bow()),
+)
+
+SITA = CharacterSpec(
+    name="sita",
+    skin=(255, 228, 196),                                  # Golden skin
+    props=(Hair((139, 69, 19), sweep=((15, 20), (10, 40), (10, 35), (15, 15))),
+           Band((220, 20, 60), extra=15, height_divisor=1),  # Red sari
+           Jewel(),
+           Lotus()),
+)
+
+HANUMAN = CharacterSpec(
+    name="hanuman",
+    skin=(255, 165, 0),                                    # Orange
+    props=(Ears(),
+           Band((255, 215, 0)),                            # Gold clothing
+           Mace()),
+)
+
+DEMON = CharacterSpec(
+    name="demon",
+    skin=(220, 20, 60),                                    # Crimson red
+    build=Build(head_divisor=5, head_y_divisor=3, body_width_divisor=2.5, body_height_divisor=1.8,
+                arm_width_divisor=3, arm_height_divisor=1.5, leg_width_divisor=2.5, leg_height_divisor=1.2,
+                leg_spread_divisor=2, head_outline=3, body_outline=3, limb_outline=2),
+    eyes=Eyes(color=(255, 0, 0), pupil=WHITE, divisor=3, outline=2),
+    props=(Horns((139, 69, 19)),
+           Spikes((139, 0, 0)),                            # Dark red
+           Fangs(),
+           Band((101, 67, 33), height_divisor=4, anchor="bottom", outline=2),  # Brown loincloth
+           Fist()),
+)
+
+LAKSHMANA = CharacterSpec(
+    name="lakshmana",
+    skin=(222, 184, 135),                                  # Fair skin
+    build=Build(right_arm_raised=True),
+    props=(Hair((60, 40, 20), sweep=((8, 12), (4, 20), (4, 18), (8, 8))),
+           Band((34, 139, 34)),                            # Green sash
+           Bow(color=(101, 67, 33))),
+)
+
+RAVANA = CharacterSpec(
+    name="ravana",
+    skin=(75, 0, 130),                                     # Deep indigo
+    build=DEMON.build,
+    eyes=Eyes(color=(255, 215, 0), pupil=(139, 0, 0), divisor=3, outline=2),
+    props=(Crown(),
+           Fangs(),
+           Band((139, 0, 0), height_divisor=4, anchor="bottom", outline=2),  # Dark red dhoti
+           Fist()),
+)
+
+CHARACTERS = {spec.name: spec for spec in (RAMA, SITA, HANUMAN, DEMON, LAKSHMANA, RAVANA)}
+
+# ---------------------------------------------------------------------------
+# Portraits for the character select screen
+# ---------------------------------------------------------------------------
+
+def frac(num, den=1, offset=0):
+    """Portrait coordinate term: num * dimension // den + offset"""
+    return (num, den, offset)
+
+@dataclass(frozen=True)
+class Shape:
+    """One portrait primitive; coords alternate x and y terms from frac()"""
+    method: str
+    coords: tuple
+    fill: tuple
+    width: int = 1
+    start: float = None
+    end: float = None
+
+@dataclass(frozen=True)
+class PortraitSpec:
+    """An anime-style portrait made of shapes laid out relative to the canvas"""
+    name: str
+    shapes: tuple
+
+def _portrait_ops(spec, width, height):
+    ops = []
+    for shape in spec.shapes:
+        dims = (width, height)
+        xy = [num * dims[i % 2] // den + offset for i, (num, den, offset) in enumerate(shape.coords)]
+        extra = {"start": shape.start, "end": shape.end} if shape.method == "arc" else {}
+        ops.append(op(shape.method, xy, fill=shape.fill, width=shape.width, **extra))
+    return ops
+
+@lru_cache(maxsize=None)
+def compile_portrait(spec, width, height, scale=1):
+    """Compile a portrait spec into pixel-space draw ops, memoized per (spec, size, scale)"""
+    return _scale_ops(_portrait_ops(spec, width, height), scale)
+
+def render_portrait(spec, width, height, scale=1):
+    """Render a portrait onto a transparent canvas"""
+    img = Image.new('RGBA', (width * scale, height * scale), (0, 0, 0, 0))
+    return replay(img, compile_portrait(spec, width, height, scale))
+
+def _face(skin):
+    """Head shared by every portrait; the eye whites come from _eyes, after the hair"""
+    return (Shape("ellipse", (frac(1, 4), frac(1, 6), frac(3, 4), frac(1, 2)), skin),)
+
+def _eyes():
+    """Eye whites shared by every portrait"""
+    return (Shape("ellipse", (frac(1, 3), frac(1, 3), frac(1, 2, -10), frac(1, 2, -10)), WHITE),
+            Shape("ellipse", (frac(1, 2, 10), frac(1, 3), frac(2, 3), frac(1, 2, -10)), WHITE))
+
+def _lotus_petals(color, radius=20, petal=15):
+    """Eight petals around the canvas centre"""
+    petals = []
+    for i in range(8):
+        angle = math.radians(i * 45)
+        dx, dy = int(radius * math.cos(angle)), int(radius * math.sin(angle))
+        petals.append(Shape("ellipse", (frac(1, 2, dx - petal), frac(1, 2, dy - petal),
+                                        frac(1, 2, dx + petal), frac(1, 2, dy + petal)), color))
+    return tuple(petals)
+
+PORTRAITS = {
+    # Lord Rama - blue skin, golden crown, bow
+    "rama": PortraitSpec("rama", _face((135, 206, 235)) + (
+        Shape("polygon", (frac(1, 2), frac(1, 8), frac(1, 3), frac(1, 4), frac(2, 3), frac(1, 4)), (255, 215, 0)),
+    ) + _eyes() + (
+        Shape("arc", (frac(1, 6), frac(1, 2), frac(5, 6), frac(1)), (139, 69, 19), width=8, start=0, end=180),
+    )),
+    # Goddess Sita - golden skin, red sari, lotus
+    "sita": PortraitSpec("sita", _face((255, 228, 196)) + (
+        Shape("ellipse", (frac(1, 4, -10), frac(1, 6, -10), frac(3, 4, 10), frac(1, 3)), (139, 69, 19)),
+    ) + _eyes() + _lotus_petals((255, 182, 193))),
+    # Lord Hanuman - orange skin, mace, flying
+    "hanuman": PortraitSpec("hanuman", _face((255, 165, 0)) + (
+        Shape("ellipse", (frac(1, 6), frac(1, 8), frac(1, 3), frac(1, 3)), (255, 165, 0)),
+        Shape("ellipse", (frac(2, 3), frac(1, 8), frac(5, 6), frac(1, 3)), (255, 165, 0)),
+    ) + _eyes() + (
+        Shape("rectangle", (frac(1, 2, -5), frac(1, 2), frac(1, 2, 5), frac(1)), (139, 69, 19)),
+        Shape("ellipse", (frac(1, 2, -15), frac(1, 2, -15), frac(1, 2, 15), frac(1, 2, 15)), (255, 215, 0)),
+    )),
+}
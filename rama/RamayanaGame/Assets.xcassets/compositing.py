@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Premultiplied-alpha layer compositing for the Ramayana asset generators
+Stacks RGBA layers with normal/add/multiply/screen blending and re-flattens only dirty rectangles
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+from gradients import to_image
+
+BLEND_MODES = ("normal", "add", "multiply", "screen")
+
+class Layer(NamedTuple):
+    """Premultiplied RGBA pixels in 0..1, shape (height, width, 4), placed at origin on the canvas"""
+    pixels: np.ndarray
+    origin: tuple = (0, 0)
+    blend: str = "normal"
+    opacity: float = 1.0
+
+    @classmethod
+    def from_image(cls, img, origin=(0, 0), blend="normal", opacity=1.0):
+        """Premultiply a Pillow image (any mode) into a layer"""
+        if blend not in BLEND_MODES:
+            raise ValueError(f"unknown blend mode: {blend} (choose from {', '.join(BLEND_MODES)})")
+        pixels = np.asarray(img.convert('RGBA'), dtype=np.float32)
+        pixels /= 255.0
+        if pixels[..., 3].min() < 1.0:
+            # Opaque images are already premultiplied (alpha is exactly 1)
+            pixels[..., :3] *= pixels[..., 3:]
+        pixels.setflags(write=False)
+        return cls(pixels, tuple(origin), blend, opacity)
+
+    def moved(self, origin):
+        """The same pixels at another position"""
+        return self._replace(origin=tuple(origin))
+
+    @property
+    def rect(self):
+        """(x0, y0, x1, y1) the layer covers on the canvas, end-exclusive"""
+        x, y = self.origin
+        height, width = self.pixels.shape[:2]
+        return (x, y, x + width, y + height)
+
+def _intersect(a, b):
+    """Overlap of two end-exclusive rects, or None"""
+    rect = (max(a[0], b[0]), max(a[1], b[1]), min(a[2], b[2]), min(a[3], b[3]))
+    return rect if rect[0] < rect[2] and rect[1] < rect[3] else None
+
+def blend(backdrop, source, mode):
+    """Composite premultiplied source over premultiplied backdrop (both (..., 4)) with a separable blend mode"""
+    cs, alpha_s = source[..., :3], source[..., 3:]
+    cb, alpha_b = backdrop[..., :3], backdrop[..., 3:]
+    if mode == "normal":
+        color = cs + cb * (1.0 - alpha_s)
+    elif mode == "add":
+        color = np.minimum(cs + cb, 1.0)
+        return np.concatenate([color, np.minimum(alpha_s + alpha_b, 1.0)], axis=-1)
+    elif mode == "multiply":
+        color = cs * cb + cs * (1.0 - alpha_b) + cb * (1.0 - alpha_s)
+    elif mode == "screen":
+        color = cs + cb - cs * cb
+    else:
+        raise ValueError(f"unknown blend mode: {mode}")
+    return np.concatenate([color, alpha_s + alpha_b * (1.0 - alpha_s)], axis=-1)
+
+class LayerStack:
+    """Layers composited bottom to top onto a fixed-size canvas
+
+    The flattened result is kept between calls. Adding a layer only composites that layer inside
+    its own rectangle; replacing or removing one re-flattens the stack inside the rectangles it
+    touched. Everything else is left as it was.
+
+    Meant for stacking whole rendered images, as character select does with its portraits. The
+    sprite builders draw opaque primitives straight onto one ImageDraw canvas, where a float
+    layer per primitive would only add conversions and change Pillow's anti-aliasing.
+    """
+
+    def __init__(self, width, height):
+        self.size = (width, height)
+        self.layers = []
+        self._flat = np.zeros((height, width, 4), dtype=np.float32)
+        # Layers appended since the last flatten, composited onto the cached result in order
+        self._pending = []
+        # Rects whose cached result is stale and must be rebuilt from every layer
+        self._dirty = []
+
+    @classmethod
+    def from_image(cls, img):
+        """A stack whose bottom layer is img"""
+        stack = cls(*img.size)
+        stack.add(Layer.from_image(img))
+        return stack
+
+    def _canvas_rect(self, layer):
+        return _intersect(layer.rect, (0, 0) + self.size)
+
+    def add(self, layer):
+        """Put a layer on top; returns its index"""
+        self.layers.append(layer)
+        self._pending.append(layer)
+        return len(self.layers) - 1
+
+    def replace(self, index, layer):
+        """Swap the layer at index, dirtying the old and new rectangles"""
+        old = self.layers[index]
+        self.layers[index] = layer
+        self._dirty += [rect for rect in (self._canvas_rect(old), self._canvas_rect(layer)) if rect]
+        self._pending_to_dirty()
+
+    def remove(self, index):
+        """Drop the layer at index, dirtying its rectangle"""
+        rect = self._canvas_rect(self.layers.pop(index))
+        if rect:
+            self._dirty.append(rect)
+        self._pending_to_dirty()
+
+    def _pending_to_dirty(self):
+        """Dirty the rects of layers not composited yet: with the stack below them changed they can
+        no longer be blended onto the cached result in order"""
+        self._dirty += [rect for rect in map(self._canvas_rect, self._pending) if rect]
+        self._pending = []
+
+    def _composite(self, layer, rect):
+        """Blend one layer into the cached result inside rect"""
+        x0, y0, x1, y1 = rect
+        ox, oy = layer.origin
+        source = layer.pixels[y0 - oy:y1 - oy, x0 - ox:x1 - ox]
+        if layer.opacity != 1.0:
+            source = source * layer.opacity
+        target = self._flat[y0:y1, x0:x1]
+        if layer.blend == "normal":
+            # Same arithmetic as blend() for every channel, done in place without its temporaries
+            target *= 1.0 - source[..., 3:]
+            target += source
+        else:
+            target[...] = blend(target, source, layer.blend)
+
+    def flatten(self):
+        """Bring the cached result up to date, touching only dirty rectangles, and return it as an image"""
+        if self._dirty:
+            # A changed layer below others invalidates the whole stack inside its rect
+            for rect in self._dirty:
+                x0, y0, x1, y1 = rect
+                self._flat[y0:y1, x0:x1] = 0.0
+                for layer in self.layers:
+                    overlap = _intersect(self._canvas_rect(layer) or (0, 0, 0, 0), rect)
+                    if overlap:
+                        self._composite(layer, overlap)
+            self._dirty = []
+            self._pending = []
+        for layer in self._pending:
+            rect = self._canvas_rect(layer)
+            if rect:
+                self._composite(layer, rect)
+        self._pending = []
+        return self.image()
+
+    def image(self, mode='RGB'):
+        """The cached result as a straight-alpha Pillow image (RGB drops alpha after un-premultiplying)"""
+        alpha = self._flat[..., 3:]
+        if alpha.min() == 1.0:
+            # Fully opaque: premultiplied and straight colour are the same, nothing to divide
+            rgb = self._flat[..., :3]
+        else:
+            rgb = np.divide(self._flat[..., :3], alpha, out=np.zeros_like(self._flat[..., :3]), where=alpha > 0)
+        if mode == 'RGBA':
+            array = np.concatenate([rgb, alpha], axis=-1)
+            array *= 255.0
+        else:
+            array = rgb * 255.0
+        # Round, clamp and narrow in place rather than through to_image's float temporaries
+        np.rint(array, out=array)
+        np.clip(array, 0, 255, out=array)
+        return to_image(array.astype(np.uint8), mode)
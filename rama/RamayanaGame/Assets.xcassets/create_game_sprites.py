@@ -4,537 +4,72 @@ Create high-resolution anime-style RPG sprites for Ramayana Game
 Based on the reference style with blue-skinned Rama and red-skinned demons
 """
 
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image
+from gradients import linear_gradient
+from characters import DEMON, HANUMAN, LAKSHMANA, RAMA, RAVANA, SITA, render_character
+from drawing import ScaledDraw, add_quality_argument, supersample
+from parallel import add_jobs_argument
+from build_cache import BuildCache, add_cache_arguments, cache_key, run_cached_jobs
+from atlas import DEFAULT_PADDING, atlas_files, prune_sheets, write_atlasc
+from encoding import add_encode_arguments, encode_settings, save_asset
+from variants import character_variants
+from trim import read_trim_sidecar, trim_report, trim_sprite, write_trim_sidecar
+from instrument import add_instrument_arguments, configure, track, write_report
+from catalog import write_catalog
+from outlines import write_outlines
+from targets import (ATLAS_DIR, ATLAS_SPRITES, SCALES, TARGETS, TRIM_DIR, add_output_arguments, only_names,
+                     scale_suffix, select, trim_sidecar_path, unknown_names)
+from writer import add_writer_arguments, shared_writer, wait
+import writer
+import argparse
 import os
-import math
+import time
+
+# Sunset sky, orange at the top fading to red-orange at the horizon
+SKY_GRADIENT = [(255, 140, 0), (255, 69, 0)]
+
+TARGET = TARGETS["sprites"]
+
+# Packs ATLAS_SPRITES, what CombatScene draws, so a fight binds a single texture
+ATLAS_NAME = "Characters"
+# Seeded recolours of the enemy sprites, packed into their own atlas
+VARIANT_ATLAS_NAME = "Enemies"
+VARIANT_BASES = {"demon": DEMON, "ravana": RAVANA}
 
 def create_directory(path):
     """Create directory if it doesn't exist"""
     if not os.path.exists(path):
         os.makedirs(path)
 
-def create_rama_sprite(width, height):
+def create_rama_sprite(width, height, scale=1):
     """Create Lord Rama sprite based on the reference style"""
-    img = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
-    
-    # Body proportions
-    head_radius = width // 6
-    body_width = width // 3
-    body_height = height // 2
-    
-    # Blue skin color (like reference)
-    skin_color = (135, 206, 235)  # Light blue
-    hair_color = (25, 25, 112)    # Dark blue
-    clothing_color = (255, 165, 0) # Orange sash
-    bow_color = (139, 69, 19)     # Brown bow
-    
-    # Head
-    head_x = width // 2
-    head_y = height // 4
-    draw.ellipse([head_x - head_radius, head_y - head_radius, 
-                   head_x + head_radius, head_y + head_radius], 
-                  fill=skin_color, outline=(0, 0, 0), width=2)
-    
-    # Hair (flowing style like reference)
-    hair_points = [
-        (head_x - head_radius, head_y - head_radius),
-        (head_x - head_radius - 10, head_y - head_radius - 15),
-        (head_x - head_radius - 5, head_y - head_radius - 25),
-        (head_x + head_radius + 5, head_y - head_radius - 20),
-        (head_x + head_radius + 10, head_y - head_radius - 10),
-        (head_x + head_radius, head_y - head_radius)
-    ]
-    draw.polygon(hair_points, fill=hair_color)
-    
-    # Eyes
-    eye_radius = head_radius // 4
-    draw.ellipse([head_x - head_radius//2 - eye_radius, head_y - eye_radius//2,
-                   head_x - head_radius//2 + eye_radius, head_y + eye_radius//2], 
-                  fill=(255, 255, 255), outline=(0, 0, 0))
-    draw.ellipse([head_x + head_radius//2 - eye_radius, head_y - eye_radius//2,
-                   head_x + head_radius//2 + eye_radius, head_y + eye_radius//2], 
-                  fill=(255, 255, 255), outline=(0, 0, 0))
-    
-    # Pupils
-    pupil_radius = eye_radius // 2
-    draw.ellipse([head_x - head_radius//2 - pupil_radius, head_y - pupil_radius//2,
-                   head_x - head_radius//2 + pupil_radius, head_y + pupil_radius//2], 
-                  fill=(0, 0, 0))
-    draw.ellipse([head_x + head_radius//2 - pupil_radius, head_y - pupil_radius//2,
-                   head_x + head_radius//2 + pupil_radius, head_y + pupil_radius//2], 
-                  fill=(0, 0, 0))
-    
-    # Body (torso)
-    body_x = width // 2
-    body_y = head_y + head_radius + body_height//2
-    draw.rectangle([body_x - body_width//2, body_y - body_height//2,
-                    body_x + body_width//2, body_y + body_height//2], 
-                   fill=skin_color, outline=(0, 0, 0), width=2)
-    
-    # Orange sash (like reference)
-    sash_width = body_width + 10
-    sash_height = body_height // 3
-    draw.rectangle([body_x - sash_width//2, body_y - sash_height//2,
-                    body_x + sash_width//2, body_y + sash_height//2], 
-                   fill=clothing_color, outline=(0, 0, 0), width=1)
-    
-    # Arms
-    arm_width = body_width // 4
-    arm_height = body_height // 2
-    
-    # Left arm (holding bow)
-    left_arm_x = body_x - body_width//2 - arm_width//2
-    left_arm_y = body_y
-    draw.rectangle([left_arm_x - arm_width//2, left_arm_y - arm_height//2,
-                    left_arm_x + arm_width//2, left_arm_y + arm_height//2], 
-                   fill=skin_color, outline=(0, 0, 0), width=1)
-    
-    # Right arm (drawing bow)
-    right_arm_x = body_x + body_width//2 + arm_width//2
-    right_arm_y = body_y - arm_height//4
-    draw.rectangle([right_arm_x - arm_width//2, right_arm_y - arm_height//2,
-                    right_arm_x + arm_width//2, right_arm_y + arm_height//2], 
-                   fill=skin_color, outline=(0, 0, 0), width=1)
-    
-    # Bow (recurve style like reference)
-    bow_center_x = left_arm_x
-    bow_center_y = left_arm_y + arm_height//2
-    bow_width = width // 2
-    bow_height = height // 3
-    
-    # Bow curve
-    bow_points = [
-        (bow_center_x - bow_width//2, bow_center_y),
-        (bow_center_x - bow_width//3, bow_center_y - bow_height//2),
-        (bow_center_x, bow_center_y - bow_height//3),
-        (bow_center_x + bow_width//3, bow_center_y - bow_height//2),
-        (bow_center_x + bow_width//2, bow_center_y)
-    ]
-    draw.line(bow_points, fill=bow_color, width=8)
-    
-    # Bowstring
-    draw.line([(bow_center_x - bow_width//2, bow_center_y), 
-               (bow_center_x + bow_width//2, bow_center_y)], 
-              fill=(255, 255, 255), width=2)
-    
-    # Arrow
-    arrow_length = bow_width // 2
-    draw.line([(bow_center_x - arrow_length//2, bow_center_y),
-               (bow_center_x + arrow_length//2, bow_center_y)], 
-              fill=(139, 69, 19), width=3)
-    
-    # Legs
-    leg_width = body_width // 3
-    leg_height = body_height // 2
-    
-    # Left leg
-    left_leg_x = body_x - leg_width
-    left_leg_y = body_y + body_height//2 + leg_height//2
-    draw.rectangle([left_leg_x - leg_width//2, left_leg_y - leg_height//2,
-                    left_leg_x + leg_width//2, left_leg_y + leg_height//2], 
-                   fill=skin_color, outline=(0, 0, 0), width=1)
-    
-    # Right leg
-    right_leg_x = body_x + leg_width
-    right_leg_y = body_y + body_height//2 + leg_height//2
-    draw.rectangle([right_leg_x - leg_width//2, right_leg_y - leg_height//2,
-                    right_leg_x + leg_width//2, right_leg_y + leg_height//2], 
-                   fill=skin_color, outline=(0, 0, 0), width=1)
-    
-    return img
+    return render_character(RAMA, width, height, scale)
 
-def create_demon_sprite(width, height):
+def create_demon_sprite(width, height, scale=1):
     """Create demon sprite based on the reference style"""
-    img = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
-    
-    # Body proportions
-    head_radius = width // 5
-    body_width = width // 2.5
-    body_height = height // 1.8
-    
-    # Red skin color (like reference)
-    skin_color = (220, 20, 60)    # Crimson red
-    hair_color = (139, 0, 0)      # Dark red
-    clothing_color = (101, 67, 33) # Brown loincloth
-    weapon_color = (139, 69, 19)   # Brown weapon
-    
-    # Head (larger and more muscular)
-    head_x = width // 2
-    head_y = height // 3
-    draw.ellipse([head_x - head_radius, head_y - head_radius, 
-                   head_x + head_radius, head_y + head_radius], 
-                  fill=skin_color, outline=(0, 0, 0), width=3)
-    
-    # Horns
-    horn_points = [
-        (head_x - head_radius//2, head_y - head_radius),
-        (head_x - head_radius//2 - 10, head_y - head_radius - 20),
-        (head_x - head_radius//2 - 5, head_y - head_radius - 30)
-    ]
-    draw.polygon(horn_points, fill=(139, 69, 19))
-    
-    horn_points2 = [
-        (head_x + head_radius//2, head_y - head_radius),
-        (head_x + head_radius//2 + 10, head_y - head_radius - 20),
-        (head_x + head_radius//2 + 5, head_y - head_radius - 30)
-    ]
-    draw.polygon(horn_points2, fill=(139, 69, 19))
-    
-    # Hair (spiky demon style)
-    for i in range(5):
-        spike_x = head_x - head_radius + i * head_radius//2
-        spike_y = head_y - head_radius - 10
-        spike_points = [
-            (spike_x, spike_y),
-            (spike_x - 5, spike_y - 15),
-            (spike_x + 5, spike_y - 15)
-        ]
-        draw.polygon(spike_points, fill=hair_color)
-    
-    # Eyes (angry red)
-    eye_radius = head_radius // 3
-    draw.ellipse([head_x - head_radius//2 - eye_radius, head_y - eye_radius//2,
-                   head_x - head_radius//2 + eye_radius, head_y + eye_radius//2], 
-                  fill=(255, 0, 0), outline=(0, 0, 0), width=2)
-    draw.ellipse([head_x + head_radius//2 - eye_radius, head_y - eye_radius//2,
-                   head_x + head_radius//2 + eye_radius, head_y + eye_radius//2], 
-                  fill=(255, 0, 0), outline=(0, 0, 0), width=2)
-    
-    # Pupils (white for demonic look)
-    pupil_radius = eye_radius // 2
-    draw.ellipse([head_x - head_radius//2 - pupil_radius, head_y - pupil_radius//2,
-                   head_x - head_radius//2 + pupil_radius, head_y + pupil_radius//2], 
-                  fill=(255, 255, 255))
-    draw.ellipse([head_x + head_radius//2 - pupil_radius, head_y - pupil_radius//2,
-                   head_x + head_radius//2 + pupil_radius, head_y + pupil_radius//2], 
-                  fill=(255, 255, 255))
-    
-    # Fangs
-    fang_width = 8
-    fang_height = 15
-    draw.polygon([(head_x - 10, head_y + head_radius//2),
-                  (head_x - 10 - fang_width//2, head_y + head_radius//2 + fang_height),
-                  (head_x - 10 + fang_width//2, head_y + head_radius//2 + fang_height)], 
-                 fill=(255, 255, 255))
-    draw.polygon([(head_x + 10, head_y + head_radius//2),
-                  (head_x + 10 - fang_width//2, head_y + head_radius//2 + fang_height),
-                  (head_x + 10 + fang_width//2, head_y + head_radius//2 + fang_height)], 
-                 fill=(255, 255, 255))
-    
-    # Body (muscular)
-    body_x = width // 2
-    body_y = head_y + head_radius + body_height//2
-    draw.rectangle([body_x - body_width//2, body_y - body_height//2,
-                    body_x + body_width//2, body_y + body_height//2], 
-                   fill=skin_color, outline=(0, 0, 0), width=3)
-    
-    # Brown loincloth
-    cloth_width = body_width + 10
-    cloth_height = body_height // 4
-    draw.rectangle([body_x - cloth_width//2, body_y + body_height//2 - cloth_height,
-                    body_x + cloth_width//2, body_y + body_height//2], 
-                   fill=clothing_color, outline=(0, 0, 0), width=2)
-    
-    # Arms (muscular)
-    arm_width = body_width // 3
-    arm_height = body_height // 1.5
-    
-    # Left arm
-    left_arm_x = body_x - body_width//2 - arm_width//2
-    left_arm_y = body_y
-    draw.rectangle([left_arm_x - arm_width//2, left_arm_y - arm_height//2,
-                    left_arm_x + arm_width//2, left_arm_y + arm_height//2], 
-                   fill=skin_color, outline=(0, 0, 0), width=2)
-    
-    # Right arm (clenched fist)
-    right_arm_x = body_x + body_width//2 + arm_width//2
-    right_arm_y = body_y
-    draw.rectangle([right_arm_x - arm_width//2, right_arm_y - arm_height//2,
-                    right_arm_x + arm_width//2, right_arm_y + arm_height//2], 
-                   fill=skin_color, outline=(0, 0, 0), width=2)
-    
-    # Clenched fist
-    fist_radius = arm_width // 2
-    draw.ellipse([right_arm_x - fist_radius, right_arm_y + arm_height//2 - fist_radius,
-                   right_arm_x + fist_radius, right_arm_y + arm_height//2 + fist_radius], 
-                  fill=skin_color, outline=(0, 0, 0), width=2)
-    
-    # Legs (thick and muscular)
-    leg_width = body_width // 2.5
-    leg_height = body_height // 1.2
-    
-    # Left leg
-    left_leg_x = body_x - leg_width//2
-    left_leg_y = body_y + body_height//2 + leg_height//2
-    draw.rectangle([left_leg_x - leg_width//2, left_leg_y - leg_height//2,
-                    left_leg_x + leg_width//2, left_leg_y + leg_height//2], 
-                   fill=skin_color, outline=(0, 0, 0), width=2)
-    
-    # Right leg
-    right_leg_x = body_x + leg_width//2
-    right_leg_y = body_y + body_height//2 + leg_height//2
-    draw.rectangle([right_leg_x - leg_width//2, right_leg_y - leg_height//2,
-                    right_leg_x + leg_width//2, right_leg_y + leg_height//2], 
-                   fill=skin_color, outline=(0, 0, 0), width=2)
-    
-    return img
+    return render_character(DEMON, width, height, scale)
 
-def create_sita_sprite(width, height):
+def create_sita_sprite(width, height, scale=1):
     """Create Goddess Sita sprite"""
-    img = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
-    
-    # Body proportions
-    head_radius = width // 6
-    body_width = width // 3
-    body_height = height // 2
-    
-    # Golden skin color
-    skin_color = (255, 228, 196)  # Golden skin
-    hair_color = (139, 69, 19)    # Brown hair
-    sari_color = (220, 20, 60)    # Red sari
-    jewelry_color = (255, 215, 0) # Gold jewelry
-    
-    # Head
-    head_x = width // 2
-    head_y = height // 4
-    draw.ellipse([head_x - head_radius, head_y - head_radius, 
-                   head_x + head_radius, head_y + head_radius], 
-                  fill=skin_color, outline=(0, 0, 0), width=2)
-    
-    # Hair (long and flowing)
-    hair_points = [
-        (head_x - head_radius, head_y - head_radius),
-        (head_x - head_radius - 15, head_y - head_radius - 20),
-        (head_x - head_radius - 10, head_y - head_radius - 40),
-        (head_x + head_radius + 10, head_y - head_radius - 35),
-        (head_x + head_radius + 15, head_y - head_radius - 15),
-        (head_x + head_radius, head_y - head_radius)
-    ]
-    draw.polygon(hair_points, fill=hair_color)
-    
-    # Eyes
-    eye_radius = head_radius // 4
-    draw.ellipse([head_x - head_radius//2 - eye_radius, head_y - eye_radius//2,
-                   head_x - head_radius//2 + eye_radius, head_y + eye_radius//2], 
-                  fill=(255, 255, 255), outline=(0, 0, 0))
-    draw.ellipse([head_x + head_radius//2 - eye_radius, head_y - eye_radius//2,
-                   head_x + head_radius//2 + eye_radius, head_y + eye_radius//2], 
-                  fill=(255, 255, 255), outline=(0, 0, 0))
-    
-    # Pupils
-    pupil_radius = eye_radius // 2
-    draw.ellipse([head_x - head_radius//2 - pupil_radius, head_y - pupil_radius//2,
-                   head_x - head_radius//2 + pupil_radius, head_y + pupil_radius//2], 
-                  fill=(0, 0, 0))
-    draw.ellipse([head_x + head_radius//2 - pupil_radius, head_y - pupil_radius//2,
-                   head_x + head_radius//2 + pupil_radius, head_y + pupil_radius//2], 
-                  fill=(0, 0, 0))
-    
-    # Body
-    body_x = width // 2
-    body_y = head_y + head_radius + body_height//2
-    draw.rectangle([body_x - body_width//2, body_y - body_height//2,
-                    body_x + body_width//2, body_y + body_height//2], 
-                   fill=skin_color, outline=(0, 0, 0), width=2)
-    
-    # Red sari
-    sari_width = body_width + 15
-    sari_height = body_height
-    draw.rectangle([body_x - sari_width//2, body_y - sari_height//2,
-                    body_x + sari_width//2, body_y + sari_height//2], 
-                   fill=sari_color, outline=(0, 0, 0), width=1)
-    
-    # Gold jewelry
-    jewelry_radius = head_radius // 3
-    draw.ellipse([head_x - jewelry_radius, head_y - jewelry_radius,
-                   head_x + jewelry_radius, head_y + jewelry_radius], 
-                  fill=jewelry_color, outline=(0, 0, 0), width=1)
-    
-    # Arms
-    arm_width = body_width // 4
-    arm_height = body_height // 2
-    
-    # Left arm
-    left_arm_x = body_x - body_width//2 - arm_width//2
-    left_arm_y = body_y
-    draw.rectangle([left_arm_x - arm_width//2, left_arm_y - arm_height//2,
-                    left_arm_x + arm_width//2, left_arm_y + arm_height//2], 
-                   fill=skin_color, outline=(0, 0, 0), width=1)
-    
-    # Right arm
-    right_arm_x = body_x + body_width//2 + arm_width//2
-    right_arm_y = body_y
-    draw.rectangle([right_arm_x - arm_width//2, right_arm_y - arm_height//2,
-                    right_arm_x + arm_width//2, right_arm_y + arm_height//2], 
-                   fill=skin_color, outline=(0, 0, 0), width=1)
-    
-    # Lotus flower in hand
-    lotus_center_x = right_arm_x
-    lotus_center_y = right_arm_y + arm_height//2
-    lotus_radius = 15
-    
-    # Lotus petals
-    for i in range(8):
-        angle = i * 45
-        petal_x = lotus_center_x + int(lotus_radius * math.cos(math.radians(angle)))
-        petal_y = lotus_center_y + int(lotus_radius * math.sin(math.radians(angle)))
-        draw.ellipse([petal_x - 8, petal_y - 8, petal_x + 8, petal_y + 8], 
-                     fill=(255, 182, 193))
-    
-    # Legs
-    leg_width = body_width // 3
-    leg_height = body_height // 2
-    
-    # Left leg
-    left_leg_x = body_x - leg_width
-    left_leg_y = body_y + body_height//2 + leg_height//2
-    draw.rectangle([left_leg_x - leg_width//2, left_leg_y - leg_height//2,
-                    left_leg_x + leg_width//2, left_leg_y + leg_height//2], 
-                   fill=skin_color, outline=(0, 0, 0), width=1)
-    
-    # Right leg
-    right_leg_x = body_x + leg_width
-    right_leg_y = body_y + body_height//2 + leg_height//2
-    draw.rectangle([right_leg_x - leg_width//2, right_leg_y - leg_height//2,
-                    right_leg_x + leg_width//2, right_leg_y + leg_height//2], 
-                   fill=skin_color, outline=(0, 0, 0), width=1)
-    
-    return img
+    return render_character(SITA, width, height, scale)
 
-def create_hanuman_sprite(width, height):
+def create_hanuman_sprite(width, height, scale=1):
     """Create Lord Hanuman sprite"""
-    img = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
-    
-    # Body proportions
-    head_radius = width // 6
-    body_width = width // 3
-    body_height = height // 2
-    
-    # Orange skin color
-    skin_color = (255, 165, 0)    # Orange
-    hair_color = (139, 69, 19)    # Brown hair
-    clothing_color = (255, 215, 0) # Gold clothing
-    weapon_color = (139, 69, 19)   # Brown mace
-    
-    # Head (monkey style)
-    head_x = width // 2
-    head_y = height // 4
-    draw.ellipse([head_x - head_radius, head_y - head_radius, 
-                   head_x + head_radius, head_y + head_radius], 
-                  fill=skin_color, outline=(0, 0, 0), width=2)
-    
-    # Ears (monkey style)
-    ear_radius = head_radius // 2
-    draw.ellipse([head_x - head_radius - ear_radius, head_y - ear_radius,
-                   head_x - head_radius + ear_radius, head_y + ear_radius], 
-                  fill=skin_color, outline=(0, 0, 0), width=1)
-    draw.ellipse([head_x + head_radius - ear_radius, head_y - ear_radius,
-                   head_x + head_radius + ear_radius, head_y + ear_radius], 
-                  fill=skin_color, outline=(0, 0, 0), width=1)
-    
-    # Eyes
-    eye_radius = head_radius // 4
-    draw.ellipse([head_x - head_radius//2 - eye_radius, head_y - eye_radius//2,
-                   head_x - head_radius//2 + eye_radius, head_y + eye_radius//2], 
-                  fill=(255, 255, 255), outline=(0, 0, 0))
-    draw.ellipse([head_x + head_radius//2 - eye_radius, head_y - eye_radius//2,
-                   head_x + head_radius//2 + eye_radius, head_y + eye_radius//2], 
-                  fill=(255, 255, 255), outline=(0, 0, 0))
-    
-    # Pupils
-    pupil_radius = eye_radius // 2
-    draw.ellipse([head_x - head_radius//2 - pupil_radius, head_y - pupil_radius//2,
-                   head_x - head_radius//2 + pupil_radius, head_y + pupil_radius//2], 
-                  fill=(0, 0, 0))
-    draw.ellipse([head_x + head_radius//2 - pupil_radius, head_y - pupil_radius//2,
-                   head_x + head_radius//2 + pupil_radius, head_y + pupil_radius//2], 
-                  fill=(0, 0, 0))
-    
-    # Body
-    body_x = width // 2
-    body_y = head_y + head_radius + body_height//2
-    draw.rectangle([body_x - body_width//2, body_y - body_height//2,
-                    body_x + body_width//2, body_y + body_height//2], 
-                   fill=skin_color, outline=(0, 0, 0), width=2)
-    
-    # Gold clothing
-    cloth_width = body_width + 10
-    cloth_height = body_height // 3
-    draw.rectangle([body_x - cloth_width//2, body_y - cloth_height//2,
-                    body_x + cloth_width//2, body_y + cloth_height//2], 
-                   fill=clothing_color, outline=(0, 0, 0), width=1)
-    
-    # Arms
-    arm_width = body_width // 4
-    arm_height = body_height // 2
-    
-    # Left arm
-    left_arm_x = body_x - body_width//2 - arm_width//2
-    left_arm_y = body_y
-    draw.rectangle([left_arm_x - arm_width//2, left_arm_y - arm_height//2,
-                    left_arm_x + arm_width//2, left_arm_y + arm_height//2], 
-                   fill=skin_color, outline=(0, 0, 0), width=1)
-    
-    # Right arm (holding mace)
-    right_arm_x = body_x + body_width//2 + arm_width//2
-    right_arm_y = body_y
-    draw.rectangle([right_arm_x - arm_width//2, right_arm_y - arm_height//2,
-                    right_arm_x + arm_width//2, right_arm_y + arm_height//2], 
-                   fill=skin_color, outline=(0, 0, 0), width=1)
-    
-    # Mace
-    mace_x = right_arm_x
-    mace_y = right_arm_y + arm_height//2
-    mace_width = 20
-    mace_height = height // 3
-    
-    # Mace handle
-    draw.rectangle([mace_x - mace_width//2, mace_y,
-                    mace_x + mace_width//2, mace_y + mace_height], 
-                   fill=weapon_color, outline=(0, 0, 0), width=2)
-    
-    # Mace head
-    mace_head_radius = mace_width * 2
-    draw.ellipse([mace_x - mace_head_radius, mace_y - mace_head_radius,
-                   mace_x + mace_head_radius, mace_y + mace_head_radius], 
-                  fill=clothing_color, outline=(0, 0, 0), width=2)
-    
-    # Legs
-    leg_width = body_width // 3
-    leg_height = body_height // 2
-    
-    # Left leg
-    left_leg_x = body_x - leg_width
-    left_leg_y = body_y + body_height//2 + leg_height//2
-    draw.rectangle([left_leg_x - leg_width//2, left_leg_y - leg_height//2,
-                    left_leg_x + leg_width//2, left_leg_y + leg_height//2], 
-                   fill=skin_color, outline=(0, 0, 0), width=1)
-    
-    # Right leg
-    right_leg_x = body_x + leg_width
-    right_leg_y = body_y + body_height//2 + leg_height//2
-    draw.rectangle([right_leg_x - leg_width//2, right_leg_y - leg_height//2,
-                    right_leg_x + leg_width//2, right_leg_y + leg_height//2], 
-                   fill=skin_color, outline=(0, 0, 0), width=1)
-    
-    return img
+    return render_character(HANUMAN, width, height, scale)
+
+def create_lakshmana_sprite(width, height, scale=1):
+    """Create Lakshmana sprite"""
+    return render_character(LAKSHMANA, width, height, scale)
 
-def create_background_sprite(width, height):
+def create_ravana_sprite(width, height, scale=1):
+    """Create Ravana sprite"""
+    return render_character(RAVANA, width, height, scale)
+
+def create_background_sprite(width, height, scale=1):
     """Create forest background sprite like the reference"""
-    img = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
-    
     # Sky gradient (sunset like reference)
-    for y in range(height):
-        ratio = y / height
-        r = int(255 * (1 - ratio) + 255 * ratio)
-        g = int(140 * (1 - ratio) + 69 * ratio)
-        b = int(0 * (1 - ratio) + 0 * ratio)
-        draw.line([(0, y), (width, y)], fill=(r, g, b))
+    img = linear_gradient(width * scale, height * scale, SKY_GRADIENT, mode='RGBA')
+    draw = ScaledDraw(img, scale)
     
     # Sun
     sun_radius = width // 8
@@ -570,100 +105,216 @@ def create_background_sprite(width, height):
     
     return img
 
-def main():
-    """Generate all game sprites"""
+def asset_outputs(output_dir, name, trim_dir=None):
+    """Files written for one asset, one per native scale plus the trim sidecar when trimming"""
+    outputs = [f"{output_dir}/{name}{scale_suffix(scale)}.png" for scale in SCALES]
+    if trim_dir:
+        outputs.append(trim_sidecar_path(trim_dir, name))
+    return outputs
+
+def build_sprite(job):
+    """Render and encode one sprite natively at every scale in a worker process"""
+    output_dir, trim_dir, name, factory, params, options = job
+    messages = []
+    trim_infos = {}
+    writes = []
+    
+    for scale, img_path in zip(SCALES, asset_outputs(output_dir, name)):
+        with track(name, scale) as record:
+            # Draw at this scale rather than LANCZOS-upscaling the 1x render
+            img = supersample(lambda s: factory(*params, scale=s), scale, options["quality"], record)
+            if trim_dir:
+                with record.stage("resample"):
+                    img, trim_infos[scale] = trim_sprite(img)
+            record.image(img)
+        # Encode in the background while the next scale renders
+        writes.append(shared_writer().submit(save_asset, img, img_path, options["encode"], name, record))
+        messages.append(f"✅ Created {os.path.basename(img_path)}")
+    wait(writes)
+    
+    if trim_dir:
+        with track(f"{name}.trim.json") as record, record.stage("write"):
+            write_trim_sidecar(trim_sidecar_path(trim_dir, name), trim_infos)
+    
+    return messages
+
+def cached_atlas(cache, key, root, atlas_name, pack):
+    """Restore an atlas from the build cache, or pack it with pack() and store it; returns log lines"""
+    atlas_dir = os.path.join(root, ATLAS_DIR, f"{atlas_name}.atlasc")
+    statuses = cache.restore_entry(key, atlas_dir)
+    if statuses:
+        messages = [f"♻️  {status.capitalize()} {os.path.basename(path)} (cached)" for path, status in statuses.items()]
+        return messages + prune_sheets(atlas_dir, atlas_name, {os.path.basename(path) for path in statuses})
+    messages = pack()
+    cache.store(key, atlas_files(atlas_dir, atlas_name))
+    return messages
+
+def build_atlas(root, output_dir, trim_dir, padding, allow_rotation, encode, cache, sprite_keys):
+    """Pack the rendered combat sprites into the Characters atlas at every scale
+
+    The atlas is cached under the keys of the sprites it packs, so an unchanged build never repacks it.
+    """
+    missing = [name for name in ATLAS_SPRITES
+               if not all(os.path.exists(path) for path in asset_outputs(output_dir, name, trim_dir))]
+    if missing:
+        # Happens with --only before the other sprites were ever built
+        return [f"⚠️  Skipped the {ATLAS_NAME} atlas, not built yet: {', '.join(missing)}"]
+    key = cache_key((build_atlas, write_atlasc),
+                    ([sprite_keys[name] for name in ATLAS_SPRITES], padding, allow_rotation, encode))
+    return cached_atlas(cache, key, root, ATLAS_NAME,
+                        lambda: pack_atlas(root, output_dir, trim_dir, padding, allow_rotation, encode))
+
+def pack_atlas(root, output_dir, trim_dir, padding, allow_rotation, encode):
+    """Pack the Characters atlas from the sprite PNGs on disk"""
+    trim_infos = {name: read_trim_sidecar(trim_sidecar_path(trim_dir, name)) if trim_dir else {}
+                  for name in ATLAS_SPRITES}
+    # One scale's sprites are loaded at a time, as write_atlasc gets to that scale
+    images_by_scale = (
+        (scale, [(name, Image.open(f"{output_dir}/{name}{scale_suffix(scale)}.png"), trim_infos[name].get(scale))
+                 for name in ATLAS_SPRITES])
+        for scale in SCALES
+    )
+    return write_atlasc(ATLAS_NAME, images_by_scale, os.path.join(root, ATLAS_DIR), padding, allow_rotation,
+                        encode=encode)
+
+def build_variant_atlas(root, output_dir, trim_dir, count, levels, padding, allow_rotation, encode, cache,
+                        sprite_keys):
+    """Recolour each rendered enemy sprite into count variants per level and pack them into the Enemies atlas
+
+    The variants are LUT recolours of the PNGs this build already wrote (trimmed or not), so no
+    sprite is drawn again; they share the base sprite's trim offsets. Cached like the Characters atlas.
+    """
+    missing = [name for name in VARIANT_BASES
+               if not all(os.path.exists(path) for path in asset_outputs(output_dir, name, trim_dir))]
+    if missing:
+        return [f"⚠️  Skipped the {VARIANT_ATLAS_NAME} atlas, not built yet: {', '.join(missing)}"]
+    key = cache_key((build_variant_atlas, write_atlasc),
+                    ([sprite_keys[name] for name in VARIANT_BASES], count, levels, padding, allow_rotation, encode))
+    return cached_atlas(cache, key, root, VARIANT_ATLAS_NAME,
+                        lambda: pack_variant_atlas(root, output_dir, trim_dir, count, levels, padding,
+                                                   allow_rotation, encode))
+
+def pack_variant_atlas(root, output_dir, trim_dir, count, levels, padding, allow_rotation, encode):
+    """Recolour the enemy PNGs on disk and pack the Enemies atlas"""
+    trim_infos = {name: read_trim_sidecar(trim_sidecar_path(trim_dir, name)) if trim_dir else {}
+                  for name in VARIANT_BASES}
+    timings = []
+    
+    def variants_at(scale):
+        started = time.perf_counter()
+        images = []
+        for name, spec in VARIANT_BASES.items():
+            base = Image.open(f"{output_dir}/{name}{scale_suffix(scale)}.png")
+            for level in range(1, levels + 1):
+                images += [(variant, img, trim_infos[name].get(scale))
+                           for variant, img in character_variants(spec, *base.size, scale, count, level, base)]
+        timings.append((len(images), time.perf_counter() - started))
+        return images
+    
+    messages = write_atlasc(VARIANT_ATLAS_NAME, ((scale, variants_at(scale)) for scale in SCALES),
+                            os.path.join(root, ATLAS_DIR), padding, allow_rotation, encode=encode)
+    made = sum(n for n, _ in timings)
+    seconds = sum(t for _, t in timings)
+    messages.append(f"🎭 Recoloured {made} enemy variants in {seconds * 1000:.0f} ms "
+                    f"({made / max(seconds, 1e-9):.0f}/s)")
+    return messages
+
+def add_arguments(parser):
+    """Add the sprite-only options to an argparse parser"""
+    parser.add_argument("--atlas-padding", type=int, default=DEFAULT_PADDING,
+                        help=f"transparent gap between packed sprites in points (default: {DEFAULT_PADDING})")
+    parser.add_argument("--atlas-rotate", action="store_true",
+                        help="allow 90° rotation when packing the atlas")
+    parser.add_argument("--trim", action="store_true",
+                        help="crop sprites to their alpha bounds and record the offsets")
+    parser.add_argument("--enemy-variants", type=int, default=0, metavar="N",
+                        help=f"pack N seeded colour variants of each enemy per level into the "
+                             f"{VARIANT_ATLAS_NAME} atlas (default: 0, off)")
+    parser.add_argument("--variant-levels", type=int, default=1, metavar="N",
+                        help="levels to generate enemy variants for, each with its own seed (default: 1)")
+
+def build(args):
+    """Build the selected sprites and the atlas under args.out"""
     print("🎨 Creating high-resolution anime-style RPG sprites for Ramayana Game...")
     
     # Create output directory
-    output_dir = "RamayanaGame/Assets.xcassets/GameSprites.imageset"
+    output_dir = os.path.join(args.out, TARGET.output_dir)
     create_directory(output_dir)
     
-    # Generate sprites
-    sprites = [
-        ("rama", create_rama_sprite(200, 300)),
-        ("sita", create_sita_sprite(200, 300)),
-        ("hanuman", create_hanuman_sprite(200, 300)),
-        ("demon", create_demon_sprite(200, 300)),
-        ("background", create_background_sprite(400, 300))
-    ]
-    
-    for name, img in sprites:
-        # Save main image
-        img_path = f"{output_dir}/{name}.png"
-        img.save(img_path, "PNG")
-        print(f"✅ Created {name}.png")
-        
-        # Create @2x version for high-res displays
-        img_2x = img.resize((img.width * 2, img.height * 2), Image.Resampling.LANCZOS)
-        img_2x_path = f"{output_dir}/{name}@2x.png"
-        img_2x.save(img_2x_path, "PNG")
-        print(f"✅ Created {name}@2x.png")
-    
-    # Create Contents.json for the imageset
-    contents_json = '''{
-  "images" : [
-    {
-      "filename" : "rama.png",
-      "idiom" : "universal",
-      "scale" : "1x"
-    },
-    {
-      "filename" : "rama@2x.png",
-      "idiom" : "universal",
-      "scale" : "2x"
-    },
-    {
-      "filename" : "sita.png",
-      "idiom" : "universal",
-      "scale" : "1x"
-    },
-    {
-      "filename" : "sita@2x.png",
-      "idiom" : "universal",
-      "scale" : "2x"
-    },
-    {
-      "filename" : "hanuman.png",
-      "idiom" : "universal",
-      "scale" : "1x"
-    },
-    {
-      "filename" : "hanuman@2x.png",
-      "idiom" : "universal",
-      "scale" : "2x"
-    },
-    {
-      "filename" : "demon.png",
-      "idiom" : "universal",
-      "scale" : "1x"
-    },
-    {
-      "filename" : "demon@2x.png",
-      "idiom" : "universal",
-      "scale" : "2x"
-    },
-    {
-      "filename" : "background.png",
-      "idiom" : "universal",
-      "scale" : "1x"
-    },
-    {
-      "filename" : "background@2x.png",
-      "idiom" : "universal",
-      "scale" : "2x"
-    }
-  ],
-  "info" : {
-    "author" : "xcode",
-    "version" : 1
-  }
-}'''
-    
-    with open(f"{output_dir}/Contents.json", "w") as f:
-        f.write(contents_json)
+    # Generators are named in targets.py so listing them does not need Pillow
+    sprites = [(asset.name, globals()[asset.factory], asset.params)
+               for asset in select(TARGET, only_names(args))]
+    
+    # Skip or restore anything whose generator source, parameters and Pillow version are unchanged
+    cache = BuildCache.from_args(args)
+    options = {"trim": args.trim, "encode": encode_settings(args), "quality": args.quality}
+    trim_dir = os.path.join(args.out, TRIM_DIR) if args.trim else None
+    if trim_dir:
+        create_directory(trim_dir)
+    # Every sprite's key, not just the selected ones: the atlases are keyed on all the sprites they pack
+    keys = {asset.name: cache_key((build_sprite, globals()[asset.factory]), (asset.name, asset.params, options))
+            for asset in TARGET.assets}
+    entries = [(keys[name], asset_outputs(output_dir, name, trim_dir),
+                (output_dir, trim_dir, name, factory, params, options))
+               for name, factory, params in sprites]
+
+    for message in run_cached_jobs(build_sprite, entries, cache, args.jobs, args.max_in_flight):
+        print(message)
+    
+    if trim_dir:
+        # Report how much decoded texture memory trimming saved per sprite
+        for name, _, _ in sprites:
+            for line in trim_report(name, read_trim_sidecar(trim_sidecar_path(trim_dir, name))):
+                print(line)
+    
+    with track(ATLAS_NAME) as record, record.stage("write"):
+        atlas_messages = build_atlas(args.out, output_dir, trim_dir, args.atlas_padding, args.atlas_rotate,
+                                     options["encode"], cache, keys)
+    for message in atlas_messages:
+        print(message)
+    
+    if args.enemy_variants > 0:
+        with track(VARIANT_ATLAS_NAME) as record, record.stage("write"):
+            variant_messages = build_variant_atlas(args.out, output_dir, trim_dir, args.enemy_variants,
+                                                   args.variant_levels, args.atlas_padding, args.atlas_rotate,
+                                                   options["encode"], cache, keys)
+        for message in variant_messages:
+            print(message)
     
     print("🎨 All game sprites created successfully!")
-    print("📁 Files saved to: RamayanaGame/Assets.xcassets/GameSprites.imageset/")
+    print(f"📁 Files saved to: {output_dir}/")
+
+def main():
+    """Generate all game sprites"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_jobs_argument(parser)
+    add_cache_arguments(parser)
+    add_encode_arguments(parser)
+    add_quality_argument(parser)
+    add_arguments(parser)
+    add_output_arguments(parser)
+    add_writer_arguments(parser)
+    add_instrument_arguments(parser)
+    args = parser.parse_args()
+    started = time.perf_counter()
+    configure(args)
+    writer.configure(args)
+    
+    unknown = unknown_names([TARGET], only_names(args))
+    if unknown:
+        parser.error(f"no such sprite: {', '.join(unknown)}")
+    
+    build(args)
+    with track("catalog") as record, record.stage("write"):
+        catalog_messages = write_catalog([TARGET], args.out)
+    for message in catalog_messages:
+        print(message)
+    with track("outlines") as record, record.stage("write"):
+        outline_messages = write_outlines(args.out)
+    for message in outline_messages:
+        print(message)
+    if args.report:
+        print(write_report(args.report, "create_game_sprites", started))
 
 if __name__ == "__main__":
     main()
@@ -1,28 +1,34 @@
 #!/usr/bin/env python3
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
+from gradients import linear_gradient
+from drawing import add_quality_argument, supersample
+from fonts import get_font
+from parallel import add_jobs_argument
+from build_cache import BuildCache, add_cache_arguments, cache_key, run_cached_jobs
+from encoding import add_encode_arguments, encode_settings, save_asset
+from instrument import add_instrument_arguments, configure, track, write_report
+from catalog import write_catalog
+from targets import TARGETS, add_output_arguments, only_names, select, unknown_names
+from writer import add_writer_arguments, atomic_copy
+import writer
+import argparse
 import os
+import time
 
-def create_icon(size, filename):
+# Purple to orange, top to bottom
+ICON_GRADIENT = [(128, 0, 128), (255, 165, 255)]
+
+# Size the pyramid master is rendered at; every other size is derived from it
+MASTER_SIZE = 1024
+
+def render_icon(size):
+    """Draw the gradient and "R" glyph at the given pixel size"""
     # Create a new image with purple to orange gradient
-    img = Image.new('RGB', (size, size), color='purple')
+    img = linear_gradient(size, size, ICON_GRADIENT)
     draw = ImageDraw.Draw(img)
     
-    # Create a simple gradient effect
-    for y in range(size):
-        # Interpolate between purple and orange
-        r = int(128 + (y / size) * 127)  # Purple to orange
-        g = int(0 + (y / size) * 165)    # Purple to orange  
-        b = int(128 + (y / size) * 127)  # Purple to orange
-        draw.line([(0, y), (size, y)], fill=(r, g, b))
-    
     # Add a white "R" in the center
-    try:
-        # Try to use a system font
-        font_size = size // 3
-        font = ImageFont.truetype("/System/Library/Fonts/Arial.ttf", font_size)
-    except:
-        # Fallback to default font
-        font = ImageFont.load_default()
+    font = get_font(size // 3)
     
     text = "R"
     bbox = draw.textbbox((0, 0), text, font=font)
@@ -34,29 +40,134 @@ def create_icon(size, filename):
     
     draw.text((x, y), text, fill='white', font=font)
     
-    # Save the image
-    img.save(filename, 'PNG')
-    print(f"Created: {filename}")
-
-# Create icons for different sizes
-icon_sizes = [
-    (40, "20x20@2x.png"),    # 20x20 @2x
-    (60, "20x20@3x.png"),    # 20x20 @3x
-    (58, "29x29@2x.png"),    # 29x29 @2x
-    (87, "29x29@3x.png"),    # 29x29 @3x
-    (80, "40x40@2x.png"),    # 40x40 @2x
-    (120, "40x40@3x.png"),   # 40x40 @3x
-    (120, "60x60@2x.png"),   # 60x60 @2x
-    (180, "60x60@3x.png"),   # 60x60 @3x
-    (152, "76x76@2x.png"),   # 76x76 @2x
-    (167, "83.5x83.5@2x.png"), # 83.5x83.5 @2x
-    (1024, "1024x1024@1x.png") # 1024x1024 @1x
-]
-
-output_dir = "RamayanaGame/Assets.xcassets/AppIcon.appiconset"
-
-for size, filename in icon_sizes:
-    filepath = os.path.join(output_dir, filename)
-    create_icon(size, filepath)
-
-print("Icon generation complete!")
+    return img
+
+def derive_icon(master, size, levels):
+    """Derive one icon size from the master by progressive downscaling"""
+    if master.width % size == 0:
+        # Integer factor - a single box-filtered reduce is exact
+        return master.reduce(master.width // size)
+    
+    # Halve with reduce() while the next level still covers the target size,
+    # keeping each level in `levels` so later sizes can start from it
+    current = master
+    while current.width // 2 >= size:
+        half = current.width // 2
+        if half not in levels:
+            levels[half] = current.reduce(2)
+        current = levels[half]
+    
+    # Finish the last non-integer step with a high-quality resample
+    return current.resize((size, size), Image.Resampling.LANCZOS)
+
+def build_pyramid(sizes, master_size=MASTER_SIZE, quality=1):
+    """Render the master once and yield (size, image) for every requested size, largest first
+
+    Sizes are derived one at a time as they are consumed, so only the master,
+    its halvings and the icons still in flight are held in memory.
+    """
+    with track("icon master") as record:
+        master = supersample(render_icon, master_size, quality, record)
+    levels = {master_size: master}
+    for size in sorted(set(sizes), reverse=True):
+        with track(f"icon {size}px") as record, record.stage("resample"):
+            img = derive_icon(master, size, levels)
+        yield size, img
+
+def pyramid_icon(size, master_size=MASTER_SIZE):
+    """One icon size as --pyramid derives it from the master, for checking that path on its own"""
+    master = render_icon(master_size)
+    return derive_icon(master, size, {master_size: master})
+
+TARGET = TARGETS["icons"]
+
+def group_by_size(entries):
+    """Collapse icon entries that share a pixel size, e.g. 40x40@3x and 60x60@2x"""
+    groups = {}
+    for size, filename in entries:
+        groups.setdefault(size, []).append(filename)
+    return list(groups.items())
+
+def build_icon(job):
+    """Render (or take the pre-derived image), encode once and copy to the other filenames; returns log lines"""
+    output_dir, size, filenames, img, encode, quality = job
+    paths = [os.path.join(output_dir, filename) for filename in filenames]
+    with track(filenames[0]) as record:
+        if img is None:
+            img = supersample(render_icon, size, quality, record)
+        record.image(img)
+        save_asset(img, paths[0], encode, filenames[0], record)
+        with record.stage("write"):
+            for path in paths[1:]:
+                atomic_copy(paths[0], path)
+    return [f"Created: {path}" for path in paths]
+
+def add_arguments(parser):
+    """Add the icon-only options to an argparse parser"""
+    parser.add_argument("--pyramid", action="store_true",
+                        help=f"render one {MASTER_SIZE}px master and downscale it to every size")
+
+def build(args):
+    """Build the selected icon sizes under args.out"""
+    output_dir = os.path.join(args.out, TARGET.output_dir)
+    os.makedirs(output_dir, exist_ok=True)
+
+    encode = encode_settings(args)
+    # (pixel size, filename) for every icon slot
+    icon_sizes = [(asset.params[0], f"{asset.name}.png") for asset in select(TARGET, only_names(args))]
+    groups = group_by_size(icon_sizes)
+    prepare = None
+    roots = (build_icon, render_icon)
+    if args.pyramid:
+        # Largest first, the order build_pyramid derives them in
+        groups.sort(reverse=True)
+        roots = (build_icon, build_pyramid)
+
+        def prepare(jobs):
+            # The master is only rendered when some size missed the cache
+            pyramid = build_pyramid([size for _, size, *_ in jobs], quality=args.quality)
+            return ((output_dir, size, filenames, img, encode, quality)
+                    for (output_dir, size, filenames, _, encode, quality), (_, img) in zip(jobs, pyramid))
+
+    # Skip or restore any icon whose generator source, size and settings are unchanged
+    cache = BuildCache.from_args(args)
+    entries = [(cache_key(roots, (size, filenames, encode, args.quality)),
+                [os.path.join(output_dir, filename) for filename in filenames],
+                (output_dir, size, filenames, None, encode, args.quality))
+               for size, filenames in groups]
+
+    for message in run_cached_jobs(build_icon, entries, cache, args.jobs, args.max_in_flight, prepare):
+        print(message)
+
+    print("Icon generation complete!")
+
+def main():
+    """Generate the app icon set"""
+    parser = argparse.ArgumentParser(description="Generate the Ramayana app icon set")
+    add_jobs_argument(parser)
+    add_cache_arguments(parser)
+    add_encode_arguments(parser)
+    add_quality_argument(parser)
+    add_arguments(parser)
+    add_output_arguments(parser)
+    add_writer_arguments(parser)
+    add_instrument_arguments(parser)
+    args = parser.parse_args()
+    started = time.perf_counter()
+    configure(args)
+    writer.configure(args)
+
+    unknown = unknown_names([TARGET], only_names(args))
+    if unknown:
+        parser.error(f"no such icon: {', '.join(unknown)}")
+
+    build(args)
+    with track("catalog") as record, record.stage("write"):
+        catalog_messages = write_catalog([TARGET], args.out)
+    for message in catalog_messages:
+        print(message)
+    if args.report:
+        print(write_report(args.report, "create_icon", started))
+
+if __name__ == "__main__":
+    main()
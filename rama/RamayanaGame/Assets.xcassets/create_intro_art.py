@@ -4,110 +4,63 @@ Create high-resolution anime-style RPG artwork for Ramayana Game
 Generates character portraits, backgrounds, and UI elements
 """
 
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image
+from gradients import linear_gradient
+from drawing import ScaledDraw, add_quality_argument, supersample
+from characters import PORTRAITS, render_portrait
+from fonts import font_fingerprint, get_font
+from particles import add_particles
+from compositing import Layer, LayerStack
+from parallel import add_jobs_argument
+from build_cache import BuildCache, add_cache_arguments, cache_key, run_cached_jobs
+from encoding import add_encode_arguments, encode_settings, save_asset
+from instrument import add_instrument_arguments, configure, track, write_report
+from catalog import write_catalog
+from targets import SCALES, TARGETS, add_output_arguments, only_names, scale_suffix, select, unknown_names
+from writer import add_writer_arguments, shared_writer, wait
+import writer
+import argparse
 import os
-import math
+import time
+
+TARGET = TARGETS["art"]
+
+# Gold to bronze fill for RPG buttons
+BUTTON_GRADIENT = [(255, 215, 0), (200, 150, 50)]
+
+# Mystical particles on the title screen: seeded so every build and scale shows the same field
+TITLE_PARTICLES = 600
+TITLE_PARTICLE_SEED = 108
+TITLE_PARTICLE_COLORS = [(255, 255, 255), (255, 235, 170), (210, 190, 255)]
 
 def create_directory(path):
     """Create directory if it doesn't exist"""
     if not os.path.exists(path):
         os.makedirs(path)
 
-def create_gradient_background(width, height, colors, direction='vertical'):
+def create_gradient_background(width, height, colors, direction='vertical', scale=1):
     """Create a beautiful gradient background"""
-    img = Image.new('RGB', (width, height))
-    draw = ImageDraw.Draw(img)
-    
-    if direction == 'vertical':
-        for y in range(height):
-            ratio = y / height
-            r = int(colors[0][0] * (1 - ratio) + colors[1][0] * ratio)
-            g = int(colors[0][1] * (1 - ratio) + colors[1][1] * ratio)
-            b = int(colors[0][2] * (1 - ratio) + colors[1][2] * ratio)
-            draw.line([(0, y), (width, y)], fill=(r, g, b))
-    else:  # horizontal
-        for x in range(width):
-            ratio = x / width
-            r = int(colors[0][0] * (1 - ratio) + colors[1][0] * ratio)
-            g = int(colors[0][1] * (1 - ratio) + colors[1][1] * ratio)
-            b = int(colors[0][2] * (1 - ratio) + colors[1][2] * ratio)
-            draw.line([(x, 0), (x, height)], fill=(r, g, b))
-    
-    return img
+    return linear_gradient(width * scale, height * scale, colors, direction)
 
-def create_anime_character(width, height, character_type, colors):
+def create_anime_character(width, height, character_type, colors, scale=1):
     """Create anime-style character portrait"""
-    img = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
-    
-    # Character base (simplified anime style)
-    if character_type == "rama":
-        # Lord Rama - blue skin, golden crown, bow
-        # Head
-        draw.ellipse([width//4, height//6, 3*width//4, height//2], fill=(135, 206, 235))
-        # Crown
-        crown_points = [(width//2, height//8), (width//3, height//4), (2*width//3, height//4)]
-        draw.polygon(crown_points, fill=(255, 215, 0))
-        # Eyes
-        draw.ellipse([width//3, height//3, width//2-10, height//2-10], fill=(255, 255, 255))
-        draw.ellipse([width//2+10, height//3, 2*width//3, height//2-10], fill=(255, 255, 255))
-        # Bow
-        draw.arc([width//6, height//2, 5*width//6, height], start=0, end=180, fill=(139, 69, 19), width=8)
-        
-    elif character_type == "sita":
-        # Goddess Sita - golden skin, red sari, lotus
-        # Head
-        draw.ellipse([width//4, height//6, 3*width//4, height//2], fill=(255, 228, 196))
-        # Hair
-        draw.ellipse([width//4-10, height//6-10, 3*width//4+10, height//3], fill=(139, 69, 19))
-        # Eyes
-        draw.ellipse([width//3, height//3, width//2-10, height//2-10], fill=(255, 255, 255))
-        draw.ellipse([width//2+10, height//3, 2*width//3, height//2-10], fill=(255, 255, 255))
-        # Lotus flower
-        for i in range(8):
-            angle = i * 45
-            x = width//2 + int(20 * math.cos(math.radians(angle)))
-            y = height//2 + int(20 * math.sin(math.radians(angle)))
-            draw.ellipse([x-15, y-15, x+15, y+15], fill=(255, 182, 193))
-            
-    elif character_type == "hanuman":
-        # Lord Hanuman - orange skin, mace, flying
-        # Head
-        draw.ellipse([width//4, height//6, 3*width//4, height//2], fill=(255, 165, 0))
-        # Ears (monkey style)
-        draw.ellipse([width//6, height//8, width//3, height//3], fill=(255, 165, 0))
-        draw.ellipse([2*width//3, height//8, 5*width//6, height//3], fill=(255, 165, 0))
-        # Eyes
-        draw.ellipse([width//3, height//3, width//2-10, height//2-10], fill=(255, 255, 255))
-        draw.ellipse([width//2+10, height//3, 2*width//3, height//2-10], fill=(255, 255, 255))
-        # Mace
-        draw.rectangle([width//2-5, height//2, width//2+5, height], fill=(139, 69, 19))
-        draw.ellipse([width//2-15, height//2-15, width//2+15, height//2+15], fill=(255, 215, 0))
-    
-    return img
+    return render_portrait(PORTRAITS[character_type], width, height, scale)
 
-def create_rpg_ui_element(width, height, element_type, text=""):
+def create_rpg_ui_element(width, height, element_type, text="", scale=1):
     """Create RPG-style UI elements"""
-    img = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
+    img = Image.new('RGBA', (width * scale, height * scale), (0, 0, 0, 0))
+    draw = ScaledDraw(img, scale)
     
     if element_type == "button":
         # RPG button with gradient and border
         # Outer border
         draw.rectangle([0, 0, width-1, height-1], fill=(139, 69, 19))
-        # Inner gradient
-        for y in range(2, height-2):
-            ratio = y / height
-            r = int(255 * (1 - ratio) + 200 * ratio)
-            g = int(215 * (1 - ratio) + 150 * ratio)
-            b = int(0 * (1 - ratio) + 50 * ratio)
-            draw.line([(2, y), (width-3, y)], fill=(r, g, b))
+        # Inner gradient (ratio runs over the full height, the border rows are cropped off)
+        inner = linear_gradient((width - 4) * scale, height * scale, BUTTON_GRADIENT, mode='RGBA')
+        img.paste(inner.crop((0, 2 * scale, (width - 4) * scale, (height - 2) * scale)), (2 * scale, 2 * scale))
         # Text
         if text:
-            try:
-                font = ImageFont.truetype("Arial", 20)
-            except:
-                font = ImageFont.load_default()
+            font = get_font(20 * scale)
             bbox = draw.textbbox((0, 0), text, font=font)
             text_width = bbox[2] - bbox[0]
             text_height = bbox[3] - bbox[1]
@@ -128,29 +81,22 @@ def create_rpg_ui_element(width, height, element_type, text=""):
     
     return img
 
-def create_title_screen():
+def create_title_screen(scale=1):
     """Create the main title screen"""
     width, height = 1024, 768
     
     # Create background
     bg = create_gradient_background(width, height, 
-                                  [(25, 25, 50), (75, 25, 100)], 'vertical')
+                                  [(25, 25, 50), (75, 25, 100)], 'vertical', scale)
     
-    # Add some mystical particles
-    draw = ImageDraw.Draw(bg)
-    for i in range(50):
-        x = (i * 37) % width
-        y = (i * 23) % height
-        size = (i % 3) + 1
-        draw.ellipse([x-size, y-size, x+size, y+size], fill=(255, 255, 255, 100))
+    # Add some mystical particles, soft glows blended with real alpha
+    bg = add_particles(bg, TITLE_PARTICLES, seed=TITLE_PARTICLE_SEED, scale=scale,
+                       radius=(1, 3), opacity=(0.25, 0.6), colors=TITLE_PARTICLE_COLORS)
+    draw = ScaledDraw(bg, scale)
     
     # Create title text
-    try:
-        title_font = ImageFont.truetype("Arial", 72)
-        subtitle_font = ImageFont.truetype("Arial", 36)
-    except:
-        title_font = ImageFont.load_default()
-        subtitle_font = ImageFont.load_default()
+    title_font = get_font(72 * scale)
+    subtitle_font = get_font(36 * scale)
     
     # Title with shadow effect
     title = "RAMAYANA"
@@ -168,28 +114,28 @@ def create_title_screen():
     
     return bg
 
-def create_character_select():
+def create_character_select(scale=1):
     """Create character selection screen"""
     width, height = 1024, 768
     
-    # Background
-    bg = create_gradient_background(width, height, 
-                                  [(50, 25, 75), (100, 50, 125)], 'vertical')
-    
-    # Character portraits
+    # Background and character portraits as premultiplied layers
     characters = ["rama", "sita", "hanuman"]
+    stack = LayerStack(width * scale, height * scale)
+    stack.add(Layer.from_image(create_gradient_background(width, height,
+                                                          [(50, 25, 75), (100, 50, 125)], 'vertical', scale)))
+    for i, char in enumerate(characters):
+        x = 100 + i * 250
+        y = height//2 - 150
+        portrait = create_anime_character(200, 300, char, None, scale)
+        stack.add(Layer.from_image(portrait, (x * scale, y * scale)))
+    bg = stack.flatten()
+    
+    # Character names
+    draw = ScaledDraw(bg, scale)
+    font = get_font(24 * scale)
     for i, char in enumerate(characters):
-        char_img = create_anime_character(200, 300, char, None)
         x = 100 + i * 250
         y = height//2 - 150
-        bg.paste(char_img, (x, y), char_img)
-        
-        # Character name
-        draw = ImageDraw.Draw(bg)
-        try:
-            font = ImageFont.truetype("Arial", 24)
-        except:
-            font = ImageFont.load_default()
         name = char.upper()
         bbox = draw.textbbox((0, 0), name, font=font)
         name_width = bbox[2] - bbox[0]
@@ -197,15 +143,15 @@ def create_character_select():
     
     return bg
 
-def create_intro_scene():
+def create_intro_scene(scale=1):
     """Create introduction scene"""
     width, height = 1024, 768
     
     # Background with ancient temple
     bg = create_gradient_background(width, height, 
-                                  [(25, 25, 25), (75, 50, 25)], 'vertical')
+                                  [(25, 25, 25), (75, 50, 25)], 'vertical', scale)
     
-    draw = ImageDraw.Draw(bg)
+    draw = ScaledDraw(bg, scale)
     
     # Temple pillars
     for i in range(5):
@@ -233,10 +179,7 @@ def create_intro_scene():
         "sacred pages of the Ramayana."
     ]
     
-    try:
-        font = ImageFont.truetype("Arial", 28)
-    except:
-        font = ImageFont.load_default()
+    font = get_font(28 * scale)
     
     y_start = 100
     for line in intro_text:
@@ -248,78 +191,85 @@ def create_intro_scene():
     
     return bg
 
-def main():
-    """Generate all artwork"""
+def asset_outputs(output_dir, name):
+    """Files written for one asset, one per native scale"""
+    return [f"{output_dir}/{name}{scale_suffix(scale)}.png" for scale in SCALES]
+
+def build_artwork(job):
+    """Render and encode one artwork natively at every scale in a worker process"""
+    output_dir, name, factory, params, options = job
+    messages = []
+    writes = []
+    
+    for scale, img_path in zip(SCALES, asset_outputs(output_dir, name)):
+        with track(name, scale) as record:
+            # Draw at this scale rather than LANCZOS-upscaling the 1x render
+            img = supersample(lambda s: factory(*params, scale=s), scale, options["quality"], record)
+            record.image(img)
+        # Encode in the background while the next scale renders
+        writes.append(shared_writer().submit(save_asset, img, img_path, options["encode"], name, record))
+        messages.append(f"✅ Created {os.path.basename(img_path)}")
+    wait(writes)
+    
+    return messages
+
+def add_arguments(parser):
+    """The artwork has no options of its own; here so every target script looks the same"""
+
+def build(args):
+    """Build the selected artwork under args.out"""
     print("🎨 Creating high-resolution anime-style RPG artwork for Ramayana Game...")
     
     # Create output directory
-    output_dir = "RamayanaGame/Assets.xcassets/GameArt.imageset"
+    output_dir = os.path.join(args.out, TARGET.output_dir)
     create_directory(output_dir)
     
-    # Generate artwork
-    artworks = [
-        ("title_screen", create_title_screen()),
-        ("character_select", create_character_select()),
-        ("intro_scene", create_intro_scene())
-    ]
+    # Generators are named in targets.py so listing them does not need Pillow
+    artworks = [(asset.name, globals()[asset.factory], asset.params)
+                for asset in select(TARGET, only_names(args))]
     
-    for name, img in artworks:
-        # Save main image
-        img_path = f"{output_dir}/{name}.png"
-        img.save(img_path, "PNG")
-        print(f"✅ Created {name}.png")
-        
-        # Create @2x version for high-res displays
-        img_2x = img.resize((img.width * 2, img.height * 2), Image.Resampling.LANCZOS)
-        img_2x_path = f"{output_dir}/{name}@2x.png"
-        img_2x.save(img_2x_path, "PNG")
-        print(f"✅ Created {name}@2x.png")
+    # Skip or restore anything whose generator source, parameters, font and Pillow version are unchanged
+    cache = BuildCache.from_args(args)
+    options = {"encode": encode_settings(args), "quality": args.quality}
+    font = font_fingerprint()
+    entries = [(cache_key((build_artwork, factory), (name, params, options, font)),
+                asset_outputs(output_dir, name),
+                (output_dir, name, factory, params, options))
+               for name, factory, params in artworks]
+
+    for message in run_cached_jobs(build_artwork, entries, cache, args.jobs, args.max_in_flight):
+        print(message)
     
-    # Create Contents.json for the imageset
-    contents_json = '''{
-  "images" : [
-    {
-      "filename" : "title_screen.png",
-      "idiom" : "universal",
-      "scale" : "1x"
-    },
-    {
-      "filename" : "title_screen@2x.png",
-      "idiom" : "universal",
-      "scale" : "2x"
-    },
-    {
-      "filename" : "character_select.png",
-      "idiom" : "universal",
-      "scale" : "1x"
-    },
-    {
-      "filename" : "character_select@2x.png",
-      "idiom" : "universal",
-      "scale" : "2x"
-    },
-    {
-      "filename" : "intro_scene.png",
-      "idiom" : "universal",
-      "scale" : "1x"
-    },
-    {
-      "filename" : "intro_scene@2x.png",
-      "idiom" : "universal",
-      "scale" : "2x"
-    }
-  ],
-  "info" : {
-    "author" : "xcode",
-    "version" : 1
-  }
-}'''
+    print("🎨 All artwork created successfully!")
+    print(f"📁 Files saved to: {output_dir}/")
+
+def main():
+    """Generate all artwork"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_jobs_argument(parser)
+    add_cache_arguments(parser)
+    add_encode_arguments(parser)
+    add_quality_argument(parser)
+    add_arguments(parser)
+    add_output_arguments(parser)
+    add_writer_arguments(parser)
+    add_instrument_arguments(parser)
+    args = parser.parse_args()
+    started = time.perf_counter()
+    configure(args)
+    writer.configure(args)
     
-    with open(f"{output_dir}/Contents.json", "w") as f:
-        f.write(contents_json)
+    unknown = unknown_names([TARGET], only_names(args))
+    if unknown:
+        parser.error(f"no such artwork: {', '.join(unknown)}")
     
-    print("🎨 All artwork created successfully!")
-    print("📁 Files saved to: RamayanaGame/Assets.xcassets/GameArt.imageset/")
+    build(args)
+    with track("catalog") as record, record.stage("write"):
+        catalog_messages = write_catalog([TARGET], args.out)
+    for message in catalog_messages:
+        print(message)
+    if args.report:
+        print(write_report(args.report, "create_intro_art", started))
 
 if __name__ == "__main__":
     main()
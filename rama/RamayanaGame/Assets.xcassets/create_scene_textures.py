@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Pre-bake the textures the Ramayana Game scenes used to draw at runtime
+Enemy bodies, combat particles and full-screen scene gradients, one imageset each at @2x/@3x
+"""
+
+from PIL import Image, ImageDraw
+from gradients import linear_gradient
+from drawing import add_quality_argument, supersample
+from parallel import add_jobs_argument
+from build_cache import BuildCache, add_cache_arguments, cache_key, run_cached_jobs
+from encoding import add_encode_arguments, encode_settings, save_asset
+from instrument import add_instrument_arguments, configure, track, write_report
+from catalog import write_catalog
+from outlines import write_outlines
+from targets import TARGETS, add_output_arguments, only_names, select, unknown_names
+from writer import add_writer_arguments, shared_writer, wait
+import writer
+import argparse
+import os
+import time
+
+TARGET = TARGETS["textures"]
+
+# UIKit light-mode colours used by Enemy.swift
+SYSTEM_RED = (255, 59, 48)
+SYSTEM_GREEN = (52, 199, 89)
+SYSTEM_PURPLE = (175, 82, 222)
+SYSTEM_YELLOW = (255, 204, 0)
+BROWN = (153, 102, 51)
+WHITE = (255, 255, 255)
+# Enemy.swift asks for UIColor.darkGreen, which the project never defines; CSS dark green stands in
+DARK_GREEN = (0, 100, 0)
+
+# Point sizes from Enemy.getEnemySize(for:)
+ENEMY_SIZES = {"basic": 6, "forest": 8, "boss": 12, "rakshasa": 7, "golden": 9}
+
+# CombatScene.createParticleTexture() draws a 4pt white dot
+PARTICLE_SIZE = 4
+
+# Scenes stretch their gradient to the view; baked at the iPhone 16 Pro screen size in points
+SCREEN_SIZE = (402, 874)
+
+# CAGradientLayer colours from each scene, top-left to bottom-right
+SCENE_GRADIENTS = {
+    "menu": [(26, 51, 102), (77, 26, 128), (153, 51, 77)],
+    "level_select": [(51, 102, 26), (26, 77, 51), (77, 51, 102)],
+    # GameOverScene overlays these at 0.8 alpha on its background
+    "victory": [(26, 153, 26, 204), (51, 102, 26, 204)],
+    "defeat": [(153, 26, 26, 204), (102, 26, 51, 204)],
+}
+
+def create_directory(path):
+    """Create directory if it doesn't exist"""
+    if not os.path.exists(path):
+        os.makedirs(path)
+
+def cg_box(x, y, width, height, scale):
+    """Pillow's inclusive pixel box for a CGRect in points, or None when it covers no pixels
+
+    Negative sizes are flipped the way CoreGraphics standardizes them.
+    """
+    x0, x1 = sorted((x * scale, (x + width) * scale))
+    y0, y1 = sorted((y * scale, (y + height) * scale))
+    if x1 - x0 < 1 or y1 - y0 < 1:
+        return None
+    return [x0, y0, x1 - 1, y1 - 1]
+
+def enemy_shapes(enemy_type, size):
+    """The fills Enemy.createEnemyTexture(for:) makes, as (shape, (x, y, w, h), colour) in points"""
+    body = (5, 5, size - 10, size - 10)
+    shapes = {
+        # Simple demon with two eyes
+        "basic": [("ellipse", body, SYSTEM_RED),
+                  ("ellipse", (8, 12, 6, 6), WHITE),
+                  ("ellipse", (16, 12, 6, 6), WHITE)],
+        # Forest creature with a row of spikes
+        "forest": [("ellipse", body, SYSTEM_GREEN)] +
+                  [("rectangle", (i * 4 + 2, 0, 2, 8), DARK_GREEN) for i in range(5)],
+        # Boss with a crown
+        "boss": [("ellipse", body, SYSTEM_PURPLE),
+                 ("rectangle", (8, size - 8, size - 16, 4), SYSTEM_YELLOW)],
+        # Rakshasa with horns
+        "rakshasa": [("ellipse", body, SYSTEM_RED),
+                     ("rectangle", (8, size - 12, 3, 8), BROWN),
+                     ("rectangle", (19, size - 12, 3, 8), BROWN)],
+        # Golden deer with antlers
+        "golden": [("ellipse", body, SYSTEM_YELLOW),
+                   ("rectangle", (8, size - 15, 2, 12), BROWN),
+                   ("rectangle", (20, size - 15, 2, 12), BROWN)],
+    }
+    return shapes[enemy_type]
+
+def create_enemy_texture(enemy_type, scale=1):
+    """Draw an enemy body exactly where Enemy.swift's CoreGraphics calls land, clipped to its size"""
+    size = ENEMY_SIZES[enemy_type]
+    img = Image.new('RGBA', (size * scale, size * scale), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+    for shape, rect, color in enemy_shapes(enemy_type, size):
+        box = cg_box(*rect, scale)
+        if box:
+            getattr(draw, shape)(box, fill=color)
+    return img
+
+def create_particle_texture(scale=1):
+    """White dot filling the particle texture, tinted by the emitters' particleColor"""
+    size = PARTICLE_SIZE * scale
+    img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+    ImageDraw.Draw(img).ellipse([0, 0, size - 1, size - 1], fill=WHITE)
+    return img
+
+def create_scene_gradient(scene, scale=1):
+    """Full-screen diagonal gradient matching the scene's CAGradientLayer (startPoint 0,0 to endPoint 1,1)"""
+    stops = SCENE_GRADIENTS[scene]
+    mode = 'RGBA' if len(stops[0]) == 4 else 'RGB'
+    width, height = SCREEN_SIZE
+    return linear_gradient(width * scale, height * scale, stops, 'diagonal', mode=mode)
+
+def build_texture(job):
+    """Render and encode one texture natively at every scale in a worker process"""
+    name, paths, factory, params, options = job
+    messages = []
+    writes = []
+
+    for scale, img_path in zip(TARGET.scales, paths):
+        with track(name, scale) as record:
+            img = supersample(lambda s: factory(*params, scale=s), scale, options["quality"], record)
+            record.image(img)
+        # Encode in the background while the next scale renders
+        writes.append(shared_writer().submit(save_asset, img, img_path, options["encode"], name, record))
+        messages.append(f"✅ Created {os.path.basename(img_path)}")
+    wait(writes)
+
+    return messages
+
+def add_arguments(parser):
+    """The scene textures have no options of their own; here so every target script looks the same"""
+
+def build(args):
+    """Build the selected textures, each into its own imageset under args.out"""
+    print("🎨 Pre-baking scene textures for Ramayana Game...")
+
+    assets = select(TARGET, only_names(args))
+    for asset in assets:
+        create_directory(TARGET.directory(args.out, asset))
+
+    # Skip or restore anything whose generator source, parameters and Pillow version are unchanged
+    cache = BuildCache.from_args(args)
+    options = {"encode": encode_settings(args), "quality": args.quality}
+    entries = []
+    for asset in assets:
+        factory = globals()[asset.factory]
+        paths = TARGET.outputs(args.out, asset)
+        entries.append((cache_key((build_texture, factory), (asset.name, asset.params, options)),
+                        paths,
+                        (asset.name, paths, factory, asset.params, options)))
+
+    for message in run_cached_jobs(build_texture, entries, cache, args.jobs, args.max_in_flight):
+        print(message)
+
+    print("🎨 All scene textures created successfully!")
+    print(f"📁 Files saved to: {os.path.join(args.out, TARGET.output_dir)}/")
+
+def main():
+    """Generate all scene textures"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_jobs_argument(parser)
+    add_cache_arguments(parser)
+    add_encode_arguments(parser)
+    add_quality_argument(parser)
+    add_arguments(parser)
+    add_output_arguments(parser)
+    add_writer_arguments(parser)
+    add_instrument_arguments(parser)
+    args = parser.parse_args()
+    started = time.perf_counter()
+    configure(args)
+    writer.configure(args)
+
+    unknown = unknown_names([TARGET], only_names(args))
+    if unknown:
+        parser.error(f"no such texture: {', '.join(unknown)}")
+
+    build(args)
+    with track("catalog") as record, record.stage("write"):
+        catalog_messages = write_catalog([TARGET], args.out)
+    for message in catalog_messages:
+        print(message)
+    with track("outlines") as record, record.stage("write"):
+        outline_messages = write_outlines(args.out)
+    for message in outline_messages:
+        print(message)
+    if args.report:
+        print(write_report(args.report, "create_scene_textures", started))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+PNG encoder profiles for the Ramayana asset generators
+Trades encode time against file size: fast for iteration, release and palette for shipping
+"""
+
+from PIL import Image
+import io
+import numpy as np
+
+from instrument import stage
+from writer import atomic_write
+
+# zlib settings per profile; "palette" quantizes first and then encodes like "release"
+PROFILES = {
+    "fast": {"compress_level": 1},
+    "release": {"optimize": True, "compress_level": 9},
+    "palette": {"optimize": True, "compress_level": 9},
+}
+DEFAULT_PROFILE = "release"
+
+# Largest RMS error (0-255 scale) a quantized image may have before palette mode falls back to lossless
+DEFAULT_PALETTE_THRESHOLD = 2.0
+
+def add_encode_arguments(parser):
+    """Add the shared --encode / --encode-asset / --palette-threshold options to an argparse parser"""
+    parser.add_argument("--encode", choices=sorted(PROFILES), default=DEFAULT_PROFILE,
+                        help=f"PNG encoder profile for every asset (default: {DEFAULT_PROFILE})")
+    parser.add_argument("--encode-asset", action="append", default=[], metavar="NAME=PROFILE",
+                        help="override the encoder profile for one asset, e.g. panel=palette")
+    parser.add_argument("--palette-threshold", type=float, default=DEFAULT_PALETTE_THRESHOLD,
+                        help=f"max RMS error accepted by the palette profile (default: {DEFAULT_PALETTE_THRESHOLD})")
+
+def encode_settings(args):
+    """Collect the encoder options from parsed args into a picklable dict"""
+    overrides = {}
+    for override in args.encode_asset:
+        name, _, profile = override.partition("=")
+        if profile not in PROFILES:
+            raise SystemExit(f"unknown encoder profile '{profile}' for {name} (choose from {', '.join(sorted(PROFILES))})")
+        overrides[name] = profile
+    return {"profile": args.encode, "overrides": overrides, "palette_threshold": args.palette_threshold}
+
+def profile_for(settings, name):
+    """Encoder profile for one asset, honouring per-asset overrides"""
+    return settings["overrides"].get(name, settings["profile"])
+
+def _exact_palette(img):
+    """Palette image with no loss when the image uses at most 256 colours, else None"""
+    colors = img.getcolors(256)
+    if colors is None:
+        return None
+
+    # Pack each pixel into one integer so the palette lookup is a single searchsorted
+    channels = len(img.getbands())
+    weights = 256 ** np.arange(channels - 1, -1, -1, dtype=np.uint64)
+    palette = np.array(sorted(color for _, color in colors), dtype=np.uint64).reshape(-1, channels)
+    keys = palette @ weights
+    pixels = np.asarray(img, dtype=np.uint64).reshape(-1, channels) @ weights
+    indices = np.searchsorted(keys, pixels).astype(np.uint8)
+
+    paletted = Image.fromarray(indices.reshape(img.height, img.width), 'P')
+    paletted.putpalette(palette.astype(np.uint8).tobytes(), rawmode=img.mode)
+    return paletted
+
+def quantize(img, threshold=DEFAULT_PALETTE_THRESHOLD):
+    """Reduce to at most 256 colours; returns (paletted image, rms error) or (None, rms error) if too lossy"""
+    if img.mode not in ('RGB', 'RGBA'):
+        img = img.convert('RGBA')
+    exact = _exact_palette(img)
+    if exact is not None:
+        return exact, 0.0
+
+    # Median cut does not support alpha; fast octree does
+    method = Image.Quantize.FASTOCTREE if img.mode == 'RGBA' else Image.Quantize.MEDIANCUT
+    paletted = img.quantize(colors=256, method=method)
+    restored = np.asarray(paletted.convert(img.mode), dtype=np.float32)
+    error = float(np.sqrt(np.mean((restored - np.asarray(img, dtype=np.float32)) ** 2)))
+    return (paletted if error <= threshold else None), error
+
+def encode_png(img, fp, profile=DEFAULT_PROFILE, palette_threshold=DEFAULT_PALETTE_THRESHOLD):
+    """Save img as PNG to a path or file object with the given profile; returns the profile actually used"""
+    used = profile
+    if profile == "palette":
+        paletted, _ = quantize(img, palette_threshold)
+        if paletted is None:
+            # Too many colours to quantize within the threshold - stay lossless
+            used = "release"
+        else:
+            img = paletted
+    img.save(fp, "PNG", **PROFILES[used])
+    return used
+
+def save_asset(img, path, settings, name, record=None):
+    """Encode one asset file using the profile selected for it
+
+    Encoding and writing are separate steps so an instrument.AssetRecord can time them apart.
+    The file is replaced atomically, so an interrupted build never leaves a truncated PNG.
+    """
+    buffer = io.BytesIO()
+    with stage(record, "encode"):
+        used = encode_png(img, buffer, profile_for(settings, name), settings["palette_threshold"])
+    with stage(record, "write"):
+        atomic_write(path, buffer.getvalue())
+    return used
+
+def encoded_size(img, profile, palette_threshold=DEFAULT_PALETTE_THRESHOLD):
+    """Bytes an image encodes to under a profile, without touching the disk"""
+    buffer = io.BytesIO()
+    encode_png(img, buffer, profile, palette_threshold)
+    return buffer.tell()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Font resolution for the Ramayana asset generators
+Resolves fonts to the TrueType file checked in under fonts/ (or a host font for other families) and caches them per (family, size)
+"""
+
+from PIL import ImageFont
+from functools import lru_cache
+import os
+import shutil
+import subprocess
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Fonts checked into the repo win over anything installed on the host
+BUNDLED_FONT_DIR = os.path.join(SCRIPT_DIR, "fonts")
+
+# The bundled face, so text renders identically on every build host (see fonts/LICENSE)
+DEFAULT_FAMILY = "DejaVu Sans"
+
+# Extra directories to search, os.pathsep separated; checked after the bundled fonts, before the system ones
+FONT_PATH_ENV = "RAMAYANA_FONT_PATH"
+
+SYSTEM_FONT_DIRS = [
+    "/System/Library/Fonts",
+    "/System/Library/Fonts/Supplemental",
+    "/Library/Fonts",
+    "~/Library/Fonts",
+    "/usr/share/fonts",
+    "/usr/local/share/fonts",
+    "~/.local/share/fonts",
+    "~/.fonts",
+]
+
+# Metric-compatible substitutes, tried in order like fontconfig's alias rules
+FAMILY_ALIASES = {
+    "arial": ["Arial", "Helvetica", "Liberation Sans", "Arimo", "DejaVu Sans", "FreeSans"],
+    "helvetica": ["Helvetica", "Arial", "Liberation Sans", "Arimo", "DejaVu Sans", "FreeSans"],
+}
+
+FONT_EXTENSIONS = (".ttf", ".otf", ".ttc")
+
+def search_paths():
+    """Directories searched for font files, most specific first"""
+    extra = [path for path in os.environ.get(FONT_PATH_ENV, "").split(os.pathsep) if path]
+    return [os.path.expanduser(path) for path in [BUNDLED_FONT_DIR, *extra, *SYSTEM_FONT_DIRS]]
+
+def _normalize(name):
+    """Compare family and file names ignoring case, spaces, dashes and underscores"""
+    return "".join(ch for ch in name.lower() if ch.isalnum())
+
+@lru_cache(maxsize=None)
+def _font_index(paths):
+    """Map normalized file stems (e.g. "liberationsansregular") to font files under the search paths"""
+    index = {}
+    for root_dir in paths:
+        for dirpath, _, filenames in os.walk(root_dir):
+            for filename in sorted(filenames):
+                stem, ext = os.path.splitext(filename)
+                if ext.lower() in FONT_EXTENSIONS:
+                    index.setdefault(_normalize(stem), os.path.join(dirpath, filename))
+    return index
+
+def _fc_match(family):
+    """Ask fontconfig for an exact family match, or None when fontconfig is unavailable"""
+    if shutil.which("fc-match") is None:
+        return None
+    try:
+        result = subprocess.run(["fc-match", "--format=%{family}\n%{file}", family],
+                                capture_output=True, text=True, timeout=5, check=True)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    matched_family, _, path = result.stdout.partition("\n")
+    # fc-match always answers with something; only accept it if it really is the requested family
+    families = [_normalize(name) for name in matched_family.split(",")]
+    if _normalize(family) in families and os.path.isfile(path):
+        return path
+    return None
+
+@lru_cache(maxsize=None)
+def resolve_font(family=DEFAULT_FAMILY):
+    """Path of the best font file for a family, or None to use the bundled fallback"""
+    index = _font_index(tuple(search_paths()))
+    for candidate in FAMILY_ALIASES.get(_normalize(family), [family]):
+        key = _normalize(candidate)
+        # Prefer the regular face ("Arial.ttf", "LiberationSans-Regular.ttf") over bold or italic ones
+        for stem in (key, key + "regular", key + "book", key + "roman"):
+            if stem in index:
+                return index[stem]
+        path = _fc_match(candidate)
+        if path:
+            return path
+    return None
+
+@lru_cache(maxsize=64)
+def get_font(size, family=DEFAULT_FAMILY):
+    """Load a font at a pixel size, cached per (size, family)
+
+    Falls back to the FreeType font embedded in Pillow when no file is found,
+    so text renders at the right size on every host.
+    """
+    path = resolve_font(family)
+    if path is not None:
+        try:
+            return ImageFont.truetype(path, size)
+        except OSError:
+            pass
+    return ImageFont.load_default(size)
+
+def font_fingerprint(family=DEFAULT_FAMILY):
+    """Identifies the font a family resolves to, for build cache keys"""
+    path = resolve_font(family)
+    if path is None:
+        return "bundled"
+    stat = os.stat(path)
+    return f"{os.path.basename(path)}:{stat.st_size}"
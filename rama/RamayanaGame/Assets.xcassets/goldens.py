@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Golden-image regression check for the Ramayana asset generators
+Renders every target asset and compares it to a stored reference with a per-channel tolerance and a perceptual hash
+"""
+
+from functools import lru_cache
+import argparse
+import glob
+import importlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+from PIL import Image
+import numpy as np
+
+from build_assets import selected_targets
+from parallel import add_jobs_argument, run_jobs
+from targets import SCRIPT_DIR, TARGETS, only_names, scale_suffix, select, unknown_names
+from writer import atomic_write
+
+GOLDEN_DIR = os.path.join(SCRIPT_DIR, "goldens")
+DEFAULT_DIFF_DIR = os.path.join(tempfile.gettempdir(), "ramayana-golden-diffs")
+# Highest scale a golden is kept for: 1x and the retina code paths, without the cost of @3x
+GOLDEN_MAX_SCALE = 2
+# Icon sizes also checked as --pyramid derives them from the master: 87 px halves down to 128 px
+# before its LANCZOS step, 167 px goes straight from 256 px
+PYRAMID_GOLDEN_SIZES = (87, 167)
+
+# Per-channel difference treated as noise, e.g. a rounding change in a vectorized blend
+DEFAULT_TOLERANCE = 2
+# Percent of pixels allowed past the tolerance before a render fails
+DEFAULT_MAX_MISMATCH = 0.0
+# Differing bits allowed between the 64-bit perceptual hashes
+DEFAULT_MAX_HASH_DISTANCE = 4
+
+# Perceptual hash: DCT of a HASH_SAMPLE² greyscale thumbnail, keeping the lowest HASH_SIZE² frequencies
+HASH_SAMPLE = 32
+HASH_SIZE = 8
+
+def golden_scales(target):
+    """Scales a target keeps goldens for (None for unscaled targets like the icon set)"""
+    if not target.scaled:
+        return [None]
+    return [scale for scale in target.scales if scale <= GOLDEN_MAX_SCALE] or [min(target.scales)]
+
+def golden_path(golden_dir, target, asset, scale):
+    """Where the reference render of one asset at one scale is stored"""
+    suffix = "" if scale is None else scale_suffix(scale)
+    return os.path.join(golden_dir, target.name, f"{asset.name}{suffix}.png")
+
+def golden_label(target, asset, scale):
+    return f"{target.name}/{asset.name}" + ("" if scale is None else f"@{scale}x")
+
+@lru_cache(maxsize=4)
+def _dct_matrix(n):
+    """Orthonormal DCT-II basis, so a 2D transform is D @ x @ D.T"""
+    k = np.arange(n)[:, np.newaxis]
+    x = np.arange(n)[np.newaxis, :]
+    basis = np.cos(np.pi * (2 * x + 1) * k / (2 * n)) * np.sqrt(2.0 / n)
+    basis[0] /= np.sqrt(2.0)
+    return basis
+
+def perceptual_hash(img):
+    """64-bit DCT hash of an image's luminance; transparent pixels count as black"""
+    pixels = np.asarray(img.convert('RGBA'), dtype=np.float32) / 255.0
+    rgb = pixels[..., :3] * pixels[..., 3:]
+    luminance = rgb @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+    thumb = np.asarray(Image.fromarray(luminance, 'F').resize((HASH_SAMPLE, HASH_SAMPLE), Image.Resampling.BOX))
+    basis = _dct_matrix(HASH_SAMPLE)
+    low = (basis @ thumb @ basis.T)[:HASH_SIZE, :HASH_SIZE].ravel()
+    # The DC term only measures brightness; threshold the rest against their median
+    bits = low > np.median(low[1:])
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+def hash_distance(a, b):
+    """Number of differing bits between two perceptual hashes"""
+    return bin(a ^ b).count("1")
+
+def compare(expected, actual, tolerance):
+    """(per-channel max difference, fraction of pixels off by more than tolerance in any channel)"""
+    a = np.asarray(expected)
+    b = np.asarray(actual.convert(expected.mode))
+    # |a - b| without widening: uint8 max - min cannot wrap
+    diff = (np.maximum(a, b) - np.minimum(a, b)).reshape(a.shape[0], a.shape[1], -1)
+    channel_max = diff.reshape(-1, diff.shape[-1]).max(axis=0)
+    mismatch = np.count_nonzero((diff > tolerance).any(axis=-1)) / (a.shape[0] * a.shape[1])
+    return channel_max, mismatch
+
+def diff_image(expected, actual, tolerance):
+    """Golden, render and a difference map side by side; pixels past the tolerance are red, brighter when further off"""
+    width, height = max(expected.width, actual.width), max(expected.height, actual.height)
+    panels = []
+    for img in (expected, actual):
+        panel = Image.new('RGBA', (width, height), (64, 64, 64, 255))
+        panel.alpha_composite(img.convert('RGBA'))
+        panels.append(np.asarray(panel, dtype=np.int16))
+    magnitude = np.abs(panels[0] - panels[1]).max(axis=-1)
+    # Dimmed golden underneath so the differences can be located
+    heat = (panels[0][..., :3] // 4).astype(np.uint8)
+    off = magnitude > tolerance
+    heat[off] = np.stack([np.clip(96 + magnitude[off] * 4, 0, 255), np.zeros_like(magnitude[off]),
+                          np.zeros_like(magnitude[off])], axis=-1)
+    sheet = Image.new('RGB', (width * 3, height))
+    sheet.paste(Image.fromarray(panels[0].astype(np.uint8), 'RGBA').convert('RGB'), (0, 0))
+    sheet.paste(Image.fromarray(panels[1].astype(np.uint8), 'RGBA').convert('RGB'), (width, 0))
+    sheet.paste(Image.fromarray(heat, 'RGB'), (width * 2, 0))
+    return sheet
+
+def png_bytes(img):
+    buffer = io.BytesIO()
+    img.save(buffer, "PNG", optimize=True)
+    return buffer.getvalue()
+
+def render(module, factory, params, scale):
+    """Draw one asset the way its target does at --quality 1"""
+    generator = getattr(importlib.import_module(module), factory)
+    return generator(*params) if scale is None else generator(*params, scale=scale)
+
+def check_golden(job):
+    """Render one asset and compare it with its golden (or rewrite the golden); returns (label, status, detail)"""
+    label, module, factory, params, scale, path, options = job
+    img = render(module, factory, params, scale)
+    exists = os.path.exists(path)
+    if options["update"]:
+        if exists:
+            with Image.open(path) as golden:
+                golden.load()
+            if golden.mode == img.mode and np.array_equal(np.asarray(golden), np.asarray(img)):
+                return label, "same", ""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        atomic_write(path, png_bytes(img))
+        return label, "updated" if exists else "added", ""
+    if not exists:
+        return label, "missing", "no golden; run with --update-goldens"
+
+    with Image.open(path) as golden:
+        golden.load()
+    if golden.size != img.size:
+        problems = [f"size {golden.width}x{golden.height} → {img.width}x{img.height}"]
+    elif golden.mode != img.mode:
+        problems = [f"mode {golden.mode} → {img.mode}"]
+    elif np.array_equal(np.asarray(golden), np.asarray(img)):
+        # The usual outcome; skip the tolerance and hash work entirely
+        problems = []
+    else:
+        channel_max, mismatch = compare(golden, img, options["tolerance"])
+        distance = hash_distance(perceptual_hash(golden), perceptual_hash(img))
+        problems = []
+        if mismatch * 100 > options["max_mismatch"]:
+            channels = " ".join(f"{band} {value}" for band, value in zip(golden.getbands(), channel_max))
+            problems.append(f"{mismatch:.2%} of pixels off by more than {options['tolerance']} (max {channels})")
+        if distance > options["max_hash_distance"]:
+            problems.append(f"perceptual hash {distance} bits apart")
+    if not problems:
+        return label, "ok", ""
+    os.makedirs(options["diff_dir"], exist_ok=True)
+    diff_path = os.path.join(options["diff_dir"], label.replace("/", "__") + ".png")
+    atomic_write(diff_path, png_bytes(diff_image(golden, img, options["tolerance"])))
+    return label, "failed", f"{'; '.join(problems)} → {diff_path}"
+
+def golden_jobs(targets, only, golden_dir, options):
+    """One check per asset and golden scale, plus the --pyramid icon sizes when every icon is checked"""
+    jobs = [(golden_label(target, asset, scale), target.module, asset.factory, asset.params, scale,
+             golden_path(golden_dir, target, asset, scale), options)
+            for target in targets for asset in select(target, only) for scale in golden_scales(target)]
+    icons = TARGETS["icons"]
+    if icons in targets and only is None:
+        jobs += [(f"icons/pyramid_{size}px", icons.module, "pyramid_icon", (size,), None,
+                  os.path.join(golden_dir, icons.name, f"pyramid_{size}px.png"), options)
+                 for size in PYRAMID_GOLDEN_SIZES]
+    return jobs
+
+def prune_goldens(golden_dir, jobs):
+    """Delete goldens no asset produces any more; returns their paths"""
+    wanted = {job[5] for job in jobs}
+    stale = [path for path in glob.glob(os.path.join(glob.escape(golden_dir), "*", "*.png")) if path not in wanted]
+    for path in stale:
+        os.remove(path)
+    return stale
+
+def main():
+    """Check every generator against its golden image"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("targets", nargs="*", default=["all"], metavar="TARGET",
+                        help=f"what to check: {', '.join(TARGETS)} or all (default: all)")
+    parser.add_argument("--only", action="append", default=[], metavar="NAME[,NAME...]",
+                        help="check only these assets, e.g. --only rama,demon")
+    add_jobs_argument(parser)
+    parser.add_argument("--update-goldens", action="store_true",
+                        help="record the current renders as the goldens instead of comparing")
+    parser.add_argument("--goldens", default=GOLDEN_DIR,
+                        help="directory holding the golden PNGs (default: goldens/ next to this script)")
+    parser.add_argument("--diff-dir", default=DEFAULT_DIFF_DIR,
+                        help=f"where failing comparisons write their diff images (default: {DEFAULT_DIFF_DIR})")
+    parser.add_argument("--tolerance", type=int, default=DEFAULT_TOLERANCE,
+                        help=f"per-channel difference ignored as noise (default: {DEFAULT_TOLERANCE})")
+    parser.add_argument("--max-mismatch", type=float, default=DEFAULT_MAX_MISMATCH, metavar="PERCENT",
+                        help=f"percent of pixels allowed past the tolerance (default: {DEFAULT_MAX_MISMATCH:g})")
+    parser.add_argument("--max-hash-distance", type=int, default=DEFAULT_MAX_HASH_DISTANCE, metavar="BITS",
+                        help=f"perceptual hash bits allowed to differ (default: {DEFAULT_MAX_HASH_DISTANCE})")
+    args = parser.parse_args()
+    started = time.perf_counter()
+
+    targets = selected_targets(args.targets, parser)
+    only = only_names(args)
+    unknown = unknown_names(targets, only)
+    if unknown:
+        parser.error(f"no such asset in {', '.join(t.name for t in targets)}: {', '.join(unknown)}")
+
+    options = {"update": args.update_goldens, "tolerance": args.tolerance, "max_mismatch": args.max_mismatch,
+               "max_hash_distance": args.max_hash_distance, "diff_dir": args.diff_dir}
+    jobs = golden_jobs(targets, only, args.goldens, options)
+    counts = {}
+    for label, status, detail in run_jobs(check_golden, jobs, args.jobs, args.max_in_flight):
+        counts[status] = counts.get(status, 0) + 1
+        if status == "failed":
+            print(f"❌ {label}: {detail}")
+        elif status == "missing":
+            print(f"⚠️  {label}: {detail}")
+        elif status in ("added", "updated"):
+            print(f"📌 {status.capitalize()} golden {label}")
+    elapsed = time.perf_counter() - started
+
+    if args.update_goldens:
+        if only is None and len(targets) == len(TARGETS):
+            for path in prune_goldens(args.goldens, jobs):
+                print(f"🧹 Removed stale golden {os.path.relpath(path, args.goldens)}")
+        print(f"📌 {len(jobs)} goldens up to date in {args.goldens} ({elapsed:.1f} s)")
+        return
+    failed = counts.get("failed", 0) + counts.get("missing", 0)
+    if failed:
+        print(f"❌ {failed} of {len(jobs)} renders differ from their goldens ({elapsed:.1f} s)")
+        sys.exit(1)
+    print(f"✅ All {len(jobs)} renders match their goldens ({elapsed:.1f} s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Vectorized gradient engine shared by the Ramayana asset generators
+Builds linear, radial and multi-stop gradients as whole NumPy arrays
+"""
+
+from PIL import Image
+import numpy as np
+
+def _normalize_stops(stops):
+    """Turn a colour list or (position, colour) list into sorted positions and colours"""
+    if not stops:
+        raise ValueError("a gradient needs at least one colour stop")
+
+    if isinstance(stops[0][0], (int, np.integer)) and len(stops[0]) in (3, 4):
+        # Plain colour list - spread the stops evenly from 0.0 to 1.0
+        colors = list(stops)
+        if len(colors) == 1:
+            positions = [0.0]
+        else:
+            positions = [i / (len(colors) - 1) for i in range(len(colors))]
+    else:
+        stops = sorted(stops, key=lambda stop: stop[0])
+        positions = [float(position) for position, _ in stops]
+        colors = [color for _, color in stops]
+
+    channels = max(len(color) for color in colors)
+    # Pad RGB stops with full alpha when mixed with RGBA stops
+    colors = [tuple(color) + (255,) * (channels - len(color)) for color in colors]
+    return np.asarray(positions, dtype=np.float64), np.asarray(colors, dtype=np.float64)
+
+def sample_stops(t, stops):
+    """Sample a multi-stop gradient at the ratios in t, returning float colours of shape t.shape + (channels,)"""
+    positions, colors = _normalize_stops(stops)
+    t = np.asarray(t, dtype=np.float64)
+    channels = [np.interp(t, positions, colors[:, c]) for c in range(colors.shape[1])]
+    return np.stack(channels, axis=-1)
+
+def _to_uint8(array):
+    """Clip a float colour array to 0-255 and truncate it to uint8"""
+    # Truncate like int() did in the old per-row loops
+    return np.clip(array, 0, 255).astype(np.uint8)
+
+def to_image(array, mode=None):
+    """Convert a float or uint8 colour array into a Pillow image in one call"""
+    if array.dtype != np.uint8 and 0 in array.strides:
+        # A ramp broadcast across the image: narrow its one row or column, not every pixel
+        ramp = array[tuple(slice(0, 1) if stride == 0 else slice(None) for stride in array.strides)]
+        array = np.broadcast_to(_to_uint8(ramp), array.shape)
+    elif array.dtype != np.uint8:
+        array = _to_uint8(array)
+    channels = array.shape[2] if array.ndim == 3 else 1
+    if mode is None:
+        mode = {1: 'L', 3: 'RGB', 4: 'RGBA'}[channels]
+    elif mode == 'RGBA' and channels == 3:
+        alpha = np.full(array.shape[:2] + (1,), 255, dtype=np.uint8)
+        array = np.concatenate([array, alpha], axis=2)
+    elif mode == 'RGB' and channels == 4:
+        array = array[:, :, :3]
+    return Image.fromarray(np.ascontiguousarray(array), mode)
+
+def linear_gradient_array(width, height, stops, direction='vertical'):
+    """Build a linear gradient as a (height, width, channels) float array"""
+    if direction == 'vertical':
+        ramp = sample_stops(np.arange(height) / height, stops)
+        return np.broadcast_to(ramp[:, np.newaxis, :], (height, width, ramp.shape[-1]))
+    if direction == 'horizontal':
+        ramp = sample_stops(np.arange(width) / width, stops)
+        return np.broadcast_to(ramp[np.newaxis, :, :], (height, width, ramp.shape[-1]))
+    if direction == 'diagonal':
+        # Top-left to bottom-right, matching CGContext.drawLinearGradient in create_icons.swift
+        ys, xs = np.ogrid[0:height, 0:width]
+        t = (xs / width + ys / height) / 2
+        return sample_stops(t, stops)
+    raise ValueError(f"unknown gradient direction: {direction}")
+
+def _corner_radius(width, height, cx, cy):
+    """Distance from the centre to the farthest corner, so the last stop lands in the corners"""
+    return max(np.hypot(x - cx, y - cy) for x in (0, width) for y in (0, height))
+
+def radial_gradient_array(width, height, stops, center=None, radius=None):
+    """Build a radial gradient as a (height, width, channels) float array"""
+    cx, cy = center if center is not None else (width / 2, height / 2)
+    if radius is None:
+        radius = _corner_radius(width, height, cx, cy)
+    ys, xs = np.ogrid[0:height, 0:width]
+    t = np.sqrt((xs - cx) ** 2 + (ys - cy) ** 2) / radius
+    return sample_stops(np.minimum(t, 1.0), stops)
+
+def linear_gradient(width, height, stops, direction='vertical', mode='RGB'):
+    """Create a linear gradient image (vertical, horizontal or diagonal)"""
+    return to_image(linear_gradient_array(width, height, stops, direction), mode)
+
+def radial_gradient(width, height, stops, center=None, radius=None, mode='RGB'):
+    """Create a radial gradient image fading from the centre outwards"""
+    return to_image(radial_gradient_array(width, height, stops, center, radius), mode)
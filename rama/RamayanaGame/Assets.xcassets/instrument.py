@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Build instrumentation for the Ramayana asset generators
+Records render/resample/encode/write time, image size and process peak memory per asset and writes a JSON report
+"""
+
+from collections import deque
+from contextlib import contextmanager, nullcontext
+import cProfile
+import json
+import os
+import platform
+import resource
+import sys
+import time
+
+# Stages every asset is broken down into, in pipeline order
+STAGES = ("render", "resample", "encode", "write")
+
+# Read by worker processes, so --profile-asset reaches them however the pool starts
+PROFILE_ASSET_ENV = "RAMAYANA_PROFILE_ASSET"
+PROFILE_DIR_ENV = "RAMAYANA_PROFILE_DIR"
+
+# Records finished in this process that have not been handed back to the parent yet. A deque
+# rather than a list: the build cache hashes module-level lists as data, and this one changes
+# with every asset recorded
+_records = deque()
+
+def add_instrument_arguments(parser):
+    """Add the shared --report / --profile-asset / --profile-dir options to an argparse parser"""
+    parser.add_argument("--report", metavar="PATH",
+                        help="write per-asset stage timings and memory as JSON")
+    parser.add_argument("--profile-asset", metavar="NAME",
+                        help="run cProfile around one asset and dump NAME[@Nx].prof")
+    parser.add_argument("--profile-dir", default=".",
+                        help="where --profile-asset dumps go (default: current directory)")
+
+def configure(args):
+    """Apply the instrumentation options; call before any worker pool starts"""
+    if args.profile_asset:
+        os.environ[PROFILE_ASSET_ENV] = args.profile_asset
+        os.environ[PROFILE_DIR_ENV] = os.path.abspath(args.profile_dir)
+
+def peak_rss_kb():
+    """High-water resident set size of this process in KB (ru_maxrss is bytes on macOS, KB on Linux)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+class AssetRecord:
+    """Stage timings for one asset at one scale"""
+
+    def __init__(self, asset, scale=None):
+        self.asset = asset
+        self.scale = scale
+        self.stages = {}
+        self.size = None
+
+    @contextmanager
+    def stage(self, name):
+        """Time a block and add it to the named stage
+
+        Stages count CPU time of the thread doing the work, so a build with more workers than
+        cores does not charge each asset for the time it spent waiting for one.
+        """
+        start = time.thread_time()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + (time.thread_time() - start) * 1000
+
+    def image(self, img):
+        """Remember the dimensions of the image this asset produced"""
+        self.size = list(img.size)
+
+def stage(record, name):
+    """record.stage(name), or a no-op when the caller is not instrumented"""
+    return record.stage(name) if record is not None else nullcontext()
+
+def _profile_path(asset, scale):
+    suffix = "" if scale in (None, 1) else f"@{scale}x"
+    return os.path.join(os.environ[PROFILE_DIR_ENV], f"{asset}{suffix}.prof")
+
+@contextmanager
+def track(asset, scale=None):
+    """Record one asset; yields an AssetRecord whose stage() times the pipeline steps"""
+    record = AssetRecord(asset, scale)
+    profiler = cProfile.Profile() if os.environ.get(PROFILE_ASSET_ENV) == asset else None
+    start = time.perf_counter()
+    if profiler:
+        profiler.enable()
+    try:
+        yield record
+    finally:
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(_profile_path(asset, scale))
+        _records.append({
+            "asset": asset,
+            "scale": scale,
+            "size": record.size,
+            # Shared with the record: a background writer may still add encode/write time
+            "stages": record.stages,
+            "total_ms": round((time.perf_counter() - start) * 1000, 3),
+            # High-water mark of the whole process when the asset finished, not this asset's own
+            # use: a pool worker carries it over from every job it ran before
+            "process_peak_rss_kb": peak_rss_kb(),
+            "pid": os.getpid(),
+        })
+
+def reset():
+    """Forget every record; a forked pool worker starts with a copy of its parent's, which are not its own"""
+    _records.clear()
+
+def drain():
+    """Hand over and forget the records finished in this process
+
+    Call once the asset's background writes have been waited for.
+    """
+    records = [{**record, "stages": {name: round(ms, 3) for name, ms in record["stages"].items()}}
+               for record in _records]
+    _records.clear()
+    return records
+
+def extend(records):
+    """Adopt records a worker process handed back"""
+    _records.extend(records)
+
+def stage_totals(records):
+    """Milliseconds per stage summed over all assets"""
+    totals = {name: 0.0 for name in STAGES}
+    for record in records:
+        for name, ms in record["stages"].items():
+            totals[name] = totals.get(name, 0.0) + ms
+    return {name: round(ms, 3) for name, ms in totals.items()}
+
+def write_report(path, script, started):
+    """Write the build report for this run; started is the time.perf_counter() at the start of main"""
+    records = drain()
+    report = {
+        "script": script,
+        "python": platform.python_version(),
+        "wall_ms": round((time.perf_counter() - started) * 1000, 3),
+        "peak_rss_kb": {
+            "main": peak_rss_kb(),
+            "workers": max((r["process_peak_rss_kb"] for r in records if r["pid"] != os.getpid()), default=0),
+        },
+        "stages": stage_totals(records),
+        "assets": records,
+    }
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+    return f"📊 Wrote build report {path}"
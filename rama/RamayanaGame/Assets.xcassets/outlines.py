@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Collision outlines for the Ramayana game sprites
+Traces each sprite's alpha into a convex polygon SpriteKit can use as a physics body without reading the texture
+"""
+
+import argparse
+import json
+import os
+import time
+
+from PIL import Image
+import numpy as np
+
+from trim import read_trim_sidecar
+from targets import PROJECT_ROOT, TARGETS, TRIM_DIR, trim_sidecar_path
+from writer import atomic_write
+
+# Bundled next to the trim sidecars; Enemy.swift reads it
+OUTLINES_FILE = f"{TRIM_DIR}/collision_outlines.json"
+# Sprites the game gives a physics body, per target. Enemy stretches its pre-baked texture to
+# the node, so the outline scales with it; Player and PowerUp draw textures this pipeline does
+# not build (hand-drawn frames, runtime glyphs) and keep their circles
+COLLIDERS = {
+    "textures": ("enemy_basic", "enemy_forest", "enemy_boss", "enemy_rakshasa", "enemy_golden"),
+}
+# SKPhysicsBody(polygonFrom:) takes a convex, counter-clockwise path of at most this many points
+MAX_VERTICES = 12
+# Alpha at which a pixel counts as solid: the visible edge, not the faint anti-aliasing
+ALPHA_THRESHOLD = 128
+
+def row_extents(mask):
+    """Corner points of the leftmost and rightmost solid pixel of every row, in pixel coordinates
+
+    The convex hull of these is the hull of every solid pixel, without looking at the inside.
+    """
+    rows = np.flatnonzero(mask.any(axis=1))
+    if rows.size == 0:
+        return np.empty((0, 2))
+    solid = mask[rows]
+    left = solid.argmax(axis=1)
+    right = mask.shape[1] - solid[:, ::-1].argmax(axis=1)
+    xs = np.concatenate([left, left, right, right])
+    ys = np.concatenate([rows, rows + 1, rows, rows + 1])
+    return np.unique(np.stack([xs, ys], axis=1), axis=0).astype(np.float64)
+
+def _cross(o, a, b):
+    return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+def convex_hull(points):
+    """Monotone chain hull of points sorted by x then y, counter-clockwise with y up, collinear points dropped"""
+    points = [tuple(point) for point in points]
+    if len(points) < 3:
+        return points
+    lower, upper = [], []
+    for point in points:
+        while len(lower) >= 2 and _cross(lower[-2], lower[-1], point) <= 0:
+            lower.pop()
+        lower.append(point)
+    for point in reversed(points):
+        while len(upper) >= 2 and _cross(upper[-2], upper[-1], point) <= 0:
+            upper.pop()
+        upper.append(point)
+    return lower[:-1] + upper[:-1]
+
+def simplify(hull, max_vertices=MAX_VERTICES, min_edge=1.0):
+    """Drop the vertex cutting off the least area until at most max_vertices remain and no edge is under min_edge
+
+    Removing a vertex of a convex polygon keeps it convex and inside the original, so the
+    body only ever loses the thinnest corners of the sprite. Near-duplicate vertices would
+    waste the vertex budget and give the physics engine degenerate edges.
+    """
+    hull = list(hull)
+    while len(hull) > 3:
+        n = len(hull)
+        areas = [abs(_cross(hull[i - 1], hull[i], hull[(i + 1) % n])) for i in range(n)]
+        if len(hull) > max_vertices:
+            candidates = range(n)
+        else:
+            # Either end of each too-short edge
+            candidates = {j % n for i in range(n) if np.hypot(*np.subtract(hull[(i + 1) % n], hull[i])) < min_edge
+                          for j in (i, i + 1)}
+            if not candidates:
+                break
+        hull.pop(min(candidates, key=areas.__getitem__))
+    return hull
+
+def outline(img, scale=1, max_vertices=MAX_VERTICES, threshold=ALPHA_THRESHOLD):
+    """Convex outline of an image's solid pixels as pixel-corner (x, y) points, y down, or [] if it has none
+
+    No edge is shorter than one point (scale pixels).
+    """
+    if 'A' not in img.getbands():
+        width, height = img.size
+        return [(0, height), (width, height), (width, 0), (0, 0)]
+    mask = np.asarray(img.getchannel('A')) >= threshold
+    hull = convex_hull(row_extents(mask))
+    if len(hull) < 3:
+        return []
+    # The hull is counter-clockwise in y-down pixels, which is clockwise once y points up
+    return simplify(hull, max_vertices, scale)[::-1]
+
+def to_points(vertices, scale, source_size, offset=(0, 0)):
+    """Pixel vertices of a (possibly trimmed) render as points around the node's centre, y up
+
+    The centre is that of the untrimmed sprite, matching SKSpriteNode's default anchor point.
+    """
+    source_w, source_h = source_size
+    offset_x, offset_y = offset
+    return [[round((x + offset_x - source_w / 2) / scale, 2), round((source_h / 2 - y - offset_y) / scale, 2)]
+            for x, y in vertices]
+
+def sprite_outline(path, scale, trim_info=None):
+    """{"size": [w, h], "vertices": [[x, y], ...]} in points for one rendered sprite, or None if it is empty"""
+    with Image.open(path) as img:
+        img.load()
+    # A sidecar left over from an earlier --trim build describes a different crop
+    if trim_info and tuple(trim_info["trimmedSize"]) == img.size:
+        source_size, offset = trim_info["sourceSize"], trim_info["offset"]
+    else:
+        source_size, offset = img.size, (0, 0)
+    vertices = outline(img, scale)
+    if not vertices:
+        return None
+    return {"size": [round(source_size[0] / scale, 2), round(source_size[1] / scale, 2)],
+            "vertices": to_points(vertices, scale, source_size, offset)}
+
+def collision_outlines(root):
+    """{sprite name: outline} for every collider rendered under root, traced from its largest scale"""
+    outlines = {}
+    for target_name, names in COLLIDERS.items():
+        target = TARGETS[target_name]
+        for asset in target.assets:
+            if asset.name not in names:
+                continue
+            rendered = [(scale, path) for scale, path in zip(target.scales, target.outputs(root, asset))
+                        if os.path.exists(path)]
+            if not rendered:
+                continue
+            scale, path = max(rendered)
+            sidecar = os.path.join(root, trim_sidecar_path(TRIM_DIR, asset.name))
+            trim_info = read_trim_sidecar(sidecar).get(scale) if os.path.exists(sidecar) else None
+            found = sprite_outline(path, scale, trim_info)
+            if found:
+                outlines[asset.name] = found
+    return outlines
+
+def write_outlines(root):
+    """Retrace every collider on disk and rewrite the outlines file if anything changed; returns log lines
+
+    Like the catalog this covers every rendered sprite, not just the ones a filtered build touched.
+    """
+    started = time.perf_counter()
+    outlines = collision_outlines(root)
+    if not outlines:
+        return []
+    path = os.path.join(root, OUTLINES_FILE)
+    text = json.dumps(outlines, indent=2, sort_keys=True) + "\n"
+    if os.path.exists(path):
+        with open(path) as f:
+            if f.read() == text:
+                return []
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    atomic_write(path, text)
+    most = max(len(found["vertices"]) for found in outlines.values())
+    return [f"📐 Traced {len(outlines)} collision outlines (≤{most} vertices) into {os.path.relpath(path, root)} "
+            f"in {(time.perf_counter() - started) * 1000:.0f} ms"]
+
+def main():
+    """Trace the collision outlines of the sprites already built"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--out", default=PROJECT_ROOT,
+                        help="project root the RamayanaGame/ outputs were written under "
+                             "(default: the checkout this script lives in)")
+    args = parser.parse_args()
+    for message in write_outlines(os.path.abspath(args.out)):
+        print(message)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Process pool helpers for the Ramayana asset generators
+Runs independent render+encode jobs in parallel with deterministic log ordering and a bounded number in flight
+"""
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
+import os
+
+import instrument
+
+def default_jobs():
+    """Number of worker processes to use when --jobs is not given"""
+    return os.cpu_count() or 1
+
+def add_jobs_argument(parser):
+    """Add the shared --jobs / --max-in-flight options to an argparse parser"""
+    parser.add_argument("-j", "--jobs", type=int, default=default_jobs(),
+                        help="number of worker processes (default: all cores, 1 runs in-process)")
+    parser.add_argument("--max-in-flight", type=int, default=None, metavar="N",
+                        help="most jobs (and so full-size images) submitted but not yet finished "
+                             "(default: one per worker)")
+
+def _run_and_collect(worker, job):
+    """Run one job in a worker process and hand its instrumentation records back with the result"""
+    result = worker(job)
+    return result, instrument.drain()
+
+def run_jobs(worker, jobs, max_workers, max_in_flight=None):
+    """Run worker over jobs and yield results in submission order, not completion order
+
+    jobs may be a generator; it is consumed lazily so that no more than
+    max_in_flight jobs (default: max_workers) exist at once. Jobs that carry
+    images, like pre-derived icons, are therefore never all in memory together.
+    """
+    limit = max(1, max_in_flight or max_workers)
+    jobs = iter(jobs)
+    # Look at the first window to avoid starting more workers than there are jobs
+    window = deque(islice(jobs, limit))
+    max_workers = max(1, min(max_workers, len(window)))
+    jobs = chain(_take(window), jobs)
+
+    if max_workers == 1:
+        # Skip pool start-up entirely for serial builds
+        for job in jobs:
+            yield worker(job)
+        return
+
+    pending = deque()
+    # Forked workers would otherwise hand back the parent's records with their first job
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=instrument.reset) as pool:
+        for job in jobs:
+            pending.append(pool.submit(_run_and_collect, worker, job))
+            if len(pending) >= limit:
+                yield _collect(pending.popleft())
+        while pending:
+            yield _collect(pending.popleft())
+
+def _take(queue):
+    """Pop items off a deque as they are consumed, so nothing keeps a reference to them"""
+    while queue:
+        yield queue.popleft()
+
+def _collect(future):
+    """Wait for a job, adopt its instrumentation records and return its result"""
+    result, records = future.result()
+    instrument.extend(records)
+    return result
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Vectorized particle fields for the Ramayana asset generators
+Scatters seeded glows and stars with NumPy by splatting precomputed kernels, then alpha-composites them
+"""
+
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
+
+from gradients import to_image
+
+# Kernel taps scattered per np.add.at call; bounds the temporary index/weight arrays
+SPLAT_BATCH = 1 << 22
+
+# Coverage below half a level cannot move an 8-bit channel, so those pixels are dropped
+MIN_ALPHA = 0.5 / 255
+
+class ParticleLayer(NamedTuple):
+    """A particle field stored sparsely: only the pixels it covers
+
+    index holds flat pixel offsets into a (height, width) frame, alpha their coverage in 0..1 and
+    color their straight RGB, shape (n, 3), or a single (3,) colour for a one-colour field.
+    """
+    size: tuple
+    index: np.ndarray
+    alpha: np.ndarray
+    color: np.ndarray
+
+@lru_cache(maxsize=64)
+def particle_kernel(kind, radius):
+    """Coverage kernel for one particle of the given pixel radius, shape (2r+1, 2r+1), peak 1.0
+
+    "glow" falls off as a Gaussian reaching ~1% at the radius; "star" is a disc with a one-pixel
+    anti-aliased rim.
+    """
+    span = np.arange(-radius, radius + 1, dtype=np.float64)
+    distance = np.hypot(span[:, np.newaxis], span[np.newaxis, :])
+    if kind == "glow":
+        sigma = max(radius, 1) / 3.0
+        kernel = np.exp(-0.5 * (distance / sigma) ** 2)
+    elif kind == "star":
+        kernel = np.clip(radius + 0.5 - distance, 0.0, 1.0)
+    else:
+        raise ValueError(f"unknown particle kind: {kind}")
+    kernel[distance > radius + 0.5] = 0.0
+    kernel.setflags(write=False)
+    return kernel
+
+def _splat(sums, canvas_w, pad, ys, xs, opacities, tints, kernel):
+    """Scatter one radius bucket of particles centred on (ys, xs) into flat padded canvases
+
+    sums[0] gains the optical depth -log(1 - c); with tints, sums[1:4] gain c * tint and sums[4]
+    the coverage c, where c = opacity * kernel is each particle's coverage of a pixel.
+    """
+    radius = kernel.shape[0] // 2
+    dy, dx = np.nonzero(kernel)
+    # The padding is at least the largest radius, so no tap ever leaves the canvas
+    offsets = (dy - radius + pad) * canvas_w + (dx - radius + pad)
+    taps = kernel[dy, dx]
+    base = ys * canvas_w + xs
+    step = max(1, SPLAT_BATCH // len(taps))
+    for start in range(0, len(base), step):
+        batch = slice(start, start + step)
+        index = (base[batch, np.newaxis] + offsets[np.newaxis, :]).ravel()
+        cover = np.minimum(opacities[batch, np.newaxis] * taps[np.newaxis, :], 1.0 - 1e-6)
+        np.add.at(sums[0], index, -np.log1p(-cover).ravel())
+        if tints is not None:
+            for channel in range(3):
+                np.add.at(sums[1 + channel], index, (cover * tints[batch, channel, np.newaxis]).ravel())
+            np.add.at(sums[4], index, cover.ravel())
+
+def particle_field(width, height, count, seed=0, radius=(1, 3), opacity=(0.2, 0.6),
+                   colors=((255, 255, 255),), kind="glow", scale=1):
+    """Scatter count seeded particles over a width x height point canvas rendered at scale
+
+    Positions, radii (whole points), opacities and colours are drawn from the seed in points, so
+    every scale shows the same field. Overlaps composite exactly for coverage,
+    alpha = 1 - prod(1 - c_i), and the colour is the coverage-weighted mean of the particles there,
+    which keeps the result independent of draw order.
+    """
+    rng = np.random.default_rng(seed)
+    xs = rng.uniform(0, width, count)
+    ys = rng.uniform(0, height, count)
+    radii = rng.integers(radius[0], radius[1] + 1, count)
+    opacities = rng.uniform(opacity[0], opacity[1], count)
+    palette = np.asarray(colors, dtype=np.float64)
+    tints = palette[rng.integers(0, len(palette), count)] if len(palette) > 1 else None
+
+    pixel_w, pixel_h = width * scale, height * scale
+    px = np.minimum((xs * scale).astype(np.int64), pixel_w - 1)
+    py = np.minimum((ys * scale).astype(np.int64), pixel_h - 1)
+    # Accumulate into canvases padded by the largest radius, so kernels hanging off the edge need no clipping
+    pad = int(radius[1]) * scale
+    canvas_w = pixel_w + 2 * pad
+    sums = np.zeros((1 if tints is None else 5, canvas_w * (pixel_h + 2 * pad)))
+    # One precomputed kernel per distinct radius; every particle of that size is splatted at once
+    for r in np.unique(radii):
+        chosen = radii == r
+        _splat(sums, canvas_w, pad, py[chosen], px[chosen], opacities[chosen],
+               None if tints is None else tints[chosen], particle_kernel(kind, int(r) * scale))
+
+    # Keep the visible covered pixels only and map them back to the unpadded frame
+    covered = np.flatnonzero(sums[0] >= -np.log1p(-MIN_ALPHA))
+    rows, cols = np.divmod(covered, canvas_w)
+    rows -= pad
+    cols -= pad
+    inside = (rows >= 0) & (rows < pixel_h) & (cols >= 0) & (cols < pixel_w)
+    covered = covered[inside]
+    index = rows[inside] * pixel_w + cols[inside]
+    alpha = -np.expm1(-sums[0, covered])
+    if tints is None:
+        color = palette[0]
+    else:
+        color = sums[1:4, covered].T / sums[4, covered, np.newaxis]
+    return ParticleLayer((pixel_w, pixel_h), index, alpha, color)
+
+def _over(below, alpha, color):
+    """Porter-Duff over of straight colour onto float pixels (RGB or RGBA, last axis channels)"""
+    if below.shape[-1] == 3:
+        return below + (color - below) * alpha
+    # Un-premultiply against the combined alpha so the result stays straight colour
+    below_alpha = below[..., 3:] / 255.0
+    out_alpha = alpha + below_alpha * (1.0 - alpha)
+    rgb = (below[..., :3] * below_alpha * (1.0 - alpha) + color * alpha) / out_alpha
+    return np.concatenate([rgb, out_alpha * 255.0], axis=-1)
+
+def composite_over(img, layer):
+    """Alpha-composite a particle layer over an RGB or RGBA image and return a new image in the same mode
+
+    Only the pixels the field covers are read and blended.
+    """
+    if img.size != layer.size:
+        raise ValueError(f"particle layer is {layer.size}, image is {img.size}")
+    out = np.array(img)
+    pixels = out.reshape(-1, out.shape[-1])
+    below = pixels[layer.index].astype(np.float64)
+    pixels[layer.index] = np.clip(np.rint(_over(below, layer.alpha[:, np.newaxis], layer.color)), 0, 255)
+    return to_image(out, img.mode)
+
+def add_particles(img, count, seed=0, scale=1, **options):
+    """Composite a seeded particle field over img, whose size is the field's point size times scale"""
+    width, height = img.width // scale, img.height // scale
+    return composite_over(img, particle_field(width, height, count, seed, scale=scale, **options))
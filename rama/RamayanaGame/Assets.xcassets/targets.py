@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Build targets for the Ramayana asset pipeline
+Names every asset, the generator that draws it and where it is written; imports nothing heavy
+so listing and dry runs start instantly
+"""
+
+from typing import NamedTuple
+import os
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+# Directory holding the RamayanaGame sources; every output path is relative to it
+PROJECT_ROOT = os.path.dirname(os.path.dirname(SCRIPT_DIR))
+
+# Scale factors rendered natively for every imageset
+SCALES = (1, 2, 3)
+
+# Folder reference in the app bundle holding the .atlasc outputs (SpriteKit loads them from
+# there, not from the asset catalog), relative to the project root
+ATLAS_DIR = "RamayanaGame"
+# What CombatScene draws, packed into the Characters atlas; the other characters are not on
+# screen in combat and stay loose images
+ATLAS_SPRITES = ("background", "rama", "demon")
+# Trim offsets and collision outlines ship next to the atlas, relative to the project root
+TRIM_DIR = "RamayanaGame/SpriteMetadata"
+
+def trim_sidecar_path(trim_dir, name):
+    """Where the trim offsets for one sprite are recorded"""
+    return f"{trim_dir}/{name}.trim.json"
+
+def scale_suffix(scale):
+    """Filename suffix for a scale factor ("" for 1x, "@2x" otherwise)"""
+    return "" if scale == 1 else f"@{scale}x"
+
+class Asset(NamedTuple):
+    """One generated image: its name, the generator function in the target's script and its arguments"""
+    name: str
+    factory: str
+    params: tuple = ()
+
+class Target(NamedTuple):
+    """A group of assets built by one script into one output directory"""
+    name: str
+    module: str
+    output_dir: str
+    assets: tuple
+    scaled: bool = True
+    description: str = ""
+    scales: tuple = SCALES
+    # Give every asset its own NAME.imageset so the game can load it with imageNamed:
+    imagesets: bool = False
+
+    def directory(self, root, asset):
+        """Directory one asset's files are written to under the project root"""
+        directory = os.path.join(root, self.output_dir)
+        return os.path.join(directory, f"{asset.name}.imageset") if self.imagesets else directory
+
+    def outputs(self, root, asset):
+        """PNG files written for one asset under the project root"""
+        directory = self.directory(root, asset)
+        if not self.scaled:
+            return [os.path.join(directory, f"{asset.name}.png")]
+        return [os.path.join(directory, f"{asset.name}{scale_suffix(scale)}.png") for scale in self.scales]
+
+TARGETS = {
+    "icons": Target(
+        "icons", "create_icon", "RamayanaGame/Assets.xcassets/AppIcon.appiconset",
+        (
+            Asset("20x20@2x", "render_icon", (40,)),
+            Asset("20x20@3x", "render_icon", (60,)),
+            Asset("29x29@2x", "render_icon", (58,)),
+            Asset("29x29@3x", "render_icon", (87,)),
+            Asset("40x40@2x", "render_icon", (80,)),
+            Asset("40x40@3x", "render_icon", (120,)),
+            Asset("60x60@2x", "render_icon", (120,)),
+            Asset("60x60@3x", "render_icon", (180,)),
+            Asset("76x76@2x", "render_icon", (152,)),
+            Asset("83.5x83.5@2x", "render_icon", (167,)),
+            Asset("1024x1024@1x", "render_icon", (1024,)),
+        ),
+        scaled=False,
+        description="App icon set",
+    ),
+    "sprites": Target(
+        "sprites", "create_game_sprites", "RamayanaGame/Assets.xcassets/GameSprites.imageset",
+        (
+            Asset("rama", "create_rama_sprite", (200, 300)),
+            Asset("sita", "create_sita_sprite", (200, 300)),
+            Asset("hanuman", "create_hanuman_sprite", (200, 300)),
+            Asset("demon", "create_demon_sprite", (200, 300)),
+            Asset("lakshmana", "create_lakshmana_sprite", (200, 300)),
+            Asset("ravana", "create_ravana_sprite", (200, 300)),
+            Asset("background", "create_background_sprite", (400, 300)),
+        ),
+        description="Combat sprites and the Characters atlas",
+    ),
+    "art": Target(
+        "art", "create_intro_art", "RamayanaGame/Assets.xcassets/GameArt.imageset",
+        (
+            Asset("title_screen", "create_title_screen"),
+            Asset("character_select", "create_character_select"),
+            Asset("intro_scene", "create_intro_scene"),
+        ),
+        description="Title, character select and intro artwork",
+    ),
+    "textures": Target(
+        "textures", "create_scene_textures", "RamayanaGame/Assets.xcassets",
+        (
+            Asset("enemy_basic", "create_enemy_texture", ("basic",)),
+            Asset("enemy_forest", "create_enemy_texture", ("forest",)),
+            Asset("enemy_boss", "create_enemy_texture", ("boss",)),
+            Asset("enemy_rakshasa", "create_enemy_texture", ("rakshasa",)),
+            Asset("enemy_golden", "create_enemy_texture", ("golden",)),
+            Asset("combat_particle", "create_particle_texture"),
+            Asset("menu_background", "create_scene_gradient", ("menu",)),
+            Asset("level_select_background", "create_scene_gradient", ("level_select",)),
+            Asset("game_over_victory", "create_scene_gradient", ("victory",)),
+            Asset("game_over_defeat", "create_scene_gradient", ("defeat",)),
+        ),
+        description="Textures the scenes used to draw at runtime, one imageset each",
+        # Retina only, like the contentsScale the scenes rendered these at
+        scales=(2, 3),
+        imagesets=True,
+    ),
+}
+
+def add_output_arguments(parser):
+    """Add the shared --out / --only options to an argparse parser"""
+    parser.add_argument("--out", default=PROJECT_ROOT,
+                        help="project root the RamayanaGame/ outputs are written under "
+                             "(default: the checkout this script lives in)")
+    parser.add_argument("--only", action="append", default=[], metavar="NAME[,NAME...]",
+                        help="build only these assets, e.g. --only rama,demon")
+
+def only_names(args):
+    """The --only names as a set, or None when every asset should be built"""
+    names = {name.strip() for value in args.only for name in value.split(",") if name.strip()}
+    return names or None
+
+def select(target, only):
+    """Assets of a target matching the --only names (all of them when only is None)"""
+    if only is None:
+        return list(target.assets)
+    return [asset for asset in target.assets if asset.name in only]
+
+def unknown_names(targets, only):
+    """--only names that match no asset in the given targets"""
+    if only is None:
+        return []
+    known = {asset.name for target in targets for asset in target.assets}
+    return sorted(only - known)
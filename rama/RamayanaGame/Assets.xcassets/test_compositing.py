@@ -0,0 +1,51 @@
+"""LayerStack must give the same result however mutations and flattens interleave"""
+
+from PIL import Image
+import numpy as np
+
+from compositing import Layer, LayerStack
+
+BLUE = (0, 0, 255, 255)
+RED = (255, 0, 0, 255)
+GREEN = (0, 255, 0, 255)
+
+def solid(color, size=(32, 32)):
+    return Layer.from_image(Image.new('RGBA', size, color))
+
+def from_scratch(layers):
+    """The same layers flattened by a fresh stack with no cached state"""
+    stack = LayerStack(32, 32)
+    for layer in layers:
+        stack.add(layer)
+    return np.asarray(stack.flatten())
+
+def test_replace_after_unflattened_add():
+    stack = LayerStack(32, 32)
+    stack.add(solid(BLUE))
+    stack.flatten()
+    stack.add(solid(RED, (20, 20)).moved((8, 8)))
+    stack.add(solid(GREEN, (4, 4)))
+    stack.replace(2, solid(GREEN, (4, 4)).moved((2, 2)))
+    result = np.asarray(stack.flatten())
+    assert tuple(result[14, 14]) == (255, 0, 0)
+    assert np.array_equal(result, from_scratch(stack.layers))
+
+def test_remove_before_first_flatten():
+    stack = LayerStack(32, 32)
+    stack.add(solid(BLUE))
+    stack.add(solid(RED, (8, 8)).moved((4, 4)))
+    stack.remove(1)
+    result = np.asarray(stack.flatten())
+    assert tuple(result[14, 14]) == (0, 0, 255)
+    assert np.array_equal(result, from_scratch(stack.layers))
+
+def test_flatten_after_each_mutation_matches_scratch():
+    stack = LayerStack(32, 32)
+    stack.add(solid(BLUE))
+    stack.flatten()
+    stack.add(solid((255, 0, 0, 128), (16, 16)).moved((4, 4)))
+    stack.flatten()
+    stack.replace(1, solid(GREEN, (16, 16)).moved((12, 12)))
+    stack.flatten()
+    stack.remove(0)
+    assert np.array_equal(np.asarray(stack.flatten()), from_scratch(stack.layers))
@@ -0,0 +1,28 @@
+"""Build reports must describe the same work whether the build ran in-process or on a pool"""
+
+import json
+import os
+import subprocess
+import sys
+
+from instrument import STAGES
+from targets import SCRIPT_DIR
+
+def build_report(tmp_path, jobs):
+    report = tmp_path / f"report-j{jobs}.json"
+    subprocess.run([sys.executable, os.path.join(SCRIPT_DIR, "build_assets.py"), "textures", "--force",
+                    "-j", str(jobs), "--out", str(tmp_path / f"out-j{jobs}"),
+                    "--cache-dir", str(tmp_path / f"cache-j{jobs}"), "--report", str(report)],
+                   check=True, capture_output=True)
+    with open(report) as f:
+        return json.load(f)
+
+def test_pool_reports_each_asset_once(tmp_path):
+    serial, pooled = build_report(tmp_path, 1), build_report(tmp_path, 4)
+    def assets(report):
+        return sorted((record["asset"], record["scale"] or 0) for record in report["assets"])
+    assert len(pooled["assets"]) == len(serial["assets"])
+    assert assets(pooled) == assets(serial)
+    # CPU time per stage varies run to run, but not by the multiple a duplicated record adds
+    for name in STAGES:
+        assert abs(pooled["stages"][name] - serial["stages"][name]) <= 0.5 * serial["stages"][name] + 100, name
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Texture memory report for the Ramayana game assets
+Works out what every generated image costs decoded on the device and totals it per scene against a budget
+"""
+
+from typing import NamedTuple
+import argparse
+import glob
+import os
+import re
+import sys
+
+from PIL import Image
+
+from targets import ATLAS_DIR, PROJECT_ROOT, TARGETS
+
+# Screens iOS 18 runs on; a device decodes only the variant matching its own scale
+DEVICE_SCALES = (2, 3)
+# Decoded textures are 32-bit BGRA on the GPU whatever the PNG stores
+BYTES_PER_PIXEL = 4
+MB = 1024 * 1024
+# Per-scene budget for decoded textures; older 2-3 GB devices have been terminated under memory pressure
+DEFAULT_BUDGET_MB = 64
+
+class Scene(NamedTuple):
+    """Textures a scene or node class loads: imageNamed:/UIImage(named:) names, SKTextureAtlas names and nodes it creates
+
+    A tuple in textures lists alternatives of which only one is loaded; the largest is counted.
+    fallbacks are loose images loaded only when the scene's atlases are not in the bundle; they
+    are counted instead of the atlases then, never on top of them.
+    """
+    textures: tuple = ()
+    atlases: tuple = ()
+    nodes: tuple = ()
+    fallbacks: tuple = ()
+
+# From the Swift sources; update alongside any imageNamed: or SKTextureAtlas(named:) change
+SCENES = {
+    # Background, rama and demon come from the Characters atlas through CharacterAtlas.swift
+    "CombatScene": Scene(("combat_particle",), ("Characters",), ("Player",), ("background", "rama", "demon")),
+    "GameScene": Scene(nodes=("Player", "Enemy")),
+    "MainMenuScene": Scene(("menu_background",)),
+    "LevelSelectScene": Scene(("level_select_background",)),
+    "GameOverScene": Scene((("game_over_victory", "game_over_defeat"),)),
+    "IntroScene": Scene(("title_screen", "intro_scene", "character_select")),
+    # Hand-drawn animation frames, not built here; rama_sprite only if they fail to load
+    "Player": Scene(("rama_frame1", "rama_frame2", "rama_frame3")),
+    "Enemy": Scene(("enemy_basic", "enemy_forest", "enemy_boss", "enemy_rakshasa", "enemy_golden")),
+}
+# Nodes are counted inside the scenes that create them, not reported on their own
+NODES = {"Player", "Enemy"}
+
+class Footprint(NamedTuple):
+    """Pixels of one image or atlas at every scale it exists at"""
+    name: str
+    kind: str
+    pixels: dict    # {scale: pixel count}
+
+    def bytes(self, scale):
+        """Decoded size at one scale"""
+        return self.pixels.get(scale, 0) * BYTES_PER_PIXEL
+
+def pixel_count(path):
+    """Pixels in a PNG, read from its header without decoding"""
+    with Image.open(path) as img:
+        return img.width * img.height
+
+def asset_footprints(root):
+    """{name: Footprint} for every generated scene image and atlas found under the project root"""
+    footprints = {}
+    for target in TARGETS.values():
+        if not target.scaled:
+            # The app icon is drawn by the system, not loaded by a scene
+            continue
+        for asset in target.assets:
+            pixels = {scale: pixel_count(path) for scale, path in zip(target.scales, target.outputs(root, asset))
+                      if os.path.exists(path)}
+            if pixels:
+                footprints[asset.name] = Footprint(asset.name, target.name, pixels)
+    for atlas_dir in sorted(glob.glob(os.path.join(glob.escape(os.path.join(root, ATLAS_DIR)), "*.atlasc"))):
+        name = os.path.splitext(os.path.basename(atlas_dir))[0]
+        pixels = {}
+        for sheet in glob.glob(os.path.join(glob.escape(atlas_dir), "*.png")):
+            match = re.search(r"@(\d+)x\.png$", sheet)
+            scale = int(match.group(1)) if match else 1
+            # Every sheet of an atlas is resident once any of its sprites is drawn
+            pixels[scale] = pixels.get(scale, 0) + pixel_count(sheet)
+        footprints[f"atlas:{name}"] = Footprint(name, "atlas", pixels)
+    return footprints
+
+def scene_textures(scene_name):
+    """(texture entries, atlas names, fallback names) a scene loads, including the nodes it creates
+
+    An atlas or image shared by the scene and its nodes is loaded, and counted, once.
+    """
+    scene = SCENES[scene_name]
+    textures, atlases, fallbacks = list(scene.textures), list(scene.atlases), list(scene.fallbacks)
+    for node in scene.nodes:
+        for found, node_found in zip((textures, atlases, fallbacks), scene_textures(node)):
+            found += [item for item in node_found if item not in found]
+    return textures, atlases, fallbacks
+
+def alternatives(item):
+    """Names in one Scene.textures entry"""
+    return item if isinstance(item, tuple) else (item,)
+
+def scene_footprints(footprints):
+    """{scene: ({scale: bytes}, [names not generated])} for every scene in SCENES"""
+    scenes = {}
+    for scene_name in SCENES:
+        if scene_name in NODES:
+            continue
+        textures, atlases, fallbacks = scene_textures(scene_name)
+        if not all(f"atlas:{name}" in footprints for name in atlases):
+            # The loose images are only loaded when an atlas is not in the bundle
+            textures += fallbacks
+        # Each entry is a group of alternatives; a plain name is a group of one
+        groups = [[footprints[name] for name in alternatives(item) if name in footprints] for item in textures]
+        groups += [[footprints[f"atlas:{name}"]] for name in atlases if f"atlas:{name}" in footprints]
+        missing = [name for item in textures for name in alternatives(item) if name not in footprints]
+        missing += [f"{name} atlas" for name in atlases if f"atlas:{name}" not in footprints]
+        totals = {scale: sum(max((footprint.bytes(scale) for footprint in group), default=0) for group in groups)
+                  for scale in DEVICE_SCALES}
+        scenes[scene_name] = (totals, missing)
+    return scenes
+
+def users(name, kind):
+    """Scenes that load an image or atlas; ones that only fall back to an image are marked"""
+    found = []
+    for scene in SCENES:
+        if scene in NODES:
+            continue
+        textures, atlases, fallbacks = scene_textures(scene)
+        names = atlases if kind == "atlas" else [name for item in textures for name in alternatives(item)]
+        if name in names:
+            found.append(scene)
+        elif kind != "atlas" and name in fallbacks:
+            found.append(f"{scene} (fallback)")
+    return found
+
+def format_size(size):
+    """Bytes as MB, or KB/B for the small ones"""
+    if not size:
+        return "—"
+    if size >= MB / 10:
+        return f"{size / MB:.1f} MB"
+    return f"{size / 1024:.0f} KB" if size >= 1024 else f"{size} B"
+
+def texture_report(root, budget_mb=DEFAULT_BUDGET_MB):
+    """(report lines, scenes over budget) for the assets under root"""
+    footprints = asset_footprints(root)
+    header = "".join(f"{f'@{scale}x':>11}" for scale in DEVICE_SCALES)
+    lines = [f"{'texture':<26}{header}  loaded by"]
+    for footprint in footprints.values():
+        columns = "".join(f"{format_size(footprint.bytes(scale)):>11}" for scale in DEVICE_SCALES)
+        label = f"{footprint.name} ({footprint.kind})" if footprint.kind == "atlas" else footprint.name
+        lines.append(f"{label:<26}{columns}  {', '.join(users(footprint.name, footprint.kind)) or '—'}")
+
+    lines.append("")
+    lines.append(f"{'scene':<26}{header}  budget {budget_mb:g} MB")
+    over = []
+    for scene, (totals, missing) in scene_footprints(footprints).items():
+        columns = "".join(f"{format_size(totals[scale]):>11}" for scale in DEVICE_SCALES)
+        lines.append(f"{scene:<26}{columns}")
+        if missing:
+            lines.append(f"  not generated (drawn at runtime or missing): {', '.join(missing)}")
+        for scale in DEVICE_SCALES:
+            if totals[scale] > budget_mb * MB:
+                over.append((scene, scale, totals[scale]))
+    for scene, scale, total in over:
+        lines.append(f"⚠️  {scene} needs {format_size(total)} of textures at @{scale}x, over the {budget_mb:g} MB budget")
+    return lines, over
+
+def add_budget_arguments(parser):
+    """Add the shared --texture-budget / --fail-over-budget options to an argparse parser"""
+    parser.add_argument("--texture-budget", type=float, default=DEFAULT_BUDGET_MB, metavar="MB",
+                        help=f"decoded texture memory one scene may use (default: {DEFAULT_BUDGET_MB})")
+    parser.add_argument("--fail-over-budget", action="store_true",
+                        help="exit with an error when a scene is over the texture budget")
+
+def check_budget(root, args):
+    """Print the report; returns the exit status the budget options ask for"""
+    lines, over = texture_report(root, args.texture_budget)
+    for line in lines:
+        print(line)
+    return 1 if over and args.fail_over_budget else 0
+
+def main():
+    """Report the decoded texture memory of the generated assets"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--out", default=PROJECT_ROOT,
+                        help="project root the RamayanaGame/ outputs were written under "
+                             "(default: the checkout this script lives in)")
+    add_budget_arguments(parser)
+    args = parser.parse_args()
+    sys.exit(check_budget(os.path.abspath(args.out), args))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Transparent border trimming for the Ramayana game sprites
+Crops RGBA sprites to their alpha bounding box and records how to restore the anchor
+"""
+
+import json
+import numpy as np
+
+from writer import atomic_write
+
+def alpha_bbox(img):
+    """Bounding box (left, top, right, bottom) of the non-transparent pixels, or None if fully transparent"""
+    alpha = np.asarray(img.getchannel('A'))
+    rows = np.flatnonzero(alpha.any(axis=1))
+    if rows.size == 0:
+        return None
+    cols = np.flatnonzero(alpha.any(axis=0))
+    return int(cols[0]), int(rows[0]), int(cols[-1]) + 1, int(rows[-1]) + 1
+
+def trim_sprite(img):
+    """Crop an RGBA sprite to its alpha bounds; returns (trimmed image, trim info)"""
+    source_w, source_h = img.size
+    bbox = alpha_bbox(img) if img.mode == 'RGBA' else None
+    if bbox is None:
+        # Nothing to trim (opaque image) or nothing to keep (fully transparent)
+        bbox = (0, 0, source_w, source_h)
+    left, top, right, bottom = bbox
+    trimmed = img.crop(bbox)
+
+    info = {
+        "sourceSize": [source_w, source_h],
+        "trimmedSize": [right - left, bottom - top],
+        # Top-left corner of the trimmed pixels inside the original canvas
+        "offset": [left, top],
+        # Centre of the trimmed pixels relative to the original centre, y up (SpriteKit's spriteOffset)
+        "spriteOffset": [(left + right - source_w) / 2, (source_h - top - bottom) / 2],
+        "bytesSaved": (source_w * source_h - (right - left) * (bottom - top)) * 4,
+    }
+    return trimmed, info
+
+def write_trim_sidecar(path, infos):
+    """Write {scale: trim info} for one sprite as JSON"""
+    atomic_write(path, json.dumps({str(scale): info for scale, info in infos.items()}, indent=2, sort_keys=True))
+
+def read_trim_sidecar(path):
+    """Read a sidecar written by write_trim_sidecar, keyed by integer scale"""
+    with open(path) as f:
+        return {int(scale): info for scale, info in json.load(f).items()}
+
+def trim_report(name, infos):
+    """One report line per scale showing the decoded texture memory saved"""
+    lines = []
+    for scale, info in sorted(infos.items()):
+        source_w, source_h = info["sourceSize"]
+        trimmed_w, trimmed_h = info["trimmedSize"]
+        saved_kb = info["bytesSaved"] / 1024
+        percent = 100 * info["bytesSaved"] / (source_w * source_h * 4)
+        lines.append(f"✂️  {name}@{scale}x: {source_w}x{source_h} → {trimmed_w}x{trimmed_h}, "
+                     f"saves {saved_kb:.1f} KB ({percent:.0f}%)")
+    return lines
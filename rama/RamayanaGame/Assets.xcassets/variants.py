@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Seeded colour variants of the Ramayana character sprites
+Renders a base sprite once, indexes its flat colours and recolours whole batches through NumPy LUTs
+"""
+
+from typing import NamedTuple
+import zlib
+
+import numpy as np
+
+from characters import render_character
+from gradients import to_image
+
+# Prop classes whose colour a variant may change, grouped into the roles a level palette varies
+PROP_ROLES = {
+    "Hair": "hair",
+    "Spikes": "hair",
+    "Horns": "horns",
+    "Band": "clothing",
+    "Crown": "ornament",
+    "Jewel": "ornament",
+}
+
+# Per-variant jitter ranges: hue turn (fraction of the wheel), saturation and value multipliers
+HUE_SHIFT = (-0.5, 0.5)
+SATURATION_SCALE = (0.7, 1.2)
+VALUE_SCALE = (0.75, 1.15)
+
+class IndexedSprite(NamedTuple):
+    """A sprite as a palette of distinct RGBA colours and a per-pixel index into it"""
+    palette: np.ndarray   # (colours, 4) uint8
+    index: np.ndarray     # (height, width) uint16
+
+def colour_roles(spec):
+    """{RGB: role} for the flat colours of a character spec that variants recolour"""
+    roles = {tuple(spec.skin): "skin"}
+    for prop in spec.props:
+        role = PROP_ROLES.get(type(prop).__name__)
+        if role:
+            roles.setdefault(tuple(prop.color), role)
+    roles.setdefault(tuple(spec.eyes.color), "eyes")
+    return roles
+
+def index_image(img):
+    """Split an RGBA image into its distinct colours and an index map"""
+    pixels = np.ascontiguousarray(np.asarray(img.convert('RGBA')))
+    keys = pixels.view(np.uint32).reshape(pixels.shape[:2])
+    colours, inverse = np.unique(keys, return_inverse=True)
+    if len(colours) > np.iinfo(np.uint16).max:
+        raise ValueError(f"{len(colours)} distinct colours is too many to index")
+    palette = colours.view(np.uint8).reshape(-1, 4)
+    return IndexedSprite(palette, inverse.reshape(keys.shape).astype(np.uint16))
+
+def role_slots(sprite, roles):
+    """{role: palette indices painted in that role's colour}; anti-aliased blends keep their colour"""
+    slots = {}
+    opaque = sprite.palette[:, 3] == 255
+    for rgb, role in roles.items():
+        match = np.flatnonzero(opaque & np.all(sprite.palette[:, :3] == rgb, axis=1))
+        if len(match):
+            slots[role] = np.concatenate([slots.get(role, match[:0]), match])
+    return slots
+
+def _rgb_to_hsv(rgb):
+    """(..., 3) floats in 0..1 to HSV in 0..1"""
+    high, low = rgb.max(axis=-1), rgb.min(axis=-1)
+    delta = high - low
+    safe = np.where(delta > 0, delta, 1.0)
+    r, g, b = np.moveaxis(rgb, -1, 0)
+    hue = np.select([high == r, high == g], [((g - b) / safe) % 6, (b - r) / safe + 2], (r - g) / safe + 4) / 6
+    hue = np.where(delta > 0, hue, 0.0)
+    saturation = np.where(high > 0, delta / np.where(high > 0, high, 1.0), 0.0)
+    return np.stack([hue, saturation, high], axis=-1)
+
+def _hsv_to_rgb(hsv):
+    """(..., 3) HSV in 0..1 to RGB floats in 0..1"""
+    h, s, v = np.moveaxis(hsv, -1, 0)
+    sector = np.floor(h * 6) % 6
+    f = h * 6 - np.floor(h * 6)
+    p, q, t = v * (1 - s), v * (1 - f * s), v * (1 - (1 - f) * s)
+    choices = [(v, t, p), (q, v, p), (p, v, t), (p, q, v), (t, p, v), (v, p, q)]
+    return np.stack([np.select([sector == i for i in range(6)], [c[channel] for c in choices])
+                     for channel in range(3)], axis=-1)
+
+def level_rng(name, level):
+    """Generator seeded by sprite name and level, so a level always gets the same enemies"""
+    return np.random.default_rng([level, zlib.crc32(name.encode())])
+
+def variant_luts(sprite, slots, count, rng):
+    """(count, colours, 4) lookup tables; every role gets its own seeded hue/saturation/value jitter"""
+    luts = np.repeat(sprite.palette[np.newaxis], count, axis=0)
+    for role in sorted(slots):
+        indices = slots[role]
+        base = _rgb_to_hsv(sprite.palette[indices[0], :3] / 255.0)
+        jitter = np.stack([rng.uniform(*HUE_SHIFT, count),
+                           rng.uniform(*SATURATION_SCALE, count),
+                           rng.uniform(*VALUE_SCALE, count)], axis=-1)
+        hsv = np.stack([(base[0] + jitter[:, 0]) % 1.0,
+                        np.clip(base[1] * jitter[:, 1], 0, 1),
+                        np.clip(base[2] * jitter[:, 2], 0, 1)], axis=-1)
+        rgb = np.rint(_hsv_to_rgb(hsv) * 255).astype(np.uint8)
+        luts[:, indices, :3] = rgb[:, np.newaxis, :]
+    return luts
+
+def recolour(sprite, luts):
+    """Apply every LUT to the index map in one gather: (count, height, width, 4) uint8
+
+    Each RGBA entry is gathered as one packed uint32, a quarter of the indexing work of per-channel
+    lookups, and np.take keeps every variant contiguous so Pillow can wrap it without copying.
+    """
+    packed = np.ascontiguousarray(luts).view(np.uint32)[..., 0]
+    pixels = np.take(packed, sprite.index, axis=1)
+    return pixels[..., np.newaxis].view(np.uint8)
+
+def character_variants(spec, width, height, scale, count, level, base=None):
+    """count seeded recolours of a character at one scale as [(name, image)], rendering it only once
+
+    base is an already rendered (e.g. trimmed) image of the character to recolour instead.
+    """
+    if base is None:
+        base = render_character(spec, width, height, scale)
+    sprite = index_image(base)
+    luts = variant_luts(sprite, role_slots(sprite, colour_roles(spec)), count, level_rng(spec.name, level))
+    return [(f"{spec.name}_l{level}_{i:02d}", to_image(pixels))
+            for i, pixels in enumerate(recolour(sprite, luts))]
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Watch mode for the Ramayana asset pipeline
+Polls the generator scripts and reruns the build for just the assets whose sources changed
+"""
+
+import ast
+import glob
+import os
+import subprocess
+import time
+
+from targets import SCRIPT_DIR
+
+# How often the scripts are checked for edits
+POLL_INTERVAL = 0.1
+# Quiet time after an edit before rebuilding, so an editor's multi-step save triggers one build
+SETTLE_TIME = 0.1
+
+def snapshot(directory=SCRIPT_DIR):
+    """{path: (mtime, size)} for every script the generators can depend on"""
+    stamps = {}
+    for path in glob.glob(os.path.join(glob.escape(directory), "*.py")):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            # Deleted between the listing and the stat, as editors do when saving
+            continue
+        stamps[path] = (stat.st_mtime_ns, stat.st_size)
+    return stamps
+
+def settled(stamps, directory=SCRIPT_DIR, settle=SETTLE_TIME):
+    """Wait until nothing has changed for settle seconds and return that snapshot"""
+    while True:
+        time.sleep(settle)
+        latest = snapshot(directory)
+        if latest == stamps:
+            return stamps
+        stamps = latest
+
+def read_source(path):
+    """Text of a script, or None once it is gone"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+def definitions(text):
+    """{top-level name: source} for every def, class and assignment, plus the other statements under None
+
+    Returns None for a script that does not parse, e.g. saved halfway through an edit.
+    """
+    try:
+        tree = ast.parse(text)
+    except SyntaxError:
+        return None
+    lines = text.splitlines(keepends=True)
+    found = {None: []}
+    for node in tree.body:
+        # Decorators belong to the definition they wrap
+        first = min([node.lineno] + [decorator.lineno for decorator in getattr(node, "decorator_list", [])])
+        source = "".join(lines[first - 1:node.end_lineno])
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names = [node.name]
+        elif isinstance(node, (ast.Assign, ast.AnnAssign, ast.AugAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            names = [name.id for target in targets for name in ast.walk(target) if isinstance(name, ast.Name)]
+        else:
+            names = []
+        if names:
+            for name in names:
+                found[name] = found.get(name, "") + source
+        else:
+            found[None].append(source)
+    return found
+
+def changes(path, before, after):
+    """--changed values for one script: PATH::NAME per edited definition, or PATH when that cannot be narrowed"""
+    old = definitions(before) if before is not None else None
+    new = definitions(after) if after is not None else None
+    if old is None or new is None or old[None] != new[None]:
+        return [path]
+    return [f"{path}::{name}" for name in sorted(old.keys() - {None} | new.keys() - {None})
+            if old.get(name) != new.get(name)]
+
+def watch(command, directory=SCRIPT_DIR, interval=POLL_INTERVAL, settle=SETTLE_TIME):
+    """Run command once, then again with --changed PATH[::NAME] for every batch of edits until interrupted
+
+    The build runs in a fresh interpreter each time so it always sees the edited source; it
+    works out for itself which assets the changed scripts feed. Returns the exit status.
+    """
+    result = subprocess.run(command)
+    if result.returncode == 2:
+        # argparse rejected the command line; watching would only repeat the error
+        return result.returncode
+    stamps = snapshot(directory)
+    # Last text of each script that parsed, so a save with a syntax error is diffed against good code later
+    sources = {path: read_source(path) for path in stamps}
+    # Edits whose build failed, retried with the next batch
+    pending = []
+    print(f"👀 Watching {len(stamps)} scripts in {directory} (Ctrl-C to stop)", flush=True)
+    try:
+        while True:
+            time.sleep(interval)
+            current = snapshot(directory)
+            if current == stamps:
+                continue
+            current = settled(current, directory, settle)
+            edited = sorted(path for path in stamps.keys() | current.keys() if stamps.get(path) != current.get(path))
+            stamps = current
+            changed = []
+            broken = []
+            for path in edited:
+                text = read_source(path)
+                if text is not None and definitions(text) is None:
+                    # Diffed against its last good text once it parses again
+                    broken.append(path)
+                    continue
+                changed += changes(path, sources.get(path), text)
+                if text is None:
+                    sources.pop(path, None)
+                else:
+                    sources[path] = text
+            changed = sorted(set(pending + changed))
+            if broken:
+                print(f"✋ Syntax error in {', '.join(os.path.basename(path) for path in broken)}; "
+                      "waiting for the next save", flush=True)
+                pending = changed
+                continue
+            if not changed:
+                continue
+            print(f"🔁 Changed: {', '.join(os.path.basename(item) for item in changed)}", flush=True)
+            started = time.perf_counter()
+            result = subprocess.run(command + [arg for item in changed for arg in ("--changed", item)])
+            pending = [] if result.returncode == 0 else changed
+            status = "✅ Rebuilt" if result.returncode == 0 else f"❌ Build failed (exit {result.returncode})"
+            print(f"{status} in {(time.perf_counter() - started) * 1000:.0f} ms", flush=True)
+    except KeyboardInterrupt:
+        print("👋 Stopped watching")
+        return 0
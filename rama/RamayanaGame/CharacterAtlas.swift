@@ -0,0 +1,21 @@
+import SpriteKit
+
+// Combat sprites packed by create_game_sprites.py into Characters.atlasc. Every node drawing
+// one of them goes through here so a fight binds a single texture.
+enum CharacterAtlas {
+
+    static let atlas = SKTextureAtlas(named: "Characters")
+
+    // Texture from the shared atlas, or nil when the atlas does not hold the sprite
+    static func texture(named name: String) -> SKTexture? {
+        guard atlas.textureNames.contains(where: { $0 == name || $0.hasPrefix(name + ".") || $0.hasPrefix(name + "@") }) else {
+            return nil
+        }
+        return atlas.textureNamed(name)
+    }
+
+    // Texture from the shared atlas, falling back to the loose image of the same name
+    static func textureOrImage(named name: String) -> SKTexture {
+        return texture(named: name) ?? SKTexture(imageNamed: name)
+    }
+}
@@ -0,0 +1,38 @@
+import SpriteKit
+
+// Convex collision outlines traced from the sprite alpha by Assets.xcassets/outlines.py,
+// so physics bodies are built without analysing textures at runtime
+enum CollisionOutlines {
+
+    private struct Outline: Decodable {
+        // Sprite size in points the vertices were traced at
+        let size: [CGFloat]
+        // Counter-clockwise points around the sprite's centre, y up
+        let vertices: [[CGFloat]]
+    }
+
+    private static let outlines: [String: Outline] = {
+        guard let url = Bundle.main.url(forResource: "collision_outlines", withExtension: "json", subdirectory: "SpriteMetadata")
+                ?? Bundle.main.url(forResource: "collision_outlines", withExtension: "json"),
+              let data = try? Data(contentsOf: url),
+              let decoded = try? JSONDecoder().decode([String: Outline].self, from: data) else {
+            print("Collision outlines not found; falling back to circular bodies")
+            return [:]
+        }
+        return decoded
+    }()
+
+    // Polygon body for a sprite stretched to the node's size, or nil when its outline was not shipped
+    static func body(named name: String, size: CGSize) -> SKPhysicsBody? {
+        guard let outline = outlines[name], outline.size.count == 2, outline.size[0] > 0, outline.size[1] > 0,
+              outline.vertices.count >= 3 else {
+            return nil
+        }
+        let scaleX = size.width / outline.size[0]
+        let scaleY = size.height / outline.size[1]
+        let path = CGMutablePath()
+        path.addLines(between: outline.vertices.map { CGPoint(x: $0[0] * scaleX, y: $0[1] * scaleY) })
+        path.closeSubpath()
+        return SKPhysicsBody(polygonFrom: path)
+    }
+}
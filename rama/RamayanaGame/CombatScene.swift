@@ -107,7 +107,7 @@ class CombatScene: SKScene {
     
     private func setupScene() {
         // Create forest background
-        backgroundNode = SKSpriteNode(imageNamed: "background")
+        backgroundNode = SKSpriteNode(texture: CharacterAtlas.textureOrImage(named: "background"))
         backgroundNode.position = CGPoint(x: size.width/2, y: size.height/2)
         backgroundNode.zPosition = -10
         addChild(backgroundNode)
@@ -122,7 +122,7 @@ class CombatScene: SKScene {
             print("✅ Player instance created successfully")
         } else {
             print("❌ Player class not found, using fallback SKSpriteNode")
-            ramaNode = SKSpriteNode(imageNamed: "rama")
+            ramaNode = SKSpriteNode(texture: CharacterAtlas.textureOrImage(named: "rama"))
         }
         
         ramaNode.position = CGPoint(x: size.width * 0.3, y: size.height * 0.4)
@@ -148,7 +148,7 @@ class CombatScene: SKScene {
         }
         
         // Create demon sprite
-        demonNode = SKSpriteNode(imageNamed: "demon")
+        demonNode = SKSpriteNode(texture: CharacterAtlas.textureOrImage(named: "demon"))
         demonNode.position = CGPoint(x: size.width * 0.7, y: size.height * 0.4)
         demonNode.zPosition = 10
         demonNode.setScale(0.8)
@@ -231,6 +231,11 @@ class CombatScene: SKScene {
     }
     
     private func createParticleTexture() -> SKTexture {
+        // Pre-baked by create_scene_textures.py; only draw at runtime if the imageset is missing
+        if let image = UIImage(named: "combat_particle") {
+            return SKTexture(image: image)
+        }
+        
         let size = CGSize(width: 4, height: 4)
         let texture = SKTexture(size: size) { context in
             let rect = CGRect(origin: .zero, size: size)
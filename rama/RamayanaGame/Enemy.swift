@@ -50,6 +50,11 @@ class Enemy: SKSpriteNode {
     }
     
     private func createEnemyTexture(for type: EnemyType) -> SKTexture {
+        // Pre-baked by create_scene_textures.py; only draw at runtime if the imageset is missing
+        if let image = UIImage(named: "enemy_\(type)") {
+            return SKTexture(image: image)
+        }
+        
         let size = getEnemySize(for: type)
         UIGraphicsBeginImageContextWithOptions(size, false, 0)
         let context = UIGraphicsGetCurrentContext()!
@@ -168,7 +173,7 @@ class Enemy: SKSpriteNode {
     }
     
     private func setupPhysics() {
-        physicsBody = SKPhysicsBody(circleOfRadius: size.width / 2)
+        physicsBody = CollisionOutlines.body(named: "enemy_\(type)", size: size) ?? SKPhysicsBody(circleOfRadius: size.width / 2)
         physicsBody?.categoryBitMask = enemyCategory
         physicsBody?.contactTestBitMask = 0x1 << 0 | 0x1 << 3 // Player and Projectile categories
         physicsBody?.collisionBitMask = 0
@@ -65,7 +65,8 @@ class GameOverScene: SKScene {
         gradient.startPoint = CGPoint(x: 0, y: 0)
         gradient.endPoint = CGPoint(x: 1, y: 1)
         
-        let gradientImage = UIImage.image(from: gradient)
+        // Pre-baked by create_scene_textures.py; render the layer only if the imageset is missing
+        let gradientImage = UIImage(named: won ? "game_over_victory" : "game_over_defeat") ?? UIImage.image(from: gradient)
         let gradientTexture = SKTexture(image: gradientImage)
         let gradientNode = SKSpriteNode(texture: gradientTexture, size: size)
         gradientNode.position = CGPoint(x: size.width/2, y: size.height/2)
@@ -39,7 +39,8 @@ class LevelSelectScene: SKScene {
         gradient.startPoint = CGPoint(x: 0, y: 0)
         gradient.endPoint = CGPoint(x: 1, y: 1)
         
-        let gradientImage = UIImage.image(from: gradient)
+        // Pre-baked by create_scene_textures.py; render the layer only if the imageset is missing
+        let gradientImage = UIImage(named: "level_select_background") ?? UIImage.image(from: gradient)
         let texture = SKTexture(image: gradientImage)
         background.texture = texture
         